@@ -0,0 +1,70 @@
+# benchmarks/filterbench.py
+# Micro-benchmark of the input filter stages: per-sample cost of each stage and of full
+# chains, measured on a synthetic meter signal with noise, spikes and a level change.
+#
+#   python -m benchmarks.filterbench --samples 200000
+import argparse
+import math
+import random
+import time
+
+
+def _signal(count, seed=1234):
+    rng = random.Random(seed)
+    values = []
+    for i in range(count):
+        value = 25 + 15 * math.sin(i / 50) + rng.gauss(0, 1.5)
+        if rng.random() < 0.02:
+            value *= rng.choice((0.1, 5.0))
+        if i > count // 2:
+            value += 20  # the player switches on another appliance
+        values.append(max(0.0, value))
+    return values
+
+
+def _time_per_sample(spec, values, repeat):
+    from powermatch.filters import parse_spec
+
+    best = math.inf
+    for _ in range(repeat):
+        chain = parse_spec(spec)
+        process = chain.process
+        started = time.perf_counter()
+        for value in values:
+            process(value)
+        best = min(best, time.perf_counter() - started)
+    return best / len(values)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure per-sample cost of PowerMatch input filters.")
+    parser.add_argument("--samples", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=3, help="runs per spec; the fastest is reported")
+    parser.add_argument("specs", nargs="*", help="filter specs to measure (default: each stage and two chains)")
+    args = parser.parse_args(argv)
+
+    specs = args.specs or [
+        "",
+        "outlier:4",
+        "median:3",
+        "median:5",
+        "mean:5",
+        "ema:0.5",
+        "outlier:4,median:3,ema:0.5",
+        "outlier:4,median:5,mean:5,ema:0.3",
+    ]
+    values = _signal(args.samples)
+    baseline = None
+
+    print(f"\nPowerMatch filter benchmark: {args.samples} samples, best of {args.repeat}")
+    for spec in specs:
+        per_sample = _time_per_sample(spec, values, args.repeat)
+        if spec == "":
+            baseline = per_sample
+        overhead = f"  (+{(per_sample - baseline) * 1e9:6.0f} ns over no filter)" if baseline is not None and spec else ""
+        print(f"  {spec or '(none)':<36} {per_sample * 1e9:8.0f} ns/sample  {1 / per_sample / 1e6:6.2f} M samples/s{overhead}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
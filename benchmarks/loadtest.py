@@ -0,0 +1,261 @@
+# benchmarks/loadtest.py
+# In-process load test: runs the PowerMatch server, feeds it synthetic Shelly power readings
+# and plays N concurrent games over WebSockets.
+#
+# --transport direct (default) calls the MQTT handler's message callback straight from a
+# publisher thread: payload parsing and the loop handoff are exercised, the network and
+# paho are not. --transport broker publishes over TCP through the in-process stub broker
+# from benchmarks/mqtt_stub.py to a real, connected MQTTInputHandler.
+#
+#   python -m benchmarks.loadtest --sessions 16 --sample-rate 10 --tick-rate 4 --duration 10
+#   python -m benchmarks.loadtest --transport broker
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import socket
+import statistics
+import tempfile
+import threading
+import time
+
+
+class _Message:
+    # Minimal stand-in for paho's MQTTMessage
+    __slots__ = ("topic", "payload")
+
+    def __init__(self, topic, payload):
+        self.topic = topic
+        self.payload = payload
+
+
+class SyntheticPowerSource:
+    """
+    Publishes Shelly Pro 3EM style RPC events (params -> em:0 -> c_act_power) from a
+    background thread through `send(topic, payload)`.
+
+    Profiles: "steady" (smooth curve with small noise), "spiky" (occasional large spikes),
+    "gappy" (random dropouts of up to two seconds).
+    """
+
+    def __init__(self, send, devices, sample_rate=10.0, profile="steady", topic="bench/events/rpc"):
+        self.send = send
+        self.devices = devices
+        self.interval = 1.0 / sample_rate
+        self.profile = profile
+        self.topic = topic
+        self.sent = 0
+        self._rng = random.Random(1234)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="synthetic-power", daemon=True)
+        self._gap_until = {}
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _value(self, device_index, now):
+        base = 25 + 15 * math.sin(now / 3 + device_index)
+        value = base + self._rng.gauss(0, 1.5)
+        if self.profile == "spiky" and self._rng.random() < 0.05:
+            value *= self._rng.choice((0.1, 5.0))
+        return round(max(0.0, value), 3)
+
+    def _run(self):
+        next_time = time.monotonic()
+        while not self._stop.is_set():
+            now = time.monotonic()
+            for index, device in enumerate(self.devices):
+                if self.profile == "gappy":
+                    if now < self._gap_until.get(device, 0):
+                        continue
+                    if self._rng.random() < 0.01:
+                        self._gap_until[device] = now + self._rng.uniform(0.5, 2.0)
+                payload = json.dumps({
+                    "src": device,
+                    "dst": self.topic,
+                    "method": "NotifyStatus",
+                    "params": {"ts": time.time(), "em:0": {"id": 0, "c_act_power": self._value(index, now)}},
+                }).encode()
+                self.send(self.topic, payload)
+                self.sent += 1
+            next_time += self.interval
+            delay = next_time - time.monotonic()
+            if delay > 0:
+                self._stop.wait(delay)
+
+
+class SessionResult:
+    def __init__(self):
+        self.lateness = []    # seconds each tick arrived after its grid deadline
+        self.intervals = []   # seconds between consecutive ticks
+        self.ticks = 0
+        self.expected_ticks = 0
+        self.score = None
+        self.error = None
+
+
+async def play_session(url, result):
+    import websockets
+    from powermatch.protocol import decode_tick
+
+    try:
+        async with websockets.connect(url, max_size=None) as ws:
+            init = json.loads(await ws.recv())
+            result.expected_ticks = round(init["duration"] * init["tickRate"])
+            interval = 1.0 / init["tickRate"]
+            await ws.send(json.dumps({"type": "start"}))
+            start = time.monotonic()
+            previous = None
+            async for raw in ws:
+                message = decode_tick(raw) if isinstance(raw, bytes) else json.loads(raw)
+                now = time.monotonic()
+                if message["type"] == "tick":
+                    result.ticks += 1
+                    deadline = start + (message["tickNumber"] + 1) * interval
+                    result.lateness.append(now - deadline)
+                    if previous is not None:
+                        result.intervals.append(now - previous)
+                    previous = now
+                elif message["type"] == "end":
+                    result.score = message["score"]
+                    break
+    except Exception as e:
+        result.error = repr(e)
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _percentile(values, pct):
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def _ms(value):
+    return f"{value * 1000:8.2f} ms"
+
+
+async def run(args):
+    import uvicorn
+    from powermatch import config
+
+    config.TICK_RATE = args.tick_rate
+    config.SESSION_SECONDS = args.duration
+    config.LOG_LEVEL = args.log_level
+    config.RECORD_SESSIONS = not args.no_record
+
+    from powermatch.app import create_app
+    from powermatch.input_router import input_router
+    from powermatch.mqtt_input import MQTTInputHandler
+    from powermatch.score_writer import score_writer
+
+    port = _free_port()
+    app = create_app(mqtt_enabled=False)
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning", lifespan="on"))
+    server_task = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.05)
+
+    devices = [f"bench-dev-{i}" for i in range(args.sessions)]
+    topic = "bench/events/rpc"
+    broker = publisher = None
+    if args.transport == "broker":
+        import paho.mqtt.client as mqtt
+        from benchmarks.mqtt_stub import StubBroker
+
+        broker = StubBroker()
+        await broker.start()
+        handler = MQTTInputHandler(asyncio.get_running_loop(), brokers=[("127.0.0.1", broker.port)], topics=[topic])
+        handler.start()
+        while handler.state != "connected" or not broker.subscribed():
+            await asyncio.sleep(0.01)
+        publisher = mqtt.Client()
+        publisher.connect("127.0.0.1", broker.port)
+        publisher.loop_start()
+        send = publisher.publish
+    else:
+        handler = MQTTInputHandler(asyncio.get_running_loop())  # never started: no broker connection
+        send = lambda t, payload: handler._on_message(None, None, _Message(t, payload))
+    source = SyntheticPowerSource(send, devices, sample_rate=args.sample_rate, profile=args.profile, topic=topic)
+    source.start()
+
+    results = [SessionResult() for _ in devices]
+    started = time.monotonic()
+    await asyncio.gather(*(
+        play_session(f"ws://127.0.0.1:{port}/ws/game/bench{i}/Medium?station={device}&format={args.format}", result)
+        for i, (device, result) in enumerate(zip(devices, results))
+    ))
+    wall = time.monotonic() - started
+
+    source.stop()
+    if broker is not None:
+        publisher.disconnect()
+        publisher.loop_stop()
+        handler.stop()
+        await broker.stop()
+    server.should_exit = True
+    await server_task  # lifespan shutdown flushes the score writer
+
+    lateness = [v for r in results for v in r.lateness]
+    intervals = [v for r in results for v in r.intervals]
+    expected_interval = 1.0 / args.tick_rate
+    errors = [r.error for r in results if r.error]
+    db = score_writer.stats()
+
+    print(f"\nPowerMatch load test: {args.sessions} session(s), {args.tick_rate} Hz ticks, "
+          f"{args.duration}s games, {args.sample_rate} Hz/device '{args.profile}' input, {args.format} ticks, "
+          f"{args.transport} transport")
+    print(f"  wall time            {wall:8.2f} s")
+    print(f"  ticks received       {sum(r.ticks for r in results)} / {sum(r.expected_ticks for r in results)}")
+    print(f"  tick lateness p50    {_ms(_percentile(lateness, 50))}")
+    print(f"  tick lateness p95    {_ms(_percentile(lateness, 95))}")
+    print(f"  tick lateness p99    {_ms(_percentile(lateness, 99))}")
+    print(f"  tick lateness max    {_ms(max(lateness, default=float('nan')))}")
+    if len(intervals) > 1:
+        print(f"  inter-tick jitter    {_ms(statistics.pstdev(intervals))} (stdev around {_ms(expected_interval).strip()})")
+    print(f"  samples sent         {source.sent}")
+    print(f"  samples routed       {input_router.published}")
+    queue_dropped = input_router.dropped_total()
+    print(f"  samples dropped      {handler.dropped + queue_dropped} "
+          f"(MQTT handoff {handler.dropped}, session queues {queue_dropped})")
+    print(f"  scores saved         {db['committed']} in {db['batches']} batch(es), failed {db['failed']}")
+    print(f"  DB commit latency    avg {_ms(db['avg_commit_seconds']).strip()}, max {_ms(db['max_commit_seconds']).strip()}")
+    if errors:
+        print(f"  session errors       {len(errors)}: {errors[0]}")
+    return 1 if errors else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test PowerMatch with synthetic MQTT power input.")
+    parser.add_argument("--sessions", type=int, default=8, help="concurrent game WebSockets")
+    parser.add_argument("--sample-rate", type=float, default=10.0, help="samples per second per simulated meter")
+    parser.add_argument("--profile", choices=("steady", "spiky", "gappy"), default="steady")
+    parser.add_argument("--tick-rate", type=float, default=1.0)
+    parser.add_argument("--duration", type=float, default=30.0, help="game length in seconds")
+    parser.add_argument("--format", choices=("json", "binary"), default="json", help="tick wire format")
+    parser.add_argument("--transport", choices=("direct", "broker"), default="direct",
+                        help="direct: call the MQTT handler callback; broker: publish through the stub MQTT broker")
+    parser.add_argument("--no-record", action="store_true", help="disable session recordings")
+    parser.add_argument("--log-level", default="WARNING")
+    args = parser.parse_args(argv)
+
+    # Scores DB and recordings go to a throwaway directory
+    workdir = tempfile.mkdtemp(prefix="powermatch-bench-")
+    os.chdir(workdir)
+    return asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
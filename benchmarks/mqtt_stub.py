@@ -0,0 +1,337 @@
+# benchmarks/mqtt_stub.py
+# Minimal in-process MQTT 3.1.1 broker (CONNECT, SUBSCRIBE, PUBLISH QoS 0, PINGREQ, DISCONNECT)
+# and a resilience check for MQTTInputHandler. It fails over from a dead broker at startup and from
+# a broker that drops, restarts the broker a few times, and checks the retry backoff and that
+# /api/health answers 503 while disconnected and 200 again once input resumes.
+# Exits with status 1 if any step fails. Needs paho-mqtt and httpx (pip install httpx).
+#
+#   python -m benchmarks.mqtt_stub --restarts 3 --outage 2
+import argparse
+import asyncio
+import json
+import socket
+import struct
+import time
+
+CONNECT, CONNACK, PUBLISH, SUBSCRIBE, SUBACK = 1, 2, 3, 8, 9
+UNSUBSCRIBE, UNSUBACK, PINGREQ, PINGRESP, DISCONNECT = 10, 11, 12, 13, 14
+
+
+def _packet(kind, body=b"", flags=0):
+    length, header = len(body), bytearray()
+    while True:
+        byte, length = length % 128, length // 128
+        header.append(byte | (0x80 if length else 0))
+        if not length:
+            break
+    return bytes([kind << 4 | flags]) + bytes(header) + body
+
+
+def _string(data, offset):
+    (size,) = struct.unpack_from("!H", data, offset)
+    return data[offset + 2:offset + 2 + size].decode(), offset + 2 + size
+
+
+def topic_matches(pattern, topic):
+    pattern, topic = pattern.split("/"), topic.split("/")
+    for i, part in enumerate(pattern):
+        if part == "#":
+            return True
+        if i >= len(topic) or (part != "+" and part != topic[i]):
+            return False
+    return len(pattern) == len(topic)
+
+
+class StubBroker:
+    """Just enough broker for paho's client. Stopping it drops every connection, like a broker restart."""
+
+    def __init__(self, host="127.0.0.1", port=0, refuse=False):
+        self.host = host
+        self.port = port
+        self.refuse = refuse  # answer CONNECT with "not authorized"
+        self._server = None
+        self._clients = {}  # writer -> set of topic filters
+        self._tasks = set()
+
+        self.connects = 0
+        self.delivered = 0
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]  # restarts reuse the same port
+
+    async def stop(self):
+        self._server.close()
+        for writer in list(self._clients):
+            writer.close()
+        await asyncio.gather(*self._tasks, return_exceptions=True)  # connection handlers see EOF and finish
+        await self._server.wait_closed()
+        self._clients.clear()
+
+    @property
+    def running(self):
+        return self._server is not None and self._server.is_serving()
+
+    def subscribed(self):
+        return any(self._clients.values())
+
+    def publish(self, topic, payload):
+        packet = None
+        for writer, filters in list(self._clients.items()):
+            if writer.is_closing() or not any(topic_matches(f, topic) for f in filters):
+                continue
+            if packet is None:
+                packet = _packet(PUBLISH, struct.pack("!H", len(topic)) + topic.encode() + payload)
+            writer.write(packet)
+            self.delivered += 1
+
+    async def _read_packet(self, reader):
+        first = (await reader.readexactly(1))[0]
+        length, shift = 0, 0
+        while True:
+            byte = (await reader.readexactly(1))[0]
+            length |= (byte & 0x7F) << shift
+            shift += 7
+            if not byte & 0x80:
+                break
+        return first >> 4, first & 0x0F, await reader.readexactly(length)
+
+    async def _handle(self, reader, writer):
+        self._tasks.add(asyncio.current_task())
+        try:
+            kind, _, _ = await self._read_packet(reader)
+            if kind != CONNECT:
+                return
+            if self.refuse:
+                writer.write(_packet(CONNACK, b"\x00\x05"))
+                return
+            writer.write(_packet(CONNACK, b"\x00\x00"))
+            self.connects += 1
+            filters = self._clients[writer] = set()
+            while True:
+                kind, flags, body = await self._read_packet(reader)
+                if kind == SUBSCRIBE:
+                    offset, granted = 2, bytearray()
+                    while offset < len(body):
+                        topic, offset = _string(body, offset)
+                        offset += 1  # requested QoS; everything is delivered at QoS 0
+                        filters.add(topic)
+                        granted.append(0)
+                    writer.write(_packet(SUBACK, body[:2] + bytes(granted)))
+                elif kind == UNSUBSCRIBE:
+                    offset = 2
+                    while offset < len(body):
+                        topic, offset = _string(body, offset)
+                        filters.discard(topic)
+                    writer.write(_packet(UNSUBACK, body[:2]))
+                elif kind == PUBLISH:
+                    topic, offset = _string(body, 0)
+                    if flags & 0x06:
+                        offset += 2  # packet id of QoS 1/2; acknowledged by nobody, good enough here
+                    self.publish(topic, body[offset:])
+                elif kind == PINGREQ:
+                    writer.write(_packet(PINGRESP))
+                elif kind == DISCONNECT:
+                    return
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self._clients.pop(writer, None)
+            self._tasks.discard(asyncio.current_task())
+            writer.close()
+
+
+class _Collector:
+    # Stands in for the input router and timestamps every sample it receives
+    def __init__(self):
+        self.times = []
+
+    def publish(self, value, topic=None, device_id=None):
+        self.times.append(time.monotonic())
+
+    def first_after(self, moment):
+        return next((t for t in self.times if t >= moment), None)
+
+
+class _Check:
+    # One handler under test: records failed attempts, reads /api/health and collects problems
+    def __init__(self, loop, brokers, topic, args):
+        from powermatch.app import create_app
+        from powermatch.mqtt_input import MQTTInputHandler
+
+        self.args = args
+        self.collector = _Collector()
+        self.handler = MQTTInputHandler(loop, router=self.collector, brokers=brokers, topics=[topic])
+        self.handler.on_status = self._status
+        self.failure_times = []
+        self.problems = []
+        self._failures = 0
+        # /api/health of an app that uses this handler; the lifespan (database, ...) is not needed for it
+        self.app = create_app(mqtt_enabled=False)
+        self.app.state.mqtt = self.handler
+
+    def _status(self, status):
+        if status["failures"] > self._failures:
+            self._failures = status["failures"]
+            self.failure_times.append(time.monotonic())
+
+    async def health(self, expected):
+        import httpx
+        transport = httpx.ASGITransport(app=self.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://stub") as client:
+            code = (await client.get("/api/health")).status_code
+        if code != expected:
+            self.problems.append(f"/api/health answered {code}, expected {expected} ({self.handler.state})")
+        return code
+
+    async def sample_after(self, moment, what):
+        if await _wait_for(lambda: self.collector.first_after(moment) is not None, self.args.timeout):
+            return self.collector.first_after(moment) - moment
+        self.problems.append(f"no sample {what}")
+        return None
+
+    def check_backoff(self, since):
+        # paho waits min, 2*min, 4*min, ... up to max between attempts against a broker that is down
+        times = [t for t in self.failure_times if t >= since]
+        gaps = [b - a for a, b in zip(times, times[1:])]
+        low, high = self.args.reconnect_min * 0.8, self.args.reconnect_max * 1.25 + 0.1
+        if not gaps:
+            self.problems.append("fewer than two failed attempts during the outage; backoff not observed")
+        elif any(not low <= gap <= high for gap in gaps) or any(b < a * 0.8 for a, b in zip(gaps, gaps[1:])):
+            self.problems.append("retry gaps " + ", ".join(f"{g:.2f}s" for g in gaps)
+                                 + f" do not back off from {self.args.reconnect_min}s to {self.args.reconnect_max}s")
+        return gaps
+
+    async def wait_disconnected(self):
+        if not await _wait_for(lambda: self.handler.state != "connected", self.args.timeout):
+            self.problems.append("handler did not notice the broker going away")
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def _wait_for(predicate, timeout):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            return False
+        await asyncio.sleep(0.005)
+    return True
+
+
+def _ms(seconds):
+    return f"{seconds * 1000:8.2f} ms" if seconds is not None else "   never"
+
+
+async def run(args):
+    from powermatch import config
+    config.MQTT_RECONNECT_MIN = args.reconnect_min
+    config.MQTT_RECONNECT_MAX = args.reconnect_max
+
+    topic = "bench/events/rpc"
+    brokers = [StubBroker(), StubBroker()]
+    for broker in brokers:
+        await broker.start()
+    first, second = (("127.0.0.1", b.port) for b in brokers)
+    dead = ("127.0.0.1", _free_port())  # nothing listens here
+    loop = asyncio.get_running_loop()
+
+    async def feed():
+        interval = 1.0 / args.sample_rate
+        payload = json.dumps({"src": "bench-dev", "params": {"em:0": {"c_act_power": 42.0}}}).encode()
+        while True:
+            for broker in brokers:
+                broker.publish(topic, payload)  # no-op while a broker is down
+            await asyncio.sleep(interval)
+
+    feeder = asyncio.create_task(feed())
+    checks, report = [], []
+    try:
+        # 1. Failover at startup: the first broker in the list is down
+        check = _Check(loop, [dead, first], topic, args)
+        checks.append(check)
+        started = time.monotonic()
+        check.handler.start()
+        start_call = time.monotonic() - started
+        await check.health(503)
+        report.append(("start() returned in", _ms(start_call)))
+        report.append(("failover at startup", _ms(await check.sample_after(started, "after failing over from a dead broker"))))
+        await check.health(200)
+        check.handler.stop()
+
+        # 2. The connected broker drops and stays down: the handler moves on to the next one
+        check = _Check(loop, [first, second], topic, args)
+        checks.append(check)
+        check.handler.start()
+        if await check.sample_after(time.monotonic(), "from the first broker") is not None:
+            await brokers[0].stop()
+            dropped = time.monotonic()
+            await check.wait_disconnected()
+            report.append(("failover after drop", _ms(await check.sample_after(dropped, "after the first broker dropped"))))
+            await check.health(200)
+            if check.handler.broker != f"{second[0]}:{second[1]}":
+                check.problems.append(f"still on {check.handler.broker} after the first broker dropped")
+            await brokers[0].start()
+        check.handler.stop()
+
+        # 3. Broker restarts with a single broker, as in the default configuration
+        check = _Check(loop, [first], topic, args)
+        checks.append(check)
+        check.handler.start()
+        ready = await check.sample_after(time.monotonic(), "before the first restart") is not None
+        for i in range(args.restarts if ready else 0):
+            await asyncio.sleep(0.5)
+            await brokers[0].stop()
+            down = time.monotonic()
+            await check.wait_disconnected()
+            await check.health(503)
+            await asyncio.sleep(args.outage)
+            gaps = check.check_backoff(down)
+            await brokers[0].start()
+            restarted = time.monotonic()
+            resume = await check.sample_after(restarted, f"after restart {i + 1}")
+            if resume is not None and resume > args.max_resume:
+                check.problems.append(f"input resumed {resume:.2f}s after restart {i + 1}, limit {args.max_resume}s")
+            await check.health(200)
+            report.append((f"restart {i + 1}", f"{_ms(resume)} after the broker came back, "
+                           f"retry gaps {', '.join(f'{g:.2f}' for g in gaps)} s"))
+            if resume is None:
+                break
+        health = check.handler.health()
+        report.append(("connects / failures", f"{health['connects']} / {health['failures']}, samples {health['parsed']}"))
+        check.handler.stop()
+    finally:
+        feeder.cancel()
+        for broker in brokers:
+            if broker.running:
+                await broker.stop()
+
+    print(f"\nPowerMatch MQTT resilience check: {args.restarts} broker restart(s), {args.outage}s outage, "
+          f"reconnect delay {args.reconnect_min}-{args.reconnect_max}s")
+    for label, value in report:
+        print(f"  {label:<22} {value}")
+    problems = [p for check in checks for p in check.problems]
+    for problem in problems:
+        print(f"  FAIL: {problem}")
+    print("  FAILED" if problems else "  OK")
+    return 1 if problems else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check MQTT reconnect behaviour against an in-process stub broker.")
+    parser.add_argument("--restarts", type=int, default=3)
+    parser.add_argument("--outage", type=float, default=2.0, help="seconds the broker stays down per restart")
+    parser.add_argument("--sample-rate", type=float, default=50.0, help="samples per second published to the broker")
+    parser.add_argument("--reconnect-min", type=float, default=0.25)
+    parser.add_argument("--reconnect-max", type=float, default=1.0)
+    parser.add_argument("--max-resume", type=float, default=1.0, help="fail if input takes longer than this to resume")
+    parser.add_argument("--timeout", type=float, default=10.0)
+    args = parser.parse_args(argv)
+    return asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
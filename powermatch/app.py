@@ -1,33 +1,94 @@
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect # 
+from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect # 
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
 import os
 import asyncio
 from pathlib import Path
 from . import game_ws
-from . db import init_db
+from . db import DATABASE_URL, init_db
+from . curves import SOURCE_PROCEDURAL, curve_library, load_curves
+from . score_writer import score_writer
+from . replay import recording_writer
+from . leaderboard import leaderboard
 from . import highscores
-from . mqtt_input import MQTTInputHandler
-from contextlib import asynccontextmanager
-from fastapi.responses import FileResponse
+from . import history
+from . import logs
+from . import config
+from . import cluster
+from . import metrics
+from . startup import profile, readiness
+from . static import IndexPage, PrecompressedStaticFiles
+from contextlib import asynccontextmanager, suppress
+import logging
+from fastapi.responses import FileResponse, JSONResponse, Response
+
+logger = logging.getLogger(__name__)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    print("Application startup: Initializing database...") # Debug print
-    init_db()
-    print("Database initialized.") # Debug print
-    loop = asyncio.get_event_loop()
-    mqtt = MQTTInputHandler(loop)
-    mqtt.start()
-    print("MQTT handler started.") # Debug print
+    logger.info("Application startup: initializing database...")
+    with profile.step("database"):
+        init_db()
+    readiness.set("database", True, DATABASE_URL)
+    logger.info("Database initialized.")
+    with profile.step("curves"):
+        curves = load_curves()  # compile all curves once, before the first session starts
+    readiness.set("curves", bool(curves) or config.CURVE_SOURCE == SOURCE_PROCEDURAL,
+                  f"{len(curves)} loaded from {curve_library.path}, source: {config.CURVE_SOURCE}")
+    reload_task = None
+    if config.CURVES_RELOAD_SECONDS > 0:
+        reload_task = asyncio.create_task(curve_library.watch(config.CURVES_RELOAD_SECONDS))  # hot reload on file change
+    with profile.step("leaderboard"):
+        leaderboard.rebuild()
+    with profile.step("score stats"):
+        history.score_stats.rebuild()
+    for hook in (leaderboard.add_rows, history.score_stats.add_rows):
+        if hook not in score_writer.on_commit:
+            score_writer.on_commit.append(hook)  # keep the top-N index and stats in sync with saved scores
+    score_writer.start()
+    if config.RECORD_SESSIONS:
+        recording_writer.start()
+    link = None
+    if config.IPC_SOCKET:
+        # Worker in multi-process mode: samples come from the ingest process, which owns MQTT
+        link = app.state.link = cluster.attach_worker(config.IPC_SOCKET)
+        readiness.set("mqtt", False, "waiting for ingest process")
+        await link.start()
+        logger.info("Worker %d attached to ingest process at %s", os.getpid(), config.IPC_SOCKET)
+    elif app.state.mqtt_enabled:
+        with profile.step("mqtt"):
+            from . mqtt_input import MQTTInputHandler  # paho is only imported when MQTT is used
+            loop = asyncio.get_event_loop()
+            app.state.mqtt = MQTTInputHandler(loop)
+            app.state.mqtt.start()  # connects in the background; startup never waits for the broker
+        logger.info("MQTT handler started.")
+    else:
+        readiness.set("mqtt", True, "disabled")
+        logger.info("MQTT input disabled; samples must be published to the input router directly.")
     yield
-    print("Application shutdown complete.") # Debug print
+    if reload_task is not None:
+        reload_task.cancel()
+        with suppress(asyncio.CancelledError):
+            await reload_task
+    if app.state.mqtt is not None:
+        app.state.mqtt.stop()
+    score_writer.stop()  # flush scores still waiting in the write-behind queue
+    recording_writer.stop()
+    if link is not None:
+        await link.stop()
+    logger.info("Score writer flushed: %s", score_writer.stats())
+    logger.info("Application shutdown complete.")
 
-def create_app():
+def create_app(mqtt_enabled=None):
+    logs.configure_logging()
     app = FastAPI(lifespan=lifespan)
+    app.state.mqtt_enabled = config.MQTT_ENABLED if mqtt_enabled is None else mqtt_enabled
+    app.state.mqtt = None
+    app.state.link = None
 
     app.include_router(game_ws.router)
     app.include_router(highscores.router)
+    app.include_router(history.router)
+    app.include_router(logs.router)
 
     app.add_middleware(
         CORSMiddleware,
@@ -37,16 +98,40 @@ def create_app():
         allow_headers=["*"],
     )
 
+    @app.get("/metrics")
+    async def metrics_endpoint():
+        # Per process: with --workers N each worker reports its own sessions
+        return Response(metrics.registry.render(), media_type=metrics.CONTENT_TYPE)
+
+    @app.get("/api/health")
+    async def health():
+        if app.state.mqtt is not None:
+            mqtt = app.state.mqtt.health()
+        elif app.state.link is not None:
+            mqtt = app.state.link.mqtt_health
+        else:
+            mqtt = {"state": "disabled"}
+        body = {"ok": readiness.ok(), "checks": readiness.as_dict(), "mqtt": mqtt}
+        if app.state.link is not None:
+            body["cluster"] = app.state.link.stats()
+        return JSONResponse(body, status_code=200 if body["ok"] else 503)
+
     base_dir = Path(__file__).parent
     dist_dir = base_dir / "frontend" / "dist"
     assets_dir = dist_dir / "assets"
     index_file = dist_dir / "index.html"
 
     if assets_dir.is_dir():
-        app.mount("/assets", StaticFiles(directory=assets_dir), name="assets")
+        app.mount("/assets", PrecompressedStaticFiles(directory=assets_dir), name="assets")
+
+    index_page = IndexPage(index_file)  # read once, served from memory
+    readiness.set("static assets", index_page.etag is not None, str(dist_dir) if index_page.etag else f"{index_file} not found")
+    root_files = {p.name for p in dist_dir.iterdir() if p.is_file()} - {"index.html"} if dist_dir.is_dir() else set()
 
     @app.get("/{path_name:path}")
-    async def catch_all(path_name: str):
-        return FileResponse(index_file)
+    async def catch_all(path_name: str, request: Request):
+        if path_name in root_files:  # e.g. /vite.svg next to index.html
+            return FileResponse(dist_dir / path_name, headers={"Cache-Control": "no-cache"})
+        return index_page.response(request.headers)
 
     return app
\ No newline at end of file
@@ -1,26 +1,108 @@
 # powermatch/cli.py
-import uvicorn
-from rich.console import Console
-from rich.progress import Progress, SpinnerColumn, TextColumn
-from time import sleep
+# Heavy imports (FastAPI, SQLAlchemy, uvicorn, rich) happen inside main(), after argument
+# parsing, so `powermatch --help` is instant and --profile-startup can time each of them.
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from . import config
+from . startup import profile, readiness
 
-console = Console()
+# Imported one by one under --profile-startup so the report shows where import time goes
+_PROFILED_IMPORTS = ("rich.console", "uvicorn", "sqlalchemy", "fastapi", "powermatch.app")
+_MQTT_READY_TIMEOUT = 5.0  # seconds to wait for the broker before reporting MQTT as not connected
 
-def main():
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="powermatch", description="Run the PowerMatch game server.")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=config.WORKERS,
+                        help="worker processes; with more than one, MQTT input runs in its own process")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="print an import and initialization timing breakdown once the server is ready")
+    args = parser.parse_args(argv)
+
+    if args.profile_startup:
+        for module in _PROFILED_IMPORTS:
+            profile.timed_import(module)
+
+    from rich.console import Console
+    console = Console()
     console.print("[bold cyan]Launching PowerMatch Game Server...[/bold cyan]")
 
-    with Progress(
-        SpinnerColumn(style="green"),
-        TextColumn("[progress.description]{task.description}"),
-        transient=True,
-    ) as progress:
-        progress.add_task(description="Preparing FastAPI app...", total=None)
-        sleep(0.5)  # simulate some loading
-        progress.add_task(description="Initializing WebSocket manager...", total=None)
-        sleep(0.5)
-        progress.add_task(description="Starting Uvicorn...", total=None)
-        sleep(0.5)
-
-    console.print("[bold green]✅ Server ready! Listening on [cyan]http://0.0.0.0:8000[/cyan][/bold green]")
-
-    uvicorn.run("powermatch.app:create_app", host="0.0.0.0", port=8000, factory=True)
+    if args.workers > 1:
+        run_cluster(args, console)
+        return
+
+    try:
+        asyncio.run(serve(args, console))
+    except KeyboardInterrupt:
+        pass
+
+async def serve(args, console):
+    import uvicorn
+    with profile.step("create app"):
+        from . app import create_app
+        app = create_app()
+
+    server = uvicorn.Server(uvicorn.Config(app, host=args.host, port=args.port))
+    task = asyncio.create_task(server.serve())
+    while not server.started:
+        if task.done():
+            return await task  # startup failed; uvicorn has logged why
+        await asyncio.sleep(0.01)
+    ready_at = profile.elapsed()
+
+    # The broker connects in the background; give it a moment so the report is meaningful
+    mqtt = app.state.mqtt
+    if mqtt is not None:
+        deadline = time.monotonic() + _MQTT_READY_TIMEOUT
+        while not readiness.get("mqtt")[0] and time.monotonic() < deadline and not task.done():
+            await asyncio.sleep(0.05)
+
+    _print_readiness(console)
+    if args.profile_startup:
+        _print_profile(console, ready_at)
+    console.print(f"[bold green]✅ Server ready in {ready_at:.2f}s! Listening on "
+                  f"[cyan]http://{args.host}:{args.port}[/cyan][/bold green]")
+    await task
+
+def _print_readiness(console):
+    for name, (ok, detail) in readiness.checks.items():
+        mark = "[green]✔[/green]" if ok else "[yellow]✘[/yellow]"
+        console.print(f"  {mark} {name:<14} {detail}")
+
+def _print_profile(console, ready_at):
+    console.print("[bold]Startup profile[/bold]")
+    for name, seconds in profile.steps:
+        console.print(f"  {name:<24} {seconds * 1000:8.1f} ms")
+    console.print(f"  {'total until listening':<24} {ready_at * 1000:8.1f} ms")
+
+def run_cluster(args, console):
+    import multiprocessing
+    import uvicorn
+    from . import cluster
+    from . db import init_db
+
+    init_db()  # once, before the workers race to create tables
+
+    socket_path = config.IPC_SOCKET or os.path.join(tempfile.gettempdir(), f"powermatch-{os.getpid()}.sock")
+    # The ingest process also relays scores and spectator messages, so it runs even without MQTT
+    ingest = multiprocessing.Process(target=cluster.ingest_main, args=(socket_path,), name="powermatch-ingest")
+    ingest.start()
+
+    # uvicorn spawns the workers; they read these from the environment when importing config
+    os.environ["POWERMATCH_IPC_SOCKET"] = socket_path
+    console.print(f"[bold green]✅ Starting {args.workers} workers on "
+                  f"[cyan]http://{args.host}:{args.port}[/cyan], ingest process pid {ingest.pid}[/bold green]")
+    if args.profile_startup:
+        console.print("[yellow]--profile-startup only covers the single-process server; worker startup is logged per worker[/yellow]")
+    try:
+        uvicorn.run("powermatch.app:create_app", host=args.host, port=args.port, factory=True, workers=args.workers)
+    finally:
+        ingest.terminate()
+        ingest.join(timeout=5)
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
@@ -0,0 +1,335 @@
+# powermatch/cluster.py
+# Multi-process mode (`powermatch --workers N`): one ingest process owns the MQTT connection
+# and fans samples out over a Unix socket to every uvicorn worker. A game session lives in the
+# worker that accepted its WebSocket, so it stays pinned there; the same socket relays saved
+# scores and spectator messages so leaderboards and /ws/watch agree across workers.
+#
+# Wire format: one JSON object per line.
+#   ingest -> worker   {"t": "s", "b": [[value, topic, device_id], ...]}   batch of samples
+#   both directions    {"t": "e", "k": kind, "d": data}                   event, relayed to every other worker
+#                                                                          (or raised by the ingest process)
+import asyncio
+import json
+import logging
+import os
+from datetime import datetime
+from . import config
+from . import metrics
+from . startup import readiness
+
+logger = logging.getLogger(__name__)
+
+SCORE_EVENT = "score"
+WATCH_EVENT = "watch"
+MQTT_EVENT = "mqtt"  # MQTT connection health, sent by the ingest process itself
+METRICS_EVENT = "metrics"  # the ingest process's MQTT metrics, rendered, for the workers' /metrics
+_METRICS_PREFIX = "powermatch_mqtt_"
+_METRICS_INTERVAL = 1.0
+_RECONNECT_DELAYS = (0.1, 0.25, 0.5, 1.0, 2.0)
+_LINE_LIMIT = 1 << 20  # init messages carry whole curves; the asyncio default is 64 KiB
+
+
+def _encode(message):
+    return (json.dumps(message, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+class IngestHub:
+    """
+    Runs in the ingest process. Acts as the input router for MQTTInputHandler: samples
+    published during one loop iteration go out to all workers as a single line.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._writers = set()
+        self._batch = []
+        self._flush_scheduled = False
+        self._server = None
+        self._latest = {}  # event kind -> last line the hub itself sent, replayed to workers that connect later
+
+        self.published = 0
+        self.batches = 0
+        self.events = 0
+        self.dropped_workers = 0
+
+    async def start(self):
+        if os.path.exists(self.path):
+            os.unlink(self.path)  # stale socket from a previous run
+        self._server = await asyncio.start_unix_server(self._handle_worker, path=self.path, limit=_LINE_LIMIT)
+        logger.info("Ingest hub listening on %s", self.path)
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        for writer in list(self._writers):
+            writer.close()
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+    def worker_count(self):
+        return len(self._writers)
+
+    # Same signature as InputRouter.publish, so the MQTT handler needs no changes
+    def publish(self, value, topic=None, device_id=None):
+        self.published += 1
+        self._batch.append((value, topic, device_id))
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            asyncio.get_running_loop().call_soon(self._flush)
+
+    def _flush(self):
+        batch, self._batch = self._batch, []
+        self._flush_scheduled = False
+        if batch:
+            self.batches += 1
+            self._send(_encode({"t": "s", "b": batch}))
+
+    def send_event(self, kind, data):
+        line = _encode({"t": "e", "k": kind, "d": data})
+        self._latest[kind] = line
+        self._send(line)
+
+    def _send(self, data, exclude=None):
+        for writer in list(self._writers):
+            if writer is exclude:
+                continue
+            if writer.is_closing():
+                self._writers.discard(writer)
+                continue
+            if writer.transport.get_write_buffer_size() > config.IPC_WRITE_LIMIT:
+                # The worker stopped reading; cut it off instead of buffering without bound.
+                # Its link reconnects and gets the latest events again.
+                self._writers.discard(writer)
+                self.dropped_workers += 1
+                logger.warning("Dropping worker connection: more than %d bytes unsent", config.IPC_WRITE_LIMIT)
+                writer.transport.abort()
+                continue
+            writer.write(data)  # buffered by the transport; a dead worker is dropped on its read side
+
+    async def _handle_worker(self, reader, writer):
+        self._writers.add(writer)
+        logger.info("Worker connected (%d total)", len(self._writers))
+        for line in self._latest.values():
+            writer.write(line)
+        try:
+            while line := await reader.readline():
+                # Events from one worker go to all the others unchanged
+                self.events += 1
+                self._send(line, exclude=writer)
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass  # ValueError: line over _LINE_LIMIT
+        finally:
+            self._writers.discard(writer)
+            writer.close()
+            logger.info("Worker disconnected (%d left)", len(self._writers))
+
+
+class WorkerLink:
+    """Runs in each uvicorn worker: feeds hub samples into the local router and exchanges events."""
+
+    def __init__(self, path, router, handlers=None):
+        self.path = path
+        self.router = router
+        self.handlers = handlers or {}  # event kind -> callable(data)
+        self.loop = None
+        self._writer = None
+        self._task = None
+        self.mqtt_health = None  # last MQTT_EVENT from the ingest process
+
+        self.received = 0
+        self.events_in = 0
+        self.events_out = 0
+        self.skipped = 0
+
+    async def start(self):
+        self.loop = asyncio.get_running_loop()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        if self._writer is not None:
+            self._writer.close()
+
+    @property
+    def connected(self):
+        return self._writer is not None and not self._writer.is_closing()
+
+    def send_event(self, kind, data):
+        # Loop thread only; events raised while disconnected are lost, the DB stays authoritative
+        if self.connected:
+            self.events_out += 1
+            self._writer.write(_encode({"t": "e", "k": kind, "d": data}))
+
+    def send_event_threadsafe(self, kind, data):
+        try:
+            self.loop.call_soon_threadsafe(self.send_event, kind, data)
+        except RuntimeError:
+            pass  # loop already closed during shutdown
+
+    async def _run(self):
+        attempt = 0
+        while True:
+            if attempt:
+                await asyncio.sleep(_RECONNECT_DELAYS[min(attempt - 1, len(_RECONNECT_DELAYS) - 1)])
+            try:
+                reader, self._writer = await asyncio.open_unix_connection(self.path, limit=_LINE_LIMIT)
+            except OSError as e:
+                attempt += 1
+                if attempt == 1 or attempt % 10 == 0:
+                    logger.warning("Ingest hub at %s not reachable (%s); retrying", self.path, e)
+                continue
+
+            logger.info("Connected to ingest hub at %s", self.path)
+            try:
+                await self._read(reader)
+                attempt = 0
+            except (ConnectionError, asyncio.IncompleteReadError) as e:
+                logger.warning("Lost connection to ingest hub: %s", e)
+                attempt = 0
+            except Exception as e:
+                logger.exception("Ingest hub link failed, reconnecting: %s", e)
+                attempt += 1
+            finally:
+                self._writer.close()
+                self._writer = None
+
+    async def _read(self, reader):
+        while True:
+            try:
+                line = await reader.readline()
+            except ValueError as e:
+                # Over _LINE_LIMIT: asyncio discards what it buffered, the tail arrives as a malformed line
+                self.skipped += 1
+                logger.warning("Skipping oversized message from ingest hub: %s", e)
+                continue
+            if not line:
+                return
+            try:
+                self._dispatch(json.loads(line))
+            except (ValueError, KeyError, TypeError) as e:
+                self.skipped += 1
+                logger.warning("Skipping malformed message from ingest hub (%s): %.100r", e, line)
+
+    def _dispatch(self, message):
+        if message["t"] == "s":
+            publish = self.router.publish
+            for value, topic, device_id in message["b"]:
+                publish(value, topic, device_id)
+            self.received += len(message["b"])
+            return
+
+        self.events_in += 1
+        handler = self.handlers.get(message["k"])
+        if handler is None:
+            return
+        try:
+            handler(message["d"])
+        except Exception as e:
+            logger.exception("Cluster event %s failed: %s", message["k"], e)
+
+    def stats(self):
+        return {
+            "connected": self.connected,
+            "samples_received": self.received,
+            "events_in": self.events_in,
+            "events_out": self.events_out,
+            "messages_skipped": self.skipped,
+        }
+
+
+def _score_rows_out(rows):
+    return [{**row, "timestamp": row["timestamp"].isoformat() if row.get("timestamp") else None} for row in rows]
+
+
+def _score_rows_in(rows):
+    return [{**row, "timestamp": datetime.fromisoformat(row["timestamp"]) if row.get("timestamp") else None} for row in rows]
+
+
+def _apply_remote_scores(rows, indexes):
+    for index in indexes:
+        index.add_rows(rows)
+
+
+def _apply_mqtt_health(link, status):
+    link.mqtt_health = status
+    detail = f"via ingest process: {status['state']}"
+    if status.get("broker"):
+        detail += f" ({status['broker']})"
+    readiness.set("mqtt", status["state"] in ("connected", "disabled"), detail)
+
+
+def attach_worker(path=None):
+    """Wire this worker's router, leaderboard and spectator hub to the ingest process."""
+    from . game_ws import watch_hub
+    from . history import score_stats
+    from . input_router import input_router
+    from . leaderboard import leaderboard
+    from . score_writer import score_writer
+
+    link = WorkerLink(
+        path or config.IPC_SOCKET,
+        input_router,
+        handlers={
+            SCORE_EVENT: lambda rows: _apply_remote_scores(_score_rows_in(rows), (leaderboard, score_stats)),
+            WATCH_EVENT: lambda event: watch_hub.apply_remote(*event),
+            MQTT_EVENT: lambda status: _apply_mqtt_health(link, status),
+            METRICS_EVENT: metrics.registry.relay,
+        },
+    )
+    # Scores saved here go to the other workers' leaderboards (the writer calls back on its own thread)
+    score_writer.on_commit.append(lambda rows: link.send_event_threadsafe(SCORE_EVENT, _score_rows_out(rows)))
+    watch_hub.relay = lambda *event: link.send_event(WATCH_EVENT, event)
+
+    metrics.callback("powermatch_cluster_connected", "1 while this worker is connected to the ingest process", lambda: int(link.connected))
+    metrics.callback("powermatch_cluster_samples_total", "Samples received from the ingest process", lambda: link.received, kind="counter")
+    return link
+
+
+async def _relay_metrics(hub):
+    # The ingest process serves no /metrics; every worker shows its MQTT metrics instead
+    last = None
+    while True:
+        rendered = metrics.registry.export(_METRICS_PREFIX)
+        if rendered != last:
+            hub.send_event(METRICS_EVENT, rendered)
+            last = rendered
+        await asyncio.sleep(_METRICS_INTERVAL)
+
+
+async def run_ingest(path=None):
+    from . mqtt_input import MQTTInputHandler
+
+    hub = IngestHub(path or config.IPC_SOCKET)
+    await hub.start()
+    if config.MQTT_ENABLED:
+        mqtt = MQTTInputHandler(asyncio.get_running_loop(), router=hub)
+        mqtt.on_status = lambda status: hub.send_event(MQTT_EVENT, status)
+        mqtt.start()
+    else:
+        mqtt = None
+        hub.send_event(MQTT_EVENT, {"state": "disabled"})
+        logger.info("MQTT input disabled; ingest process only relays events between workers")
+    relay = asyncio.create_task(_relay_metrics(hub))
+    try:
+        await asyncio.Event().wait()  # until the process is terminated
+    finally:
+        relay.cancel()
+        if mqtt is not None:
+            mqtt.stop()
+        await hub.stop()
+
+
+def ingest_main(path, log_level=None):
+    # Entry point of the ingest process started by the CLI
+    from . import logs
+    logs.configure_logging(log_level)
+    try:
+        asyncio.run(run_ingest(path))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,95 @@
+# powermatch/config.py
+# Runtime settings, overridable through POWERMATCH_* environment variables.
+import os
+
+
+def _env_str(name, default):
+    return os.getenv(f"POWERMATCH_{name}", default)
+
+
+def _env_int(name, default):
+    value = os.getenv(f"POWERMATCH_{name}")
+    return int(value) if value not in (None, "") else default
+
+
+def _env_bool(name, default):
+    value = os.getenv(f"POWERMATCH_{name}")
+    if value in (None, ""):
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def _env_float(name, default):
+    value = os.getenv(f"POWERMATCH_{name}")
+    return float(value) if value not in (None, "") else default
+
+
+# --- Input routing ---
+INPUT_QUEUE_SIZE = _env_int("INPUT_QUEUE_SIZE", 64)         # Max buffered samples per game session
+INPUT_DROP_POLICY = _env_str("INPUT_DROP_POLICY", "drop_oldest")  # "drop_oldest" or "drop_newest"
+
+# --- MQTT input ---
+MQTT_ENABLED = _env_bool("MQTT_ENABLED", True)
+MQTT_BROKER = _env_str("MQTT_BROKER", "raspberrypi.local")
+MQTT_PORT = _env_int("MQTT_PORT", 1883)
+MQTT_TOPIC = _env_str("MQTT_TOPIC", "Strommessung_PowerMatch/events/rpc")
+MQTT_BROKERS = _env_str("MQTT_BROKERS", "")  # "host[:port],host2[:port]" tried in turn; empty uses MQTT_BROKER:MQTT_PORT
+MQTT_TOPICS = _env_str("MQTT_TOPICS", "")    # Comma-separated topics to subscribe to; empty uses MQTT_TOPIC
+MQTT_KEEPALIVE = _env_int("MQTT_KEEPALIVE", 15)              # Seconds; a silent broker is detected after ~1.5x this
+MQTT_RECONNECT_MIN = _env_float("MQTT_RECONNECT_MIN", 0.25)  # First reconnect delay, doubled per failed attempt...
+MQTT_RECONNECT_MAX = _env_float("MQTT_RECONNECT_MAX", 1.0)   # ...up to this; bounds how late input resumes after an outage
+MQTT_HANDOFF_SIZE = _env_int("MQTT_HANDOFF_SIZE", 1024)  # Samples buffered between the MQTT thread and the event loop
+
+
+def mqtt_brokers():
+    brokers = []
+    for item in (MQTT_BROKERS or f"{MQTT_BROKER}:{MQTT_PORT}").split(","):
+        host, _, port = item.strip().partition(":")
+        if host:
+            brokers.append((host, int(port) if port else MQTT_PORT))
+    return brokers
+
+
+def mqtt_topics():
+    return [t.strip() for t in (MQTT_TOPICS or MQTT_TOPIC).split(",") if t.strip()]
+
+
+# --- Game timing ---
+TICK_RATE = _env_float("TICK_RATE", 1.0)               # Ticks per second
+SESSION_SECONDS = _env_float("SESSION_SECONDS", 30.0)  # Game length
+TICK_AGGREGATE = _env_str("TICK_AGGREGATE", "last")    # How samples in a tick window combine: last, mean or max
+
+# --- Curves ---
+CURVES_FILE = _env_str("CURVES_FILE", "")                    # Curves JSON; empty uses the packaged normalized_curves.json
+CURVES_RELOAD_SECONDS = _env_float("CURVES_RELOAD_SECONDS", 2.0)  # How often to check the file for changes; 0 turns reload off
+CURVE_SOURCE = _env_str("CURVE_SOURCE", "file")              # "file", or "procedural" for a new seeded curve every game
+
+# --- Input filtering ---
+# Filter chain applied to raw samples before tick aggregation, e.g. "outlier:4,median:3,ema:0.5,gap:linear:3".
+# Empty keeps raw samples. POWERMATCH_FILTER_<DIFFICULTY> (e.g. POWERMATCH_FILTER_HARD) overrides per difficulty.
+FILTER = _env_str("FILTER", "")
+
+
+def filter_spec(difficulty):
+    return _env_str(f"FILTER_{difficulty.upper()}", FILTER)
+
+
+# --- Logging ---
+LOG_LEVEL = _env_str("LOG_LEVEL", "INFO")   # Level for all powermatch.* loggers
+LOG_LEVELS = _env_str("LOG_LEVELS", "")     # Per-module overrides, e.g. "engine=DEBUG,mqtt_input=WARNING"
+LOG_ADMIN_TOKEN = _env_str("LOG_ADMIN_TOKEN", "")  # Required by PUT /api/logging; empty disables runtime changes
+
+# --- Spectators ---
+WATCH_BUFFER_SIZE = _env_int("WATCH_BUFFER_SIZE", 32)        # Messages buffered per spectator socket
+WATCH_OVERFLOW = _env_str("WATCH_OVERFLOW", "drop_oldest")   # "drop_oldest" or "disconnect" for lagging spectators
+
+# --- Session recordings ---
+RECORD_SESSIONS = _env_bool("RECORD_SESSIONS", True)       # Record raw samples and ticks for replay
+RECORDINGS_DIR = _env_str("RECORDINGS_DIR", "./recordings")
+RECORDINGS_MAX_FILES = _env_int("RECORDINGS_MAX_FILES", 2000)  # Oldest recordings are deleted beyond this; 0 = no limit
+RECORDINGS_MAX_MB = _env_float("RECORDINGS_MAX_MB", 100.0)     # ...or beyond this total size; 0 = no limit
+
+# --- Multi-process mode ---
+WORKERS = _env_int("WORKERS", 1)            # uvicorn worker processes; >1 adds a dedicated MQTT ingest process
+IPC_SOCKET = _env_str("IPC_SOCKET", "")     # Unix socket between the ingest process and workers (set by the CLI)
+IPC_WRITE_LIMIT = _env_int("IPC_WRITE_LIMIT", 8 << 20)  # Bytes queued for one worker before the ingest process drops it
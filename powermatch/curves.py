@@ -0,0 +1,256 @@
+# powermatch/curves.py
+# Curve library: target curves validated and compiled once into array-backed scoring tables,
+# hot-reloaded when the curves file changes, plus seeded procedural curves.
+import asyncio
+import json
+import logging
+import math
+import os
+import random
+from array import array
+from functools import lru_cache
+from . import config
+
+logger = logging.getLogger(__name__)
+
+CURVE_LENGTH = 30  # points in a procedural curve; file curves may have any length
+CURVES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "normalized_curves.json")
+
+SOURCE_FILE = "file"
+SOURCE_PROCEDURAL = "procedural"
+
+# Per-difficulty tolerance band (W) and score multiplier; unknown difficulties score like "hard" at 1.0x
+TOLERANCES = {"easy": 15.0, "medium": 10.0, "hard": 6.0}
+MULTIPLIERS = {"easy": 1.0, "medium": 1.25, "hard": 1.5}
+DEFAULT_TOLERANCE = 6.0
+DEFAULT_MULTIPLIER = 1.0
+
+# Procedural shape per difficulty: (min hold, max hold) in points, level range in W, max step between levels
+PROCEDURAL = {
+    "easy": {"hold": (3, 5), "levels": (8, 45), "max_step": 20},
+    "medium": {"hold": (2, 4), "levels": (8, 45), "max_step": 30},
+    "hard": {"hold": (2, 3), "levels": (5, 45), "max_step": 35},
+}
+
+
+class CompiledCurve:
+    """Target, tolerance and multiplier for one difficulty, ready for scoring."""
+
+    __slots__ = ("difficulty", "target", "tolerance", "multiplier", "target_list", "tolerance_list")
+
+    def __init__(self, difficulty, target, tolerance, multiplier):
+        self.difficulty = difficulty
+        self.target = array("d", target)
+        self.tolerance = array("d", tolerance)
+        self.multiplier = multiplier
+        # Plain-list copies for the JSON init message, built once instead of per session
+        self.target_list = list(target)
+        self.tolerance_list = list(tolerance)
+
+    def __len__(self):
+        return len(self.target)
+
+    def score_tick(self, t, actual):
+        if actual is None:
+            return 0.0
+        tolerance = self.tolerance[t]
+        distance = abs(actual - self.target[t])
+        if distance <= tolerance:
+            return round(100 * (1 - (distance / tolerance)) * self.multiplier, 1)
+        return 0.0
+
+    def resample(self, points):
+        """Step-hold the curve onto `points` ticks (e.g. a 30-point curve onto 60 half-second ticks)."""
+        n = len(self.target)
+        index = [i * n // points for i in range(points)]
+        curve = CompiledCurve.__new__(CompiledCurve)
+        curve.difficulty = self.difficulty
+        curve.multiplier = self.multiplier
+        curve.target_list = [self.target_list[i] for i in index]
+        curve.tolerance_list = [self.tolerance_list[i] for i in index]
+        curve.target = array("d", curve.target_list)
+        curve.tolerance = array("d", curve.tolerance_list)
+        return curve
+
+    def score_series(self, samples):
+        """Score a whole series of per-tick samples in one pass; returns (tick_scores, total)."""
+        multiplier = self.multiplier
+        scores = [
+            round(100 * (1 - (abs(actual - target) / tolerance)) * multiplier, 1)
+            if actual is not None and abs(actual - target) <= tolerance else 0.0
+            for actual, target, tolerance in zip(samples, self.target, self.tolerance)
+        ]
+        return scores, sum(scores)
+
+
+def compile_curve(difficulty, curve, tolerance=None, multiplier=None):
+    key = difficulty.lower()
+    if tolerance is None:
+        tolerance = TOLERANCES.get(key, DEFAULT_TOLERANCE)
+    if not isinstance(tolerance, list):
+        tolerance = [float(tolerance)] * len(curve)
+    if multiplier is None:
+        multiplier = MULTIPLIERS.get(key, DEFAULT_MULTIPLIER)
+    return CompiledCurve(key, curve, tolerance, multiplier)
+
+
+def _number_list(values, what, positive=False):
+    if not isinstance(values, list) or not values:
+        raise ValueError(f"{what} must be a non-empty list of numbers")
+    out = []
+    for v in values:
+        if isinstance(v, bool) or not isinstance(v, (int, float)) or not math.isfinite(v) or v < 0 or (positive and v == 0):
+            raise ValueError(f"{what} contains invalid value {v!r}")
+        out.append(float(v))
+    return out
+
+
+def validate_entry(key, entry):
+    """
+    Turn one curves-file entry into a CompiledCurve, or raise ValueError. Entries look like
+    {"curve": [...], "tolerance": 10 or [...], "multiplier": 1.25}; only "curve" is required.
+    """
+    if not isinstance(entry, dict):
+        raise ValueError("entry must be an object")
+    curve = _number_list(entry.get("curve"), "curve")
+    tolerance = entry.get("tolerance")
+    if isinstance(tolerance, list):
+        tolerance = _number_list(tolerance, "tolerance", positive=True)
+        if len(tolerance) != len(curve):
+            raise ValueError(f"tolerance has {len(tolerance)} points, curve has {len(curve)}")
+    elif tolerance is not None:
+        tolerance = _number_list([tolerance], "tolerance", positive=True)[0]
+    multiplier = entry.get("multiplier")
+    if multiplier is not None:
+        multiplier = _number_list([multiplier], "multiplier", positive=True)[0]
+    return compile_curve(key, curve, tolerance, multiplier)
+
+
+def _read_curves(path):
+    with open(path, "r", encoding="utf-8") as f:
+        all_curves = json.load(f)
+    if not isinstance(all_curves, dict):
+        raise ValueError(f"{path} must contain an object keyed by difficulty")
+
+    compiled = {}
+    for key, entry in all_curves.items():
+        try:
+            compiled[key.lower()] = validate_entry(key, entry)
+        except ValueError as e:
+            logger.error("Curve for '%s' in %s is invalid, skipping: %s", key, path, e)
+    return compiled
+
+
+@lru_cache(maxsize=256)
+def generate_curve(difficulty, seed):
+    """Procedural step curve, fully determined by (difficulty, seed)."""
+    key = difficulty.lower()
+    shape = PROCEDURAL.get(key, PROCEDURAL["hard"])
+    rng = random.Random(f"powermatch:{key}:{seed}")  # str seeds hash the same in every process
+    (hold_min, hold_max), (low, high), max_step = shape["hold"], shape["levels"], shape["max_step"]
+
+    points = []
+    level = rng.randint(low, (low + high) // 2)
+    while len(points) < CURVE_LENGTH:
+        points.extend([float(level)] * rng.randint(hold_min, hold_max))
+        level = min(high, max(low, level + rng.randint(-max_step, max_step)))
+    return compile_curve(key, points[:CURVE_LENGTH])
+
+
+@lru_cache(maxsize=1024)
+def procedural_curve(difficulty, seed, points=None):
+    curve = generate_curve(difficulty, seed)
+    return curve if points in (None, len(curve)) else curve.resample(points)
+
+
+class CurveLibrary:
+    """File curves held in memory; reload() swaps in a new set only if the file parses."""
+
+    def __init__(self, path=None):
+        self.path = path or config.CURVES_FILE or CURVES_PATH
+        # (curves, resampled) where resampled maps (difficulty, points) -> CompiledCurve. Reloads run
+        # in a worker thread and replace the pair with one assignment, so get() never mixes two sets.
+        self._current = None
+        self._mtime = None
+        self.reloads = 0
+        self.reload_failures = 0
+
+    def load(self, path=None):
+        """(Re)load and compile every curve; keeps the previous set if the file cannot be read."""
+        if path is not None:
+            self.path = path
+        self._load()
+        return self._current[0]
+
+    def _load(self):
+        try:
+            mtime = os.stat(self.path).st_mtime
+            curves = _read_curves(self.path)
+        except Exception as e:
+            logger.error("Could not load curves from %s: %s", self.path, e)
+            if self._current is None:
+                self._current = ({}, {})
+            return False
+        self._current, self._mtime = (curves, {}), mtime
+        logger.info("Loaded %d curve(s) from %s", len(curves), self.path)
+        return True
+
+    def reload_if_changed(self):
+        try:
+            mtime = os.stat(self.path).st_mtime
+        except OSError:
+            return False
+        if mtime == self._mtime:
+            return False
+        if self._load():
+            self.reloads += 1
+        else:
+            self.reload_failures += 1
+            self._mtime = mtime  # a broken file is not retried until it changes again
+        return True
+
+    async def watch(self, interval):
+        # Polls the file's mtime; a changed file is parsed off the event loop
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await asyncio.to_thread(self.reload_if_changed)
+            except Exception as e:
+                logger.exception("Curve reload failed: %s", e)
+
+    def names(self):
+        if self._current is None:
+            self.load()
+        return sorted(self._current[0])
+
+    def get(self, difficulty, points=None, seed=None, source=None):
+        """Compiled curve for a difficulty, optionally resampled to `points` ticks."""
+        if (source or config.CURVE_SOURCE) == SOURCE_PROCEDURAL:
+            return procedural_curve(difficulty.lower(), seed or 0, points)
+        if self._current is None:
+            self.load()
+        key = difficulty.lower()
+        curves, resampled = self._current
+        curve = curves.get(key)
+        if curve is None:
+            # No file curve for this difficulty: a seeded procedural one instead of a flat line
+            logger.warning("No curve for difficulty '%s' in %s, using a procedural curve.", difficulty, self.path)
+            return procedural_curve(key, seed or 0, points)
+
+        if points is None or points == len(curve):
+            return curve
+        cached = resampled.get((key, points))
+        if cached is None:
+            cached = resampled[(key, points)] = curve.resample(points)
+        return cached
+
+
+curve_library = CurveLibrary()
+
+
+def load_curves(path=None):
+    return curve_library.load(path)
+
+
+def get_curve(difficulty, points=None, seed=None, source=None):
+    return curve_library.get(difficulty, points, seed, source)
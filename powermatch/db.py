@@ -1,11 +1,23 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
-from . score import Base
+from . score import Base, Score
 
 DATABASE_URL = "sqlite:///./scores.db"
 
-engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
+# timeout: with --workers N several processes commit scores; wait for the write lock instead of failing
+engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False, "timeout": 15})
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+@event.listens_for(engine, "connect")
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    # WAL lets readers (highscores) run while the score writer commits; NORMAL sync is safe under WAL
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.close()
+
 def init_db():
     Base.metadata.create_all(bind=engine)
+    # create_all skips tables that already exist, so add indexes introduced later to older databases
+    for index in Score.__table__.indexes:
+        index.create(bind=engine, checkfirst=True)
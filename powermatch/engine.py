@@ -1,107 +1,101 @@
 import random
 import asyncio
-import time
-import json
-import os
-from . mqtt_input import input_queue
+import logging
+from . import config
+from . import metrics
+from . curves import get_curve
+from . filters import parse_spec
+from . scheduler import TickScheduler, drain, get_aggregator
+
+logger = logging.getLogger(__name__)
+
+TICKS = metrics.counter("powermatch_ticks_total", "Ticks emitted by live game sessions")
+EMPTY_TICKS = metrics.counter("powermatch_empty_ticks_total", "Live ticks with no input samples in their window (last value held)")
+TICK_SAMPLES = metrics.counter("powermatch_tick_samples_total", "Input samples consumed by live ticks")
+TICK_LAG = metrics.histogram("powermatch_tick_lag_seconds", "Delay between a tick's scheduled deadline and its emission")
 
 class GameEngine:
-    def __init__(self, name, difficulty, input_source=None):
+    def __init__(self, name, difficulty, input_source=None, tick_rate=None, duration=None, aggregate=None,
+                 seed=None, recorder=None, filter_spec=None, curve_source=None):
         self.name = name
         self.difficulty = difficulty
-        self.seed = random.randint(1000, 9999)
-        self.target_curve = self.load_precomputed_curve()
-        self.tolerance_curve = self.generate_tolerance()
+        self.seed = seed if seed is not None else random.randint(1000, 9999)
+        self.tick_rate = tick_rate or config.TICK_RATE
+        self.duration = duration or config.SESSION_SECONDS  # seconds
+        self.ticks = max(1, round(self.duration * self.tick_rate))
+        self.aggregate_name = aggregate or config.TICK_AGGREGATE
+        self.aggregate = get_aggregator(self.aggregate_name)
+        self.curve_source = curve_source or config.CURVE_SOURCE
+        self.curve = get_curve(difficulty, points=self.ticks, seed=self.seed, source=self.curve_source)  # shared, compiled once
+        self.target_curve = self.curve.target_list
+        self.tolerance_curve = self.curve.tolerance_list
         self.total_score = 0
-        self.input_queue = input_source or input_queue
-
-    def load_precomputed_curve(self):
+        self.input_queue = input_source if input_source is not None else asyncio.Queue()
+        self.scheduler = None
+        self.recorder = recorder  # optional replay.Recorder capturing raw samples and tick outputs
+        self.filter_spec = config.filter_spec(difficulty) if filter_spec is None else filter_spec
         try:
-            base_dir = os.path.dirname(os.path.abspath(__file__))  # → powermatch/
-            json_path = os.path.join(base_dir, "data", "normalized_curves.json")
-
-            with open(json_path, "r", encoding="utf-8") as f:
-                all_curves = json.load(f)
-
-            key = self.difficulty.lower()
-            curve = all_curves.get(key, {}).get("curve", [])
-
-            if not curve or len(curve) != 30:
-                raise ValueError(f"Curve for '{self.difficulty}' not valid or missing.")
-
-            print(f"Loaded curve from JSON for difficulty {self.difficulty}: {curve}")
-            return curve
-
-        except Exception as e:
-            print(f"[ERROR] Could not load precomputed curve: {e}")
-            return [0.0] * 30
-
-
-
-    def generate_tolerance(self):
-        if self.difficulty == "Easy":
-            return [15 for _ in range(30)]
-        elif self.difficulty == "Medium":
-            return [10 for _ in range(30)]
-        else:  # Hard
-            return [6 for _ in range(30)]
-
-        
+            self.filter = parse_spec(self.filter_spec)  # per-session state; raw samples are still what gets recorded
+        except ValueError as e:
+            logger.error("Invalid filter spec for %s, using raw samples: %s", difficulty, e)
+            self.filter_spec = ""
+            self.filter = parse_spec("")
+        self._last_known = 0.0
 
     def get_curve_preview(self):
-
-        print(f"Generated tolerance: {self.tolerance_curve} for difficulty {self.difficulty}")
-
-        return self.target_curve, self.tolerance_curve
-
-    def compute_tick_score(self, actual, target, tolerance):
-        if actual is None or target is None or tolerance is None:
-            return 0.0
-
-        distance = abs(actual - target)
-        if distance <= tolerance:
-            base_score = 100 * (1 - (distance / tolerance))
-            multiplier = {
-                "Easy": 1.0,
-                "Medium": 1.25,
-                "Hard": 1.5
-            }.get(self.difficulty, 1.0)
-            return round(base_score * multiplier, 1)
+        # The frontend draws one curve point per second, whatever the tick rate
+        preview = get_curve(self.difficulty, points=max(1, round(self.duration)), seed=self.seed, source=self.curve_source)
+        return preview.target_list, preview.tolerance_list
+
+    def score_samples(self, samples):
+        """Re-score a recorded per-tick sample series without running the clock."""
+        return self.curve.score_series(samples)
+
+    def process_tick(self, t, samples):
+        """Score one tick from the raw samples of its window; shared by live runs and replays."""
+        window = self.filter.run(samples)
+        if window:
+            actual = self.aggregate(window)
+            self._last_known = actual
+            self.filter.observe(actual)
         else:
-            return 0.0
+            actual = self.filter.fill_gap(self._last_known)
+
+        target = self.target_curve[t]
+        tolerance = self.tolerance_curve[t]
+        tick_score = self.curve.score_tick(t, actual)
+        self.total_score += tick_score
+
+        if self.recorder is not None:
+            self.recorder.tick(t, samples, actual, tick_score)
+
+        return {
+            "type": "tick",
+            "tickNumber": t,
+            "actual": actual,
+            "target": target,
+            "tolerance": tolerance,
+            "tickScore": tick_score,
+            "totalScore": round(self.total_score, 1),
+            "samples": len(samples)
+        }
 
     async def run(self):
-        last_known = 0.0
-
-        for t in range(30):
-
-            tick_start_time = time.monotonic()
-
-
-            try:
-                actual = await asyncio.wait_for(self.input_queue.get(), timeout=1.0)
-                last_known = actual
-            except asyncio.TimeoutError:
-                actual = last_known
-
-            target = self.target_curve[t]
-            tolerance = self.tolerance_curve[t]
-            tick_score = self.compute_tick_score(actual, target, tolerance)
-            self.total_score += tick_score
-
-            tick_data_to_yield = {
-                "type": "tick",
-                "tickNumber": t,
-                "actual": actual,
-                "target": target,
-                "tolerance": tolerance,
-                "tickScore": tick_score,
-                "totalScore": round(self.total_score, 1)
-            }
-            print(f"[ENGINE_YIEALD_DEBUG] Yielding: {tick_data_to_yield}")  # Debug print
+        self.scheduler = TickScheduler(tick_rate=self.tick_rate, ticks=self.ticks)
+
+        async for t in self.scheduler:
+            # Everything that arrived during this tick window, aggregated into one reading
+            tick_data_to_yield = self.process_tick(t, drain(self.input_queue))
+            tick_data_to_yield["jitter"] = self.scheduler.last_jitter
+            TICKS.inc()
+            TICK_LAG.observe(self.scheduler.last_jitter)
+            if tick_data_to_yield["samples"]:
+                TICK_SAMPLES.inc(tick_data_to_yield["samples"])
+            else:
+                EMPTY_TICKS.inc()
+            logger.debug("Yielding: %s", tick_data_to_yield)
             yield tick_data_to_yield
 
-            elapsed_time = time.monotonic() - tick_start_time
-            sleep_time = 1.0 - elapsed_time # Calculate how much time is left to sleep
-            if sleep_time > 0:
-                await asyncio.sleep(sleep_time)
+    def replay(self, samples_per_tick):
+        """Re-run scoring over recorded per-tick sample windows as fast as possible (no clock)."""
+        return [self.process_tick(t, samples) for t, samples in enumerate(samples_per_tick)]
@@ -0,0 +1,220 @@
+# powermatch/filters.py
+# Per-session smoothing of raw meter samples before they are aggregated into a tick.
+#
+# A chain is described by a spec string, e.g. "outlier:4,median:3,ema:0.5,gap:linear:3":
+#   outlier:K        drop samples more than K mean absolute deviations from the running mean
+#   median:N         running median of the last N samples (N odd, small)
+#   mean:N           moving average over the last N samples
+#   ema:ALPHA        exponential moving average, 0 < ALPHA <= 1
+#   gap:hold         tick with no samples repeats the last reading (the default)
+#   gap:linear:N     ...or continues the last trend for up to N ticks, then holds
+# Stages run in the order given. Buffers are preallocated and every stage is O(1) per
+# sample (median sorts its N-sample window), so filtering keeps up with fast meters.
+from array import array
+
+GAP_HOLD = "hold"
+GAP_LINEAR = "linear"
+
+
+class OutlierFilter:
+    """
+    Rejects spikes: compares each sample with an exponentially weighted mean and mean absolute
+    deviation. A run of `max_streak` rejections in a row is taken as a real level change (the
+    player switched something on), so the next sample is accepted and becomes the new mean.
+    """
+
+    __slots__ = ("k", "alpha", "warmup", "max_streak", "mean", "deviation", "seen", "streak", "rejected")
+
+    def __init__(self, k=4.0, alpha=0.1, warmup=5, max_streak=3):
+        self.k = k
+        self.alpha = alpha
+        self.warmup = warmup  # samples accepted unconditionally while the estimates settle
+        self.max_streak = max_streak
+        self.reset()
+
+    def reset(self):
+        self.mean = 0.0
+        self.deviation = 0.0
+        self.seen = 0
+        self.streak = 0
+        self.rejected = 0
+
+    def process(self, value):
+        if self.seen >= self.warmup and self.deviation > 0 and abs(value - self.mean) > self.k * self.deviation:
+            if self.streak < self.max_streak:
+                self.streak += 1
+                self.rejected += 1
+                return None
+            self.mean = value  # sustained jump: follow it
+        self.streak = 0
+        if self.seen == 0:
+            self.mean = value
+        else:
+            self.deviation += self.alpha * (abs(value - self.mean) - self.deviation)
+            self.mean += self.alpha * (value - self.mean)
+        self.seen += 1
+        return value
+
+
+class MovingAverage:
+    __slots__ = ("size", "buffer", "index", "count", "total")
+
+    def __init__(self, size=5):
+        self.size = size
+        self.buffer = array("d", bytes(8 * size))
+        self.reset()
+
+    def reset(self):
+        for i in range(self.size):
+            self.buffer[i] = 0.0
+        self.index = 0
+        self.count = 0
+        self.total = 0.0
+
+    def process(self, value):
+        buffer = self.buffer
+        self.total += value - buffer[self.index]
+        buffer[self.index] = value
+        self.index = (self.index + 1) % self.size
+        if self.count < self.size:
+            self.count += 1
+        return self.total / self.count
+
+
+class MedianFilter:
+    __slots__ = ("size", "buffer", "index", "count")
+
+    def __init__(self, size=3):
+        self.size = size
+        self.buffer = array("d", bytes(8 * size))
+        self.reset()
+
+    def reset(self):
+        self.index = 0
+        self.count = 0
+
+    def process(self, value):
+        buffer = self.buffer
+        buffer[self.index] = value
+        self.index = (self.index + 1) % self.size
+        if self.count < self.size:
+            self.count += 1
+        count = self.count
+        if count == 3:
+            a, b, c = buffer[0], buffer[1], buffer[2]  # common case: comparisons only, no sort
+            if a > b:
+                a, b = b, a
+            return a if c <= a else b if c >= b else c
+        window = sorted(buffer[:count]) if count < self.size else sorted(buffer)
+        return window[count // 2] if count % 2 else (window[count // 2 - 1] + window[count // 2]) / 2
+
+
+class ExponentialAverage:
+    __slots__ = ("alpha", "value")
+
+    def __init__(self, alpha=0.5):
+        self.alpha = alpha
+        self.reset()
+
+    def reset(self):
+        self.value = None
+
+    def process(self, value):
+        if self.value is None:
+            self.value = value
+        else:
+            self.value += self.alpha * (value - self.value)
+        return self.value
+
+
+_STAGES = {
+    "outlier": (OutlierFilter, float),
+    "median": (MedianFilter, int),
+    "mean": (MovingAverage, int),
+    "ema": (ExponentialAverage, float),
+}
+
+
+class FilterChain:
+    """Filter stages plus gap handling for one session; deterministic, so replays reproduce it exactly."""
+
+    def __init__(self, stages=(), gap=GAP_HOLD, max_gap=0, spec=""):
+        self.stages = list(stages)
+        self.gap = gap
+        self.max_gap = max_gap
+        self.spec = spec
+        self._process = [stage.process for stage in self.stages]
+        self._window = []  # reused by run()
+        self._last = None
+        self._previous = None
+        self._gap_ticks = 0
+
+    def reset(self):
+        for stage in self.stages:
+            stage.reset()
+        self._last = self._previous = None
+        self._gap_ticks = 0
+
+    def process(self, value):
+        for process in self._process:
+            value = process(value)
+            if value is None:
+                return None
+        return value
+
+    def run(self, samples):
+        """Filter one tick window; rejected samples are left out. The result is only valid until the next call."""
+        if not self._process:
+            return samples
+        out = self._window
+        out.clear()
+        for value in samples:
+            value = self.process(value)
+            if value is not None:
+                out.append(value)
+        return out
+
+    def observe(self, reading):
+        # Aggregated reading of a tick that had samples
+        self._previous = self._last
+        self._last = reading
+        self._gap_ticks = 0
+
+    def fill_gap(self, last_known):
+        """Reading for a tick without usable samples."""
+        self._gap_ticks += 1
+        if (self.gap == GAP_LINEAR and self._gap_ticks <= self.max_gap
+                and self._last is not None and self._previous is not None):
+            return max(0.0, self._last + (self._last - self._previous) * self._gap_ticks)
+        return last_known
+
+
+def parse_spec(spec):
+    """Build a FilterChain from a spec string; raises ValueError on unknown stages or bad parameters."""
+    stages, gap, max_gap = [], GAP_HOLD, 0
+    for item in (spec or "").split(","):
+        item = item.strip()
+        if not item:
+            continue
+        name, *params = item.split(":")
+        name = name.strip().lower()
+        if name == "gap":
+            gap = params[0].strip().lower() if params else GAP_HOLD
+            if gap not in (GAP_HOLD, GAP_LINEAR):
+                raise ValueError(f"Unknown gap mode '{gap}' in filter spec '{spec}'")
+            if len(params) > (2 if gap == GAP_LINEAR else 1):
+                raise ValueError(f"Too many parameters in '{item}' in filter spec '{spec}'")
+            max_gap = int(params[1]) if gap == GAP_LINEAR and len(params) > 1 else (3 if gap == GAP_LINEAR else 0)
+            continue
+        if name not in _STAGES:
+            raise ValueError(f"Unknown filter '{name}' in filter spec '{spec}'")
+        cls, convert = _STAGES[name]
+        if len(params) > 1:
+            raise ValueError(f"Too many parameters in '{item}' in filter spec '{spec}'")
+        args = [convert(p) for p in params]
+        if args and cls in (MedianFilter, MovingAverage) and args[0] < 1:
+            raise ValueError(f"Filter '{item}' needs a window of at least 1")
+        if args and cls is ExponentialAverage and not 0 < args[0] <= 1:
+            raise ValueError(f"Filter '{item}' needs 0 < alpha <= 1")
+        stages.append(cls(*args))
+    return FilterChain(stages, gap=gap, max_gap=max_gap, spec=spec or "")
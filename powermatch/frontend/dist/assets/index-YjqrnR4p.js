@@ -40,4 +40,4 @@ var Lh=Object.defineProperty;var Fh=(e,t,n)=>t in e?Lh(e,t,{enumerable:!0,config
 * https://www.chartjs.org/chartjs-plugin-annotation/index
  * (c) 2024 chartjs-plugin-annotation Contributors
  * Released under the MIT License
- */const Ic={modes:{point(e,t){return Es(e,t,{intersect:!0})},nearest(e,t,n){return Kx(e,t,n)},x(e,t,n){return Es(e,t,{intersect:n.intersect,axis:"x"})},y(e,t,n){return Es(e,t,{intersect:n.intersect,axis:"y"})}}};function ba(e,t,n){return(Ic.modes[n.mode]||Ic.modes.nearest)(e,t,n)}function Ux(e,t,n){return n!=="x"&&n!=="y"?e.inRange(t.x,t.y,"x",!0)||e.inRange(t.x,t.y,"y",!0):e.inRange(t.x,t.y,n,!0)}function Xx(e,t,n){return n==="x"?{x:e.x,y:t.y}:n==="y"?{x:t.x,y:e.y}:t}function Es(e,t,n){return e.filter(i=>n.intersect?i.inRange(t.x,t.y):Ux(i,t,n.axis))}function Kx(e,t,n){let i=Number.POSITIVE_INFINITY;return Es(e,t,n).reduce((s,o)=>{const r=o.getCenterPoint(),a=Xx(t,r,n.axis),l=Un(t,a);return l<i?(s=[o],i=l):l===i&&s.push(o),s},[]).sort((s,o)=>s._index-o._index).slice(0,1)}function kn(e,t,n){const i=Math.cos(n),s=Math.sin(n),o=t.x,r=t.y;return{x:o+i*(e.x-o)-s*(e.y-r),y:r+s*(e.x-o)+i*(e.y-r)}}const qx=(e,t)=>t>e||e.length>t.length&&e.slice(0,t.length)===t,yn=.001,vo=(e,t,n)=>Math.min(n,Math.max(t,e)),fh=(e,t)=>e.value>=e.start-t&&e.value<=e.end+t;function Gx(e,t,n){for(const i of Object.keys(e))e[i]=vo(e[i],t,n);return e}function Jx(e,t,n,i){return!e||!t||n<=0?!1:Math.pow(e.x-t.x,2)+Math.pow(e.y-t.y,2)<=Math.pow(n+i,2)}function uh(e,{x:t,y:n,x2:i,y2:s},o,{borderWidth:r,hitTolerance:a}){const l=(r+a)/2,c=e.x>=t-l-yn&&e.x<=i+l+yn,f=e.y>=n-l-yn&&e.y<=s+l+yn;return o==="x"?c:(o==="y"||c)&&f}function hh(e,{rect:t,center:n},i,{rotation:s,borderWidth:o,hitTolerance:r}){const a=kn(e,n,Et(-s));return uh(a,t,i,{borderWidth:o,hitTolerance:r})}function Pn(e,t){const{centerX:n,centerY:i}=e.getProps(["centerX","centerY"],t);return{x:n,y:i}}function Qx(e,t,n,i=!0){const s=n.split(".");let o=0;for(const r of t.split(".")){const a=s[o++];if(parseInt(r,10)<parseInt(a,10))break;if(qx(a,r)){if(i)throw new Error(`${e} v${n} is not supported. v${t} or newer is required.`);return!1}}return!0}const dh=e=>typeof e=="string"&&e.endsWith("%"),gh=e=>parseFloat(e)/100,ph=e=>vo(gh(e),0,1),ci=(e,t)=>({x:e,y:t,x2:e,y2:t,width:0,height:0}),Zx={box:e=>ci(e.centerX,e.centerY),doughnutLabel:e=>ci(e.centerX,e.centerY),ellipse:e=>({centerX:e.centerX,centerY:e.centerX,radius:0,width:0,height:0}),label:e=>ci(e.centerX,e.centerY),line:e=>ci(e.x,e.y),point:e=>({centerX:e.centerX,centerY:e.centerY,radius:0,width:0,height:0}),polygon:e=>ci(e.centerX,e.centerY)};function ya(e,t){return t==="start"?0:t==="end"?e:dh(t)?ph(t)*e:e/2}function rn(e,t,n=!0){return typeof t=="number"?t:dh(t)?(n?ph(t):gh(t))*e:e}function t0(e,t){const{x:n,width:i}=e,s=t.textAlign;return s==="center"?n+i/2:s==="end"||s==="right"?n+i:n}function mh(e,t,{borderWidth:n,position:i,xAdjust:s,yAdjust:o},r){const a=st(r),l=t.width+(a?r.width:0)+n,c=t.height+(a?r.height:0)+n,f=_a(i),u=Lc(e.x,l,s,f.x),h=Lc(e.y,c,o,f.y);return{x:u,y:h,x2:u+l,y2:h+c,width:l,height:c,centerX:u+l/2,centerY:h+c/2}}function _a(e,t="center"){return st(e)?{x:it(e.x,t),y:it(e.y,t)}:(e=it(e,t),{x:e,y:e})}const bh=(e,t)=>e&&e.autoFit&&t<1;function yh(e,t){const n=e.font,i=kt(n)?n:[n];return bh(e,t)?i.map(function(s){const o=At(s);return o.size=Math.floor(s.size*t),o.lineHeight=s.lineHeight,At(o)}):i.map(s=>At(s))}function _h(e){return e&&(re(e.xValue)||re(e.yValue))}function Lc(e,t,n=0,i){return e-ya(t,i)+n}function Jn(e,t,n){const i=n.init;if(i){if(i===!0)return vh(t,n)}else return;return e0(e,t,n)}function xh(e,t,n){let i=!1;return t.forEach(s=>{ee(e[s])?(i=!0,n[s]=e[s]):re(n[s])&&delete n[s]}),i}function vh(e,t){const n=t.type||"line";return Zx[n](e)}function e0(e,t,n){const i=mt(n.init,[{chart:e,properties:t,options:n}]);if(i===!0)return vh(t,n);if(st(i))return i}const Qo=new Map,n0=e=>isNaN(e)||e<=0,i0=e=>e.reduce(function(t,n){return t+=n.string,t},"");function wo(e){if(e&&typeof e=="object"){const t=e.toString();return t==="[object HTMLImageElement]"||t==="[object HTMLCanvasElement]"}}function So(e,{x:t,y:n},i){i&&(e.translate(t,n),e.rotate(Et(i)),e.translate(-t,-n))}function Ve(e,t){if(t&&t.borderWidth)return e.lineCap=t.borderCapStyle||"butt",e.setLineDash(t.borderDash),e.lineDashOffset=t.borderDashOffset,e.lineJoin=t.borderJoinStyle||"miter",e.lineWidth=t.borderWidth,e.strokeStyle=t.borderColor,!0}function Qn(e,t){e.shadowColor=t.backgroundShadowColor,e.shadowBlur=t.shadowBlur,e.shadowOffsetX=t.shadowOffsetX,e.shadowOffsetY=t.shadowOffsetY}function Mo(e,t){const n=t.content;if(wo(n))return{width:rn(n.width,t.width),height:rn(n.height,t.height)};const i=yh(t),s=t.textStrokeWidth,o=kt(n)?n:[n],r=o.join()+i0(i)+s+(e._measureText?"-spriting":"");return Qo.has(r)||Qo.set(r,a0(e,o,i,s)),Qo.get(r)}function wh(e,t,n){const{x:i,y:s,width:o,height:r}=t;e.save(),Qn(e,n);const a=Ve(e,n);e.fillStyle=n.backgroundColor,e.beginPath(),qs(e,{x:i,y:s,w:o,h:r,radius:Gx(Bn(n.borderRadius),0,Math.min(o,r)/2)}),e.closePath(),e.fill(),a&&(e.shadowColor=n.borderShadowColor,e.stroke()),e.restore()}function Sh(e,t,n,i){const s=n.content;if(wo(s)){e.save(),e.globalAlpha=f0(n.opacity,s.style.opacity),e.drawImage(s,t.x,t.y,t.width,t.height),e.restore();return}const o=kt(s)?s:[s],r=yh(n,i),a=n.color,l=kt(a)?a:[a],c=t0(t,n),f=t.y+n.textStrokeWidth/2;e.save(),e.textBaseline="middle",e.textAlign=n.textAlign,s0(e,n)&&l0(e,{x:c,y:f},o,r),c0(e,{x:c,y:f},o,{fonts:r,colors:l}),e.restore()}function s0(e,t){if(t.textStrokeWidth>0)return e.lineJoin="round",e.miterLimit=2,e.lineWidth=t.textStrokeWidth,e.strokeStyle=t.textStrokeColor,!0}function o0(e,t,n,i){const{radius:s,options:o}=t,r=o.pointStyle,a=o.rotation;let l=(a||0)*oa;if(wo(r)){e.save(),e.translate(n,i),e.rotate(l),e.drawImage(r,-r.width/2,-r.height/2,r.width,r.height),e.restore();return}n0(s)||r0(e,{x:n,y:i,radius:s,rotation:a,style:r,rad:l})}function r0(e,{x:t,y:n,radius:i,rotation:s,style:o,rad:r}){let a,l,c,f;switch(e.beginPath(),o){default:e.arc(t,n,i,0,Dt),e.closePath();break;case"triangle":e.moveTo(t+Math.sin(r)*i,n-Math.cos(r)*i),r+=Xs,e.lineTo(t+Math.sin(r)*i,n-Math.cos(r)*i),r+=Xs,e.lineTo(t+Math.sin(r)*i,n-Math.cos(r)*i),e.closePath();break;case"rectRounded":f=i*.516,c=i-f,a=Math.cos(r+le)*c,l=Math.sin(r+le)*c,e.arc(t-a,n-l,f,r-ft,r-Ht),e.arc(t+l,n-a,f,r-Ht,r),e.arc(t+a,n+l,f,r,r+Ht),e.arc(t-l,n+a,f,r+Ht,r+ft),e.closePath();break;case"rect":if(!s){c=Math.SQRT1_2*i,e.rect(t-c,n-c,2*c,2*c);break}r+=le;case"rectRot":a=Math.cos(r)*i,l=Math.sin(r)*i,e.moveTo(t-a,n-l),e.lineTo(t+l,n-a),e.lineTo(t+a,n+l),e.lineTo(t-l,n+a),e.closePath();break;case"crossRot":r+=le;case"cross":a=Math.cos(r)*i,l=Math.sin(r)*i,e.moveTo(t-a,n-l),e.lineTo(t+a,n+l),e.moveTo(t+l,n-a),e.lineTo(t-l,n+a);break;case"star":a=Math.cos(r)*i,l=Math.sin(r)*i,e.moveTo(t-a,n-l),e.lineTo(t+a,n+l),e.moveTo(t+l,n-a),e.lineTo(t-l,n+a),r+=le,a=Math.cos(r)*i,l=Math.sin(r)*i,e.moveTo(t-a,n-l),e.lineTo(t+a,n+l),e.moveTo(t+l,n-a),e.lineTo(t-l,n+a);break;case"line":a=Math.cos(r)*i,l=Math.sin(r)*i,e.moveTo(t-a,n-l),e.lineTo(t+a,n+l);break;case"dash":e.moveTo(t,n),e.lineTo(t+Math.cos(r)*i,n+Math.sin(r)*i);break}e.fill()}function a0(e,t,n,i){e.save();const s=t.length;let o=0,r=i;for(let a=0;a<s;a++){const l=n[Math.min(a,n.length-1)];e.font=l.string;const c=t[a];o=Math.max(o,e.measureText(c).width+i),r+=l.lineHeight}return e.restore(),{width:o,height:r}}function l0(e,{x:t,y:n},i,s){e.beginPath();let o=0;i.forEach(function(r,a){const l=s[Math.min(a,s.length-1)],c=l.lineHeight;e.font=l.string,e.strokeText(r,t,n+c/2+o),o+=c}),e.stroke()}function c0(e,{x:t,y:n},i,{fonts:s,colors:o}){let r=0;i.forEach(function(a,l){const c=o[Math.min(l,o.length-1)],f=s[Math.min(l,s.length-1)],u=f.lineHeight;e.beginPath(),e.font=f.string,e.fillStyle=c,e.fillText(a,t,n+u/2+r),r+=u,e.fill()})}function f0(e,t){const n=vn(e)?e:t;return vn(n)?vo(n,0,1):1}const Mh=["left","bottom","top","right"];function u0(e,t){const{pointX:n,pointY:i,options:s}=t,o=s.callout,r=o&&o.display&&m0(t,o);if(!r||y0(t,o,r))return;if(e.save(),e.beginPath(),!Ve(e,o))return e.restore();const{separatorStart:l,separatorEnd:c}=h0(t,r),{sideStart:f,sideEnd:u}=g0(t,r,l);(o.margin>0||s.borderWidth===0)&&(e.moveTo(l.x,l.y),e.lineTo(c.x,c.y)),e.moveTo(f.x,f.y),e.lineTo(u.x,u.y);const h=kn({x:n,y:i},t.getCenterPoint(),Et(-t.rotation));e.lineTo(h.x,h.y),e.stroke(),e.restore()}function h0(e,t){const{x:n,y:i,x2:s,y2:o}=e,r=d0(e,t);let a,l;return t==="left"||t==="right"?(a={x:n+r,y:i},l={x:a.x,y:o}):(a={x:n,y:i+r},l={x:s,y:a.y}),{separatorStart:a,separatorEnd:l}}function d0(e,t){const{width:n,height:i,options:s}=e,o=s.callout.margin+s.borderWidth/2;return t==="right"?n+o:t==="bottom"?i+o:-o}function g0(e,t,n){const{y:i,width:s,height:o,options:r}=e,a=r.callout.start,l=p0(t,r.callout);let c,f;return t==="left"||t==="right"?(c={x:n.x,y:i+rn(o,a)},f={x:c.x+l,y:c.y}):(c={x:n.x+rn(s,a),y:n.y},f={x:c.x,y:c.y+l}),{sideStart:c,sideEnd:f}}function p0(e,t){const n=t.side;return e==="left"||e==="top"?-n:n}function m0(e,t){const n=t.position;return Mh.includes(n)?n:b0(e,t)}function b0(e,t){const{x:n,y:i,x2:s,y2:o,width:r,height:a,pointX:l,pointY:c,centerX:f,centerY:u,rotation:h}=e,d={x:f,y:u},g=t.start,p=rn(r,g),b=rn(a,g),_=[n,n+p,n+p,s],v=[i+b,o,i,o],w=[];for(let S=0;S<4;S++){const M=kn({x:_[S],y:v[S]},d,Et(h));w.push({position:Mh[S],distance:Un(M,{x:l,y:c})})}return w.sort((S,M)=>S.distance-M.distance)[0].position}function y0(e,t,n){const{pointX:i,pointY:s}=e,o=t.margin;let r=i,a=s;return n==="left"?r+=o:n==="right"?r-=o:n==="top"?a+=o:n==="bottom"&&(a-=o),e.inRange(r,a)}const Fc={xScaleID:{min:"xMin",max:"xMax",start:"left",end:"right",startProp:"x",endProp:"x2"},yScaleID:{min:"yMin",max:"yMax",start:"bottom",end:"top",startProp:"y",endProp:"y2"}};function qn(e,t,n){return t=typeof t=="number"?t:e.parse(t),Rt(t)?e.getPixelForValue(t):n}function Sn(e,t,n){const i=t[n];if(i||n==="scaleID")return i;const s=n.charAt(0),o=Object.values(e).filter(r=>r.axis&&r.axis===s);return o.length?o[0].id:s}function kh(e,t){if(e){const n=e.options.reverse,i=qn(e,t.min,n?t.end:t.start),s=qn(e,t.max,n?t.start:t.end);return{start:i,end:s}}}function Ph(e,t){const{chartArea:n,scales:i}=e,s=i[Sn(i,t,"xScaleID")],o=i[Sn(i,t,"yScaleID")];let r=n.width/2,a=n.height/2;return s&&(r=qn(s,t.xValue,s.left+s.width/2)),o&&(a=qn(o,t.yValue,o.top+o.height/2)),{x:r,y:a}}function xa(e,t){const n=e.scales,i=n[Sn(n,t,"xScaleID")],s=n[Sn(n,t,"yScaleID")];if(!i&&!s)return{};let{left:o,right:r}=i||e.chartArea,{top:a,bottom:l}=s||e.chartArea;const c=Hc(i,{min:t.xMin,max:t.xMax,start:o,end:r});o=c.start,r=c.end;const f=Hc(s,{min:t.yMin,max:t.yMax,start:l,end:a});return a=f.start,l=f.end,{x:o,y:a,x2:r,y2:l,width:r-o,height:l-a,centerX:o+(r-o)/2,centerY:a+(l-a)/2}}function Ch(e,t){if(!_h(t)){const n=xa(e,t);let i=t.radius;(!i||isNaN(i))&&(i=Math.min(n.width,n.height)/2,t.radius=i);const s=i*2,o=n.centerX+t.xAdjust,r=n.centerY+t.yAdjust;return{x:o-i,y:r-i,x2:o+i,y2:r+i,centerX:o,centerY:r,width:s,height:s,radius:i}}return x0(e,t)}function _0(e,t){const{scales:n,chartArea:i}=e,s=n[t.scaleID],o={x:i.left,y:i.top,x2:i.right,y2:i.bottom};return s?v0(s,o,t):w0(n,o,t),o}function Oh(e,t){const n=xa(e,t);return n.initProperties=Jn(e,n,t),n.elements=[{type:"label",optionScope:"label",properties:k0(e,n,t),initProperties:n.initProperties}],n}function x0(e,t){const n=Ph(e,t),i=t.radius*2;return{x:n.x-t.radius+t.xAdjust,y:n.y-t.radius+t.yAdjust,x2:n.x+t.radius+t.xAdjust,y2:n.y+t.radius+t.yAdjust,centerX:n.x+t.xAdjust,centerY:n.y+t.yAdjust,radius:t.radius,width:i,height:i}}function Hc(e,t){const n=kh(e,t)||t;return{start:Math.min(n.start,n.end),end:Math.max(n.start,n.end)}}function v0(e,t,n){const i=qn(e,n.value,NaN),s=qn(e,n.endValue,i);e.isHorizontal()?(t.x=i,t.x2=s):(t.y=i,t.y2=s)}function w0(e,t,n){for(const i of Object.keys(Fc)){const s=e[Sn(e,n,i)];if(s){const{min:o,max:r,start:a,end:l,startProp:c,endProp:f}=Fc[i],u=kh(s,{min:n[o],max:n[r],start:s[a],end:s[l]});t[c]=u.start,t[f]=u.end}}}function S0({properties:e,options:t},n,i,s){const{x:o,x2:r,width:a}=e;return Th({start:o,end:r,borderWidth:t.borderWidth},{position:i.x,padding:{start:s.left,end:s.right},adjust:t.label.xAdjust,size:n.width})}function M0({properties:e,options:t},n,i,s){const{y:o,y2:r,height:a}=e;return Th({start:o,end:r,borderWidth:t.borderWidth},{position:i.y,padding:{start:s.top,end:s.bottom},adjust:t.label.yAdjust,size:n.height})}function Th(e,t){const{start:n,end:i,borderWidth:s}=e,{position:o,padding:{start:r,end:a},adjust:l}=t,c=i-s-n-r-a-t.size;return n+s/2+l+ya(c,o)}function k0(e,t,n){const i=n.label;i.backgroundColor="transparent",i.callout.display=!1;const s=_a(i.position),o=Nt(i.padding),r=Mo(e.ctx,i),a=S0({properties:t,options:n},r,s,o),l=M0({properties:t,options:n},r,s,o),c=r.width+o.width,f=r.height+o.height;return{x:a,y:l,x2:a+c,y2:l+f,width:c,height:f,centerX:a+c/2,centerY:l+f/2,rotation:i.rotation}}const kr=["enter","leave"],va=kr.concat("click");function P0(e,t,n){t.listened=xh(n,va,t.listeners),t.moveListened=!1,kr.forEach(i=>{ee(n[i])&&(t.moveListened=!0)}),(!t.listened||!t.moveListened)&&t.annotations.forEach(i=>{!t.listened&&ee(i.click)&&(t.listened=!0),t.moveListened||kr.forEach(s=>{ee(i[s])&&(t.listened=!0,t.moveListened=!0)})})}function C0(e,t,n){if(e.listened)switch(t.type){case"mousemove":case"mouseout":return O0(e,t,n);case"click":return T0(e,t,n)}}function O0(e,t,n){if(!e.moveListened)return;let i;t.type==="mousemove"?i=ba(e.visibleElements,t,n.interaction):i=[];const s=e.hovered;e.hovered=i;const o={state:e,event:t};let r=zc(o,"leave",s,i);return zc(o,"enter",i,s)||r}function zc({state:e,event:t},n,i,s){let o;for(const r of i)s.indexOf(r)<0&&(o=Ah(r.options[n]||e.listeners[n],r,t)||o);return o}function T0(e,t,n){const i=e.listeners,s=ba(e.visibleElements,t,n.interaction);let o;for(const r of s)o=Ah(r.options.click||i.click,r,t)||o;return o}function Ah(e,t,n){return mt(e,[t.$context,n])===!0}const Zs=["afterDraw","beforeDraw"];function A0(e,t,n){const i=t.visibleElements;t.hooked=xh(n,Zs,t.hooks),t.hooked||i.forEach(s=>{t.hooked||Zs.forEach(o=>{ee(s.options[o])&&(t.hooked=!0)})})}function Bc(e,t,n){if(e.hooked){const i=t.options[n]||e.hooks[n];return mt(i,[t.$context])}}function D0(e,t,n){const i=F0(e.scales,t,n);let s=Wc(t,i,"min","suggestedMin");s=Wc(t,i,"max","suggestedMax")||s,s&&ee(t.handleTickRangeOptions)&&t.handleTickRangeOptions()}function E0(e,t){for(const n of e)I0(n,t)}function Wc(e,t,n,i){if(Rt(t[n])&&!R0(e.options,n,i)){const s=e[n]!==t[n];return e[n]=t[n],s}}function R0(e,t,n){return re(e[t])||re(e[n])}function I0(e,t){for(const n of["scaleID","xScaleID","yScaleID"]){const i=Sn(t,e,n);i&&!t[i]&&L0(e,n)&&console.warn(`No scale found with id '${i}' for annotation '${e.id}'`)}}function L0(e,t){if(t==="scaleID")return!0;const n=t.charAt(0);for(const i of["Min","Max","Value"])if(re(e[n+i]))return!0;return!1}function F0(e,t,n){const i=t.axis,s=t.id,o=i+"ScaleID",r={min:it(t.min,Number.NEGATIVE_INFINITY),max:it(t.max,Number.POSITIVE_INFINITY)};for(const a of n)a.scaleID===s?jc(a,t,["value","endValue"],r):Sn(e,a,o)===s&&jc(a,t,[i+"Min",i+"Max",i+"Value"],r);return r}function jc(e,t,n,i){for(const s of n){const o=e[s];if(re(o)){const r=t.parse(o);i.min=Math.min(i.min,r),i.max=Math.max(i.max,r)}}}class Zn extends ne{inRange(t,n,i,s){const{x:o,y:r}=kn({x:t,y:n},this.getCenterPoint(s),Et(-this.options.rotation));return uh({x:o,y:r},this.getProps(["x","y","x2","y2"],s),i,this.options)}getCenterPoint(t){return Pn(this,t)}draw(t){t.save(),So(t,this.getCenterPoint(),this.options.rotation),wh(t,this,this.options),t.restore()}get label(){return this.elements&&this.elements[0]}resolveElementProperties(t,n){return Oh(t,n)}}Zn.id="boxAnnotation";Zn.defaults={adjustScaleRange:!0,backgroundShadowColor:"transparent",borderCapStyle:"butt",borderDash:[],borderDashOffset:0,borderJoinStyle:"miter",borderRadius:0,borderShadowColor:"transparent",borderWidth:1,display:!0,init:void 0,hitTolerance:0,label:{backgroundColor:"transparent",borderWidth:0,callout:{display:!1},color:"black",content:null,display:!1,drawTime:void 0,font:{family:void 0,lineHeight:void 0,size:void 0,style:void 0,weight:"bold"},height:void 0,hitTolerance:void 0,opacity:void 0,padding:6,position:"center",rotation:void 0,textAlign:"start",textStrokeColor:void 0,textStrokeWidth:0,width:void 0,xAdjust:0,yAdjust:0,z:void 0},rotation:0,shadowBlur:0,shadowOffsetX:0,shadowOffsetY:0,xMax:void 0,xMin:void 0,xScaleID:void 0,yMax:void 0,yMin:void 0,yScaleID:void 0,z:0};Zn.defaultRoutes={borderColor:"color",backgroundColor:"color"};Zn.descriptors={label:{_fallback:!0}};class ko extends ne{inRange(t,n,i,s){return hh({x:t,y:n},{rect:this.getProps(["x","y","x2","y2"],s),center:this.getCenterPoint(s)},i,{rotation:this.rotation,borderWidth:0,hitTolerance:this.options.hitTolerance})}getCenterPoint(t){return Pn(this,t)}draw(t){const n=this.options;!n.display||!n.content||(N0(t,this),t.save(),So(t,this.getCenterPoint(),this.rotation),Sh(t,this,n,this._fitRatio),t.restore())}resolveElementProperties(t,n){const i=H0(t,n);if(!i)return{};const{controllerMeta:s,point:o,radius:r}=B0(t,n,i);let a=Mo(t.ctx,n);const l=W0(a,r);bh(n,l)&&(a={width:a.width*l,height:a.height*l});const{position:c,xAdjust:f,yAdjust:u}=n,h=mh(o,a,{borderWidth:0,position:c,xAdjust:f,yAdjust:u});return{initProperties:Jn(t,h,n),...h,...s,rotation:n.rotation,_fitRatio:l}}}ko.id="doughnutLabelAnnotation";ko.defaults={autoFit:!0,autoHide:!0,backgroundColor:"transparent",backgroundShadowColor:"transparent",borderColor:"transparent",borderDash:[],borderDashOffset:0,borderJoinStyle:"miter",borderShadowColor:"transparent",borderWidth:0,color:"black",content:null,display:!0,font:{family:void 0,lineHeight:void 0,size:void 0,style:void 0,weight:void 0},height:void 0,hitTolerance:0,init:void 0,opacity:void 0,position:"center",rotation:0,shadowBlur:0,shadowOffsetX:0,shadowOffsetY:0,spacing:1,textAlign:"center",textStrokeColor:void 0,textStrokeWidth:0,width:void 0,xAdjust:0,yAdjust:0};ko.defaultRoutes={};function H0(e,t){return e.getSortedVisibleDatasetMetas().reduce(function(n,i){const s=i.controller;return s instanceof gi&&z0(e,t,i.data)&&(!n||s.innerRadius<n.controller.innerRadius)&&s.options.circumference>=90?i:n},void 0)}function z0(e,t,n){if(!t.autoHide)return!0;for(let i=0;i<n.length;i++)if(!n[i].hidden&&e.getDataVisibility(i))return!0}function B0({chartArea:e},t,n){const{left:i,top:s,right:o,bottom:r}=e,{innerRadius:a,offsetX:l,offsetY:c}=n.controller,f=(i+o)/2+l,u=(s+r)/2+c,h={left:Math.max(f-a,i),right:Math.min(f+a,o),top:Math.max(u-a,s),bottom:Math.min(u+a,r)},d={x:(h.left+h.right)/2,y:(h.top+h.bottom)/2},g=t.spacing+t.borderWidth/2,p=a-g,b=d.y>u,_=b?s+g:r-g,v=j0(_,f,u,p);return{controllerMeta:{_centerX:f,_centerY:u,_radius:p,_counterclockwise:b,...v},point:d,radius:Math.min(a,Math.min(h.right-h.left,h.bottom-h.top)/2)}}function W0({width:e,height:t},n){const i=Math.sqrt(Math.pow(e,2)+Math.pow(t,2));return n*2/i}function j0(e,t,n,i){const s=Math.pow(n-e,2),o=Math.pow(i,2),r=t*-2,a=Math.pow(t,2)+s-o,l=Math.pow(r,2)-4*a;if(l<=0)return{_startAngle:0,_endAngle:Dt};const c=(-r-Math.sqrt(l))/2,f=(-r+Math.sqrt(l))/2;return{_startAngle:pr({x:t,y:n},{x:c,y:e}).angle,_endAngle:pr({x:t,y:n},{x:f,y:e}).angle}}function N0(e,t){const{_centerX:n,_centerY:i,_radius:s,_startAngle:o,_endAngle:r,_counterclockwise:a,options:l}=t;e.save();const c=Ve(e,l);e.fillStyle=l.backgroundColor,e.beginPath(),e.arc(n,i,s,o,r,a),e.closePath(),e.fill(),c&&e.stroke(),e.restore()}class ts extends ne{inRange(t,n,i,s){return hh({x:t,y:n},{rect:this.getProps(["x","y","x2","y2"],s),center:this.getCenterPoint(s)},i,{rotation:this.rotation,borderWidth:this.options.borderWidth,hitTolerance:this.options.hitTolerance})}getCenterPoint(t){return Pn(this,t)}draw(t){const n=this.options,i=!re(this._visible)||this._visible;!n.display||!n.content||!i||(t.save(),So(t,this.getCenterPoint(),this.rotation),u0(t,this),wh(t,this,n),Sh(t,V0(this),n),t.restore())}resolveElementProperties(t,n){let i;if(_h(n))i=Ph(t,n);else{const{centerX:a,centerY:l}=xa(t,n);i={x:a,y:l}}const s=Nt(n.padding),o=Mo(t.ctx,n),r=mh(i,o,n,s);return{initProperties:Jn(t,r,n),pointX:i.x,pointY:i.y,...r,rotation:n.rotation}}}ts.id="labelAnnotation";ts.defaults={adjustScaleRange:!0,backgroundColor:"transparent",backgroundShadowColor:"transparent",borderCapStyle:"butt",borderDash:[],borderDashOffset:0,borderJoinStyle:"miter",borderRadius:0,borderShadowColor:"transparent",borderWidth:0,callout:{borderCapStyle:"butt",borderColor:void 0,borderDash:[],borderDashOffset:0,borderJoinStyle:"miter",borderWidth:1,display:!1,margin:5,position:"auto",side:5,start:"50%"},color:"black",content:null,display:!0,font:{family:void 0,lineHeight:void 0,size:void 0,style:void 0,weight:void 0},height:void 0,hitTolerance:0,init:void 0,opacity:void 0,padding:6,position:"center",rotation:0,shadowBlur:0,shadowOffsetX:0,shadowOffsetY:0,textAlign:"center",textStrokeColor:void 0,textStrokeWidth:0,width:void 0,xAdjust:0,xMax:void 0,xMin:void 0,xScaleID:void 0,xValue:void 0,yAdjust:0,yMax:void 0,yMin:void 0,yScaleID:void 0,yValue:void 0,z:0};ts.defaultRoutes={borderColor:"color"};function V0({x:e,y:t,width:n,height:i,options:s}){const o=s.borderWidth/2,r=Nt(s.padding);return{x:e+r.left+o,y:t+r.top+o,width:n-r.left-r.right-s.borderWidth,height:i-r.top-r.bottom-s.borderWidth}}const wa=(e,t,n)=>({x:e.x+n*(t.x-e.x),y:e.y+n*(t.y-e.y)}),Pr=(e,t,n)=>wa(t,n,Math.abs((e-t.y)/(n.y-t.y))).x,Nc=(e,t,n)=>wa(t,n,Math.abs((e-t.x)/(n.x-t.x))).y,bi=e=>e*e,$0=(e,t,{x:n,y:i,x2:s,y2:o},r)=>r==="y"?{start:Math.min(i,o),end:Math.max(i,o),value:t}:{start:Math.min(n,s),end:Math.max(n,s),value:e},Vc=(e,t,n,i)=>(1-i)*(1-i)*e+2*(1-i)*i*t+i*i*n,Cr=(e,t,n,i)=>({x:Vc(e.x,t.x,n.x,i),y:Vc(e.y,t.y,n.y,i)}),$c=(e,t,n,i)=>2*(1-i)*(t-e)+2*i*(n-t),Yc=(e,t,n,i)=>-Math.atan2($c(e.x,t.x,n.x,i),$c(e.y,t.y,n.y,i))+.5*ft;class es extends ne{inRange(t,n,i,s){const o=(this.options.borderWidth+this.options.hitTolerance)/2;if(i!=="x"&&i!=="y"){const r={mouseX:t,mouseY:n},{path:a,ctx:l}=this;if(a){Ve(l,this.options),l.lineWidth+=this.options.hitTolerance;const{chart:f}=this.$context,u=t*f.currentDevicePixelRatio,h=n*f.currentDevicePixelRatio,d=l.isPointInStroke(a,u,h)||Or(this,r,s);return l.restore(),d}const c=bi(o);return K0(this,r,c,s)||Or(this,r,s)}return Y0(this,{mouseX:t,mouseY:n},i,{hitSize:o,useFinalPosition:s})}getCenterPoint(t){return Pn(this,t)}draw(t){const{x:n,y:i,x2:s,y2:o,cp:r,options:a}=this;if(t.save(),!Ve(t,a))return t.restore();Qn(t,a);const l=Math.sqrt(Math.pow(s-n,2)+Math.pow(o-i,2));if(a.curve&&r)return nv(t,this,r,l),t.restore();const{startOpts:c,endOpts:f,startAdjust:u,endAdjust:h}=Dh(this),d=Math.atan2(o-i,s-n);t.translate(n,i),t.rotate(d),t.beginPath(),t.moveTo(0+u,0),t.lineTo(l-h,0),t.shadowColor=a.borderShadowColor,t.stroke(),Tr(t,0,u,c),Tr(t,l,-h,f),t.restore()}get label(){return this.elements&&this.elements[0]}resolveElementProperties(t,n){const i=_0(t,n),{x:s,y:o,x2:r,y2:a}=i,l=U0(i,t.chartArea),c=l?X0({x:s,y:o},{x:r,y:a},t.chartArea):{x:s,y:o,x2:r,y2:a,width:Math.abs(r-s),height:Math.abs(a-o)};if(c.centerX=(r+s)/2,c.centerY=(a+o)/2,c.initProperties=Jn(t,c,n),n.curve){const u={x:c.x,y:c.y},h={x:c.x2,y:c.y2};c.cp=ev(c,n,Un(u,h))}const f=q0(t,c,n.label);return f._visible=l,c.elements=[{type:"label",optionScope:"label",properties:f,initProperties:c.initProperties}],c}}es.id="lineAnnotation";const Uc={backgroundColor:void 0,backgroundShadowColor:void 0,borderColor:void 0,borderDash:void 0,borderDashOffset:void 0,borderShadowColor:void 0,borderWidth:void 0,display:void 0,fill:void 0,length:void 0,shadowBlur:void 0,shadowOffsetX:void 0,shadowOffsetY:void 0,width:void 0};es.defaults={adjustScaleRange:!0,arrowHeads:{display:!1,end:Object.assign({},Uc),fill:!1,length:12,start:Object.assign({},Uc),width:6},borderDash:[],borderDashOffset:0,borderShadowColor:"transparent",borderWidth:2,curve:!1,controlPoint:{y:"-50%"},display:!0,endValue:void 0,init:void 0,hitTolerance:0,label:{backgroundColor:"rgba(0,0,0,0.8)",backgroundShadowColor:"transparent",borderCapStyle:"butt",borderColor:"black",borderDash:[],borderDashOffset:0,borderJoinStyle:"miter",borderRadius:6,borderShadowColor:"transparent",borderWidth:0,callout:Object.assign({},ts.defaults.callout),color:"#fff",content:null,display:!1,drawTime:void 0,font:{family:void 0,lineHeight:void 0,size:void 0,style:void 0,weight:"bold"},height:void 0,hitTolerance:void 0,opacity:void 0,padding:6,position:"center",rotation:0,shadowBlur:0,shadowOffsetX:0,shadowOffsetY:0,textAlign:"center",textStrokeColor:void 0,textStrokeWidth:0,width:void 0,xAdjust:0,yAdjust:0,z:void 0},scaleID:void 0,shadowBlur:0,shadowOffsetX:0,shadowOffsetY:0,value:void 0,xMax:void 0,xMin:void 0,xScaleID:void 0,yMax:void 0,yMin:void 0,yScaleID:void 0,z:0};es.descriptors={arrowHeads:{start:{_fallback:!0},end:{_fallback:!0},_fallback:!0}};es.defaultRoutes={borderColor:"color"};function Y0(e,{mouseX:t,mouseY:n},i,{hitSize:s,useFinalPosition:o}){const r=$0(t,n,e.getProps(["x","y","x2","y2"],o),i);return fh(r,s)||Or(e,{mouseX:t,mouseY:n},o,i)}function U0({x:e,y:t,x2:n,y2:i},{top:s,right:o,bottom:r,left:a}){return!(e<a&&n<a||e>o&&n>o||t<s&&i<s||t>r&&i>r)}function Xc({x:e,y:t},n,{top:i,right:s,bottom:o,left:r}){return e<r&&(t=Nc(r,{x:e,y:t},n),e=r),e>s&&(t=Nc(s,{x:e,y:t},n),e=s),t<i&&(e=Pr(i,{x:e,y:t},n),t=i),t>o&&(e=Pr(o,{x:e,y:t},n),t=o),{x:e,y:t}}function X0(e,t,n){const{x:i,y:s}=Xc(e,t,n),{x:o,y:r}=Xc(t,e,n);return{x:i,y:s,x2:o,y2:r,width:Math.abs(o-i),height:Math.abs(r-s)}}function K0(e,{mouseX:t,mouseY:n},i=yn,s){const{x:o,y:r,x2:a,y2:l}=e.getProps(["x","y","x2","y2"],s),c=a-o,f=l-r,u=bi(c)+bi(f),h=u===0?-1:((t-o)*c+(n-r)*f)/u;let d,g;return h<0?(d=o,g=r):h>1?(d=a,g=l):(d=o+h*c,g=r+h*f),bi(t-d)+bi(n-g)<=i}function Or(e,{mouseX:t,mouseY:n},i,s){const o=e.label;return o.options.display&&o.inRange(t,n,s,i)}function q0(e,t,n){const i=n.borderWidth,s=Nt(n.padding),o=Mo(e.ctx,n),r=o.width+s.width+i,a=o.height+s.height+i;return J0(t,n,{width:r,height:a,padding:s},e.chartArea)}function G0(e){const{x:t,y:n,x2:i,y2:s}=e,o=Math.atan2(s-n,i-t);return o>ft/2?o-ft:o<ft/-2?o+ft:o}function J0(e,t,n,i){const{width:s,height:o,padding:r}=n,{xAdjust:a,yAdjust:l}=t,c={x:e.x,y:e.y},f={x:e.x2,y:e.y2},u=t.rotation==="auto"?G0(e):Et(t.rotation),h=Q0(s,o,u),d=Z0(e,t,{labelSize:h,padding:r},i),g=e.cp?Cr(c,e.cp,f,d):wa(c,f,d),p={size:h.w,min:i.left,max:i.right,padding:r.left},b={size:h.h,min:i.top,max:i.bottom,padding:r.top},_=qc(g.x,p)+a,v=qc(g.y,b)+l;return{x:_-s/2,y:v-o/2,x2:_+s/2,y2:v+o/2,centerX:_,centerY:v,pointX:g.x,pointY:g.y,width:s,height:o,rotation:Pu(u)}}function Q0(e,t,n){const i=Math.cos(n),s=Math.sin(n);return{w:Math.abs(e*i)+Math.abs(t*s),h:Math.abs(e*s)+Math.abs(t*i)}}function Z0(e,t,n,i){let s;const o=tv(e,i);return t.position==="start"?s=Kc({w:e.x2-e.x,h:e.y2-e.y},n,t,o):t.position==="end"?s=1-Kc({w:e.x-e.x2,h:e.y-e.y2},n,t,o):s=ya(1,t.position),s}function Kc(e,t,n,i){const{labelSize:s,padding:o}=t,r=e.w*i.dx,a=e.h*i.dy,l=r>0&&(s.w/2+o.left-i.x)/r,c=a>0&&(s.h/2+o.top-i.y)/a;return vo(Math.max(l,c),0,.25)}function tv(e,t){const{x:n,x2:i,y:s,y2:o}=e,r=Math.min(s,o)-t.top,a=Math.min(n,i)-t.left,l=t.bottom-Math.max(s,o),c=t.right-Math.max(n,i);return{x:Math.min(a,c),y:Math.min(r,l),dx:a<=c?1:-1,dy:r<=l?1:-1}}function qc(e,t){const{size:n,min:i,max:s,padding:o}=t,r=n/2;return n>s-i?(s+i)/2:(i>=e-o-r&&(e=i+o+r),s<=e+o+r&&(e=s-o-r),e)}function Dh(e){const t=e.options,n=t.arrowHeads&&t.arrowHeads.start,i=t.arrowHeads&&t.arrowHeads.end;return{startOpts:n,endOpts:i,startAdjust:Gc(e,n),endAdjust:Gc(e,i)}}function Gc(e,t){if(!t||!t.display)return 0;const{length:n,width:i}=t,s=e.options.borderWidth/2,o={x:n,y:i+s};return Math.abs(Pr(0,o,{x:0,y:s}))}function Tr(e,t,n,i){if(!i||!i.display)return;const{length:s,width:o,fill:r,backgroundColor:a,borderColor:l}=i,c=Math.abs(t-s)+n;e.beginPath(),Qn(e,i),Ve(e,i),e.moveTo(c,-o),e.lineTo(t+n,0),e.lineTo(c,o),r===!0?(e.fillStyle=a||l,e.closePath(),e.fill(),e.shadowColor="transparent"):e.shadowColor=i.borderShadowColor,e.stroke()}function ev(e,t,n){const{x:i,y:s,x2:o,y2:r,centerX:a,centerY:l}=e,c=Math.atan2(r-s,o-i),f=_a(t.controlPoint,0),u={x:a+rn(n,f.x,!1),y:l+rn(n,f.y,!1)};return kn(u,{x:a,y:l},c)}function Jc(e,{x:t,y:n},{angle:i,adjust:s},o){!o||!o.display||(e.save(),e.translate(t,n),e.rotate(i),Tr(e,0,-s,o),e.restore())}function nv(e,t,n,i){const{x:s,y:o,x2:r,y2:a,options:l}=t,{startOpts:c,endOpts:f,startAdjust:u,endAdjust:h}=Dh(t),d={x:s,y:o},g={x:r,y:a},p=Yc(d,n,g,0),b=Yc(d,n,g,1)-ft,_=Cr(d,n,g,u/i),v=Cr(d,n,g,1-h/i),w=new Path2D;e.beginPath(),w.moveTo(_.x,_.y),w.quadraticCurveTo(n.x,n.y,v.x,v.y),e.shadowColor=l.borderShadowColor,e.stroke(w),t.path=w,t.ctx=e,Jc(e,_,{angle:p,adjust:u},c),Jc(e,v,{angle:b,adjust:h},f)}class ns extends ne{inRange(t,n,i,s){const o=this.options.rotation,r=(this.options.borderWidth+this.options.hitTolerance)/2;if(i!=="x"&&i!=="y")return iv({x:t,y:n},this.getProps(["width","height","centerX","centerY"],s),o,r);const{x:a,y:l,x2:c,y2:f}=this.getProps(["x","y","x2","y2"],s),u=i==="y"?{start:l,end:f}:{start:a,end:c},h=kn({x:t,y:n},this.getCenterPoint(s),Et(-o));return h[i]>=u.start-r-yn&&h[i]<=u.end+r+yn}getCenterPoint(t){return Pn(this,t)}draw(t){const{width:n,height:i,centerX:s,centerY:o,options:r}=this;t.save(),So(t,this.getCenterPoint(),r.rotation),Qn(t,this.options),t.beginPath(),t.fillStyle=r.backgroundColor;const a=Ve(t,r);t.ellipse(s,o,i/2,n/2,ft/2,0,2*ft),t.fill(),a&&(t.shadowColor=r.borderShadowColor,t.stroke()),t.restore()}get label(){return this.elements&&this.elements[0]}resolveElementProperties(t,n){return Oh(t,n)}}ns.id="ellipseAnnotation";ns.defaults={adjustScaleRange:!0,backgroundShadowColor:"transparent",borderDash:[],borderDashOffset:0,borderShadowColor:"transparent",borderWidth:1,display:!0,hitTolerance:0,init:void 0,label:Object.assign({},Zn.defaults.label),rotation:0,shadowBlur:0,shadowOffsetX:0,shadowOffsetY:0,xMax:void 0,xMin:void 0,xScaleID:void 0,yMax:void 0,yMin:void 0,yScaleID:void 0,z:0};ns.defaultRoutes={borderColor:"color",backgroundColor:"color"};ns.descriptors={label:{_fallback:!0}};function iv(e,t,n,i){const{width:s,height:o,centerX:r,centerY:a}=t,l=s/2,c=o/2;if(l<=0||c<=0)return!1;const f=Et(n||0),u=Math.cos(f),h=Math.sin(f),d=Math.pow(u*(e.x-r)+h*(e.y-a),2),g=Math.pow(h*(e.x-r)-u*(e.y-a),2);return d/Math.pow(l+i,2)+g/Math.pow(c+i,2)<=1.0001}class Po extends ne{inRange(t,n,i,s){const{x:o,y:r,x2:a,y2:l,width:c}=this.getProps(["x","y","x2","y2","width"],s),f=(this.options.borderWidth+this.options.hitTolerance)/2;return i!=="x"&&i!=="y"?Jx({x:t,y:n},this.getCenterPoint(s),c/2,f):fh(i==="y"?{start:r,end:l,value:n}:{start:o,end:a,value:t},f)}getCenterPoint(t){return Pn(this,t)}draw(t){const n=this.options,i=n.borderWidth;if(n.radius<.1)return;t.save(),t.fillStyle=n.backgroundColor,Qn(t,n);const s=Ve(t,n);o0(t,this,this.centerX,this.centerY),s&&!wo(n.pointStyle)&&(t.shadowColor=n.borderShadowColor,t.stroke()),t.restore(),n.borderWidth=i}resolveElementProperties(t,n){const i=Ch(t,n);return i.initProperties=Jn(t,i,n),i}}Po.id="pointAnnotation";Po.defaults={adjustScaleRange:!0,backgroundShadowColor:"transparent",borderDash:[],borderDashOffset:0,borderShadowColor:"transparent",borderWidth:1,display:!0,hitTolerance:0,init:void 0,pointStyle:"circle",radius:10,rotation:0,shadowBlur:0,shadowOffsetX:0,shadowOffsetY:0,xAdjust:0,xMax:void 0,xMin:void 0,xScaleID:void 0,xValue:void 0,yAdjust:0,yMax:void 0,yMin:void 0,yScaleID:void 0,yValue:void 0,z:0};Po.defaultRoutes={borderColor:"color",backgroundColor:"color"};class Co extends ne{inRange(t,n,i,s){if(i!=="x"&&i!=="y")return this.options.radius>=.1&&this.elements.length>1&&ov(this.elements,t,n,s);const o=kn({x:t,y:n},this.getCenterPoint(s),Et(-this.options.rotation)),r=this.elements.map(c=>i==="y"?c.bY:c.bX),a=Math.min(...r),l=Math.max(...r);return o[i]>=a&&o[i]<=l}getCenterPoint(t){return Pn(this,t)}draw(t){const{elements:n,options:i}=this;t.save(),t.beginPath(),t.fillStyle=i.backgroundColor,Qn(t,i);const s=Ve(t,i);let o=!0;for(const r of n)o?(t.moveTo(r.x,r.y),o=!1):t.lineTo(r.x,r.y);t.closePath(),t.fill(),s&&(t.shadowColor=i.borderShadowColor,t.stroke()),t.restore()}resolveElementProperties(t,n){const i=Ch(t,n),{sides:s,rotation:o}=n,r=[],a=2*ft/s;let l=o*oa;for(let c=0;c<s;c++,l+=a){const f=sv(i,n,l);f.initProperties=Jn(t,i,n),r.push(f)}return i.elements=r,i}}Co.id="polygonAnnotation";Co.defaults={adjustScaleRange:!0,backgroundShadowColor:"transparent",borderCapStyle:"butt",borderDash:[],borderDashOffset:0,borderJoinStyle:"miter",borderShadowColor:"transparent",borderWidth:1,display:!0,hitTolerance:0,init:void 0,point:{radius:0},radius:10,rotation:0,shadowBlur:0,shadowOffsetX:0,shadowOffsetY:0,sides:3,xAdjust:0,xMax:void 0,xMin:void 0,xScaleID:void 0,xValue:void 0,yAdjust:0,yMax:void 0,yMin:void 0,yScaleID:void 0,yValue:void 0,z:0};Co.defaultRoutes={borderColor:"color",backgroundColor:"color"};function sv({centerX:e,centerY:t},{radius:n,borderWidth:i,hitTolerance:s},o){const r=(i+s)/2,a=Math.sin(o),l=Math.cos(o),c={x:e+a*n,y:t-l*n};return{type:"point",optionScope:"point",properties:{x:c.x,y:c.y,centerX:c.x,centerY:c.y,bX:e+a*(n+r),bY:t-l*(n+r)}}}function ov(e,t,n,i){let s=!1,o=e[e.length-1].getProps(["bX","bY"],i);for(const r of e){const a=r.getProps(["bX","bY"],i);a.bY>n!=o.bY>n&&t<(o.bX-a.bX)*(n-a.bY)/(o.bY-a.bY)+a.bX&&(s=!s),o=a}return s}const en={box:Zn,doughnutLabel:ko,ellipse:ns,label:ts,line:es,point:Po,polygon:Co};Object.keys(en).forEach(e=>{Ct.describe(`elements.${en[e].id}`,{_fallback:"plugins.annotation.common"})});const rv={update:Object.assign},av=va.concat(Zs),Qc=(e,t)=>st(t)?Dr(e,t):e,Ar=e=>e==="color"||e==="font";function Sa(e="line"){return en[e]?e:(console.warn(`Unknown annotation type: '${e}', defaulting to 'line'`),"line")}function lv(e,t,n,i){const s=fv(e,n.animations,i),o=t.annotations,r=dv(t.elements,o);for(let a=0;a<o.length;a++){const l=o[a],c=Eh(r,a,l.type),f=l.setContext(hv(e,c,r,l)),u=c.resolveElementProperties(e,f);u.skip=cv(u),"elements"in u&&(uv(c,u.elements,f,s),delete u.elements),re(c.x)||Object.assign(c,u),Object.assign(c,u.initProperties),u.options=Rh(f),s.update(c,u)}}function cv(e){return isNaN(e.x)||isNaN(e.y)}function fv(e,t,n){return n==="reset"||n==="none"||n==="resize"?rv:new pa(e,t)}function uv(e,t,n,i){const s=e.elements||(e.elements=[]);s.length=t.length;for(let o=0;o<t.length;o++){const r=t[o],a=r.properties,l=Eh(s,o,r.type,r.initProperties),c=n[r.optionScope].override(r);a.options=Rh(c),i.update(l,a)}}function Eh(e,t,n,i){const s=en[Sa(n)];let o=e[t];return(!o||!(o instanceof s))&&(o=e[t]=new s,Object.assign(o,i)),o}function Rh(e){const t=en[Sa(e.type)],n={};n.id=e.id,n.type=e.type,n.drawTime=e.drawTime,Object.assign(n,Dr(e,t.defaults),Dr(e,t.defaultRoutes));for(const i of av)n[i]=e[i];return n}function Dr(e,t){const n={};for(const i of Object.keys(t)){const s=t[i],o=e[i];Ar(i)&&kt(o)?n[i]=o.map(r=>Qc(r,s)):n[i]=Qc(o,s)}return n}function hv(e,t,n,i){return t.$context||(t.$context=Object.assign(Object.create(e.getContext()),{element:t,get elements(){return n.filter(s=>s&&s.options)},id:i.id,type:"annotation"}))}function dv(e,t){const n=t.length,i=e.length;if(i<n){const s=n-i;e.splice(i,0,...new Array(s))}else i>n&&e.splice(n,i-n);return e}var gv="3.1.0";const Xe=new Map,Zc=e=>e.type!=="doughnutLabel",pv=va.concat(Zs);var mv={id:"annotation",version:gv,beforeRegister(){Qx("chart.js","4.0",We.version)},afterRegister(){We.register(en)},afterUnregister(){We.unregister(en)},beforeInit(e){Xe.set(e,{annotations:[],elements:[],visibleElements:[],listeners:{},listened:!1,moveListened:!1,hooks:{},hooked:!1,hovered:[]})},beforeUpdate(e,t,n){const i=Xe.get(e),s=i.annotations=[];let o=n.annotations;st(o)?Object.keys(o).forEach(r=>{const a=o[r];st(a)&&(a.id=r,s.push(a))}):kt(o)&&s.push(...o),E0(s.filter(Zc),e.scales)},afterDataLimits(e,t){const n=Xe.get(e);D0(e,t.scale,n.annotations.filter(Zc).filter(i=>i.display&&i.adjustScaleRange))},afterUpdate(e,t,n){const i=Xe.get(e);P0(e,i,n),lv(e,i,n,t.mode),i.visibleElements=i.elements.filter(s=>!s.skip&&s.options.display),A0(e,i,n)},beforeDatasetsDraw(e,t,n){fi(e,"beforeDatasetsDraw",n.clip)},afterDatasetsDraw(e,t,n){fi(e,"afterDatasetsDraw",n.clip)},beforeDatasetDraw(e,t,n){fi(e,t.index,n.clip)},beforeDraw(e,t,n){fi(e,"beforeDraw",n.clip)},afterDraw(e,t,n){fi(e,"afterDraw",n.clip)},beforeEvent(e,t,n){const i=Xe.get(e);C0(i,t.event,n)&&(t.changed=!0)},afterDestroy(e){Xe.delete(e)},getAnnotations(e){const t=Xe.get(e);return t?t.elements:[]},_getAnnotationElementsAtEventForMode(e,t,n){return ba(e,t,n)},defaults:{animations:{numbers:{properties:["x","y","x2","y2","width","height","centerX","centerY","pointX","pointY","radius"],type:"number"},colors:{properties:["backgroundColor","borderColor"],type:"color"}},clip:!0,interaction:{mode:void 0,axis:void 0,intersect:void 0},common:{drawTime:"afterDatasetsDraw",init:!1,label:{}}},descriptors:{_indexable:!1,_scriptable:e=>!pv.includes(e)&&e!=="init",annotations:{_allKeys:!1,_fallback:(e,t)=>`elements.${en[Sa(t.type)].id}`},interaction:{_fallback:!0},common:{label:{_indexable:Ar,_fallback:!0},_indexable:Ar}},additionalOptionScopes:[""]};function fi(e,t,n){const{ctx:i,chartArea:s}=e,o=Xe.get(e);n&&Qi(i,s);const r=bv(o.visibleElements,t).sort((a,l)=>a.element.options.z-l.element.options.z);for(const a of r)yv(i,s,o,a);n&&Zi(i)}function bv(e,t){const n=[];for(const i of e)if(i.options.drawTime===t&&n.push({element:i,main:!0}),i.elements&&i.elements.length)for(const s of i.elements)s.options.display&&s.options.drawTime===t&&n.push({element:s});return n}function yv(e,t,n,i){const s=i.element;i.main?(Bc(n,s,"beforeDraw"),s.draw(e,t),Bc(n,s,"afterDraw")):s.draw(e,t)}const _v={class:"game-wrapper"},xv={key:0,class:"loading-overlay"},vv={key:1},wv={key:0,class:"countdown-overlay"},Sv={class:"info-bar"},Mv={class:"chart-container"},kv=60,vs=10,ws=3,Pv={__name:"GameView",setup(e){We.register(Qe,Ds,Mr,xx,Sr,hx,Ox,yx,mv);const t=Yx,n=bu(),i=Zr(),s=pt(n.query.name||"Player"),o=pt(n.query.difficulty||"Medium"),r=pt([]),a=pt(0),l=pt(10),c=pt(0),f=pt([]),u=pt("loading"),h=pt(3),d=pt(30),g=pt(null);let p=null,b=null;const _=pt(0),v=pt(!1),w=Ft(()=>{const $=d.value,V=Math.max(0,$-vs),j=_.value-ws;return Math.max(0,Math.min(j,V))}),S=Ft(()=>{const $=w.value+vs,V=d.value;return Math.min($,V)}),M=Ft(()=>{const V=d.value-vs+ws;let j;return _.value<ws?j=_.value:_.value<V?j=w.value+ws:j=_.value,j}),F=Ft(()=>{const $=d.value,V=_.value;if(console.log(`[TIMER_DEBUG] Calculating remaining time: total=${$}, current=${V}`),typeof $!="number"||isNaN($))return console.error("[TIMER_DEBUG] gameTotalTicks.value is invalid:",$),NaN;if(typeof V!="number"||isNaN(V))return console.error("[TIMER_DEBUG] visualCurrentTick.value is invalid:",V),NaN;const j=$-V;return Math.max(0,Math.ceil(j))});function D($,V,j){const E=[],N=V*j;for(let tt=0;tt<N;tt++){const nt=Math.min(Math.floor(tt/j),$.length-1),Pt=$[nt],Ot=tt/j;typeof Pt=="number"&&!isNaN(Pt)&&E.push({x:parseFloat(Ot.toFixed(2)),y:parseFloat(Pt.toFixed(2))})}const ct=parseFloat(V.toFixed(2)),_t=$[$.length-1];return typeof _t=="number"&&!isNaN(_t)&&(E.length===0||E[E.length-1].x!==ct?E.push({x:ct,y:parseFloat(_t.toFixed(2))}):E[E.length-1].y=parseFloat(_t.toFixed(2))),E}const L=pt([]),X={id:"toleranceFill",beforeDatasetsDraw($,V,j){const{ctx:E,chartArea:{left:N,right:ct,top:_t,bottom:tt},scales:{x:nt,y:Pt}}=$,Ot=$.data.datasets.find(T=>T.id==="targetLineId");if(!Ot||!Ot.data||Ot.data.length<1)return;E.save(),E.fillStyle=j.backgroundColor||"rgba(255, 200, 0, 0.2)";const Vt=j.toleranceValue,xt=Ot.data,k=[];xt.forEach((T,H)=>{const at=H>0?xt[H-1].y:T.y;k.push({x:T.x,y:Math.min(at+Vt,Pt.max)}),at!==T.y&&k.push({x:T.x,y:Math.min(T.y+Vt,Pt.max)})}),k.sort((T,H)=>T.x-H.x);const B=[];for(let T=xt.length-1;T>=0;T--){const H=xt[T],at=T>0?xt[T-1].y:H.y;at!==H.y&&B.push({x:H.x,y:Math.max(H.y-Vt,Pt.min)}),B.push({x:H.x,y:Math.max(at-Vt,Pt.min)})}B.sort((T,H)=>T.x-H.x),E.beginPath(),k.length>0&&E.moveTo(nt.getPixelForValue(k[0].x),Pt.getPixelForValue(k[0].y)),k.forEach(T=>{E.lineTo(nt.getPixelForValue(T.x),Pt.getPixelForValue(T.y))});for(let T=B.length-1;T>=0;T--){const H=B[T];E.lineTo(nt.getPixelForValue(H.x),Pt.getPixelForValue(H.y))}E.closePath(),E.fill(),E.restore()}};We.register(X);const Z=Ft(()=>{let $=[];const V=w.value,j=S.value,E=L.value.filter(tt=>tt.x>=V&&tt.x<=j);if(E.length>0&&E[0].x>V){const tt=L.value.slice().reverse().find(nt=>nt.x<V);tt?$.push({x:V,y:tt.y}):$.push({x:V,y:E[0].y})}if($.push(...E),$.length>0&&$[$.length-1].x<j){const tt=L.value.find(nt=>nt.x>j);tt?$.push({x:j,y:tt.y}):$.push({x:j,y:$[$.length-1].y})}const N=new Set;$=$.filter(tt=>{const nt=tt.x.toFixed(5);return N.has(nt)?!1:(N.add(nt),!0)}).sort((tt,nt)=>tt.x-nt.x);let ct=f.value.filter(tt=>tt.x>=w.value&&tt.x<=_.value);if(_.value>=0&&(ct.length===0||ct[ct.length-1].x<_.value)){const tt=d.value;_.value<=tt+.1&&ct.push({x:parseFloat(_.value.toFixed(2)),y:parseFloat(a.value.toFixed(2))})}const _t=new Set;return ct=ct.filter(tt=>{const nt=tt.x.toFixed(5);return _t.has(nt)?!1:(_t.add(nt),!0)}).sort((tt,nt)=>tt.x-nt.x),{labels:[],datasets:[{id:"targetLineId",label:"Target",data:$,borderColor:"orange",borderDash:[4,4],borderWidth:4,pointRadius:0,fill:!1,stepped:"before",tension:0,order:1},{label:"Input",data:ct,borderColor:"limegreen",borderWidth:4,pointRadius:0,fill:!1,tension:.2,stepped:!1,order:0}]}}),G=Ft(()=>({responsive:!0,maintainAspectRatio:!1,animation:{duration:0},parsing:!1,scales:{y:{min:0,max:60,ticks:{color:"black"},grid:{color:"rgba(0,0,0,0.1)"}},x:{min:w.value,max:S.value,type:"linear",ticks:{color:"black",callback:function($){return $%1===0?`${Math.floor($)}s`:null},maxTicksLimit:vs+1},grid:{color:"rgba(0,0,0,0.05)"}}},plugins:{legend:{labels:{color:"black",filter:$=>["Input","Target"].includes($.text),generateLabels:function($){const V=We.defaults.plugins.legend.labels.generateLabels($);return V.push({text:"Tolerance",fillStyle:"rgba(255, 200, 0, 0.2)",strokeStyle:"transparent",lineWidth:0,hidden:!1,datasetIndex:-1}),V}}},annotation:{annotations:{inputMarker:{type:"line",xMin:M.value,xMax:M.value+.001,borderColor:"rgb(0, 54, 69)",borderDash:[4,4],borderWidth:2,label:{display:!0,content:"You are here",color:"white",backgroundColor:"rgb(0, 54, 69)",font:{weight:"bold"},position:"start"}}}},toleranceFill:{backgroundColor:"rgba(255, 200, 0, 0.2)",toleranceValue:l.value}}}));function ot(){function $(V){var j;if(u.value!=="playing"){p&&(cancelAnimationFrame(p),p=null,console.log("[LOOP-STOP] runGameLoop: stopping animation frame."));return}if(b!==null){const E=(V-b)/1e3;_.value=Math.min(E,d.value)}if(u.value==="playing"&&typeof a.value=="number"&&_.value>=0){const E={x:_.value,y:a.value},N=f.value[f.value.length-1];if(!N||E.x>N.x){f.value.push({x:parseFloat(E.x.toFixed(3)),y:parseFloat(E.y.toFixed(2))});const ct=w.value-5;f.value=f.value.filter(_t=>_t.x>=ct)}else N&&E.x===N.x&&(N.y=parseFloat(E.y.toFixed(2)))}(j=g.value)!=null&&j.chart&&g.value.chart.update("none"),p=requestAnimationFrame($)}console.log("[LOOP-START] runGameLoop: Starting animation frame loop."),p=requestAnimationFrame($)}function bt(){const $=location.protocol==="https:"?"wss:":"ws:",V=location.host,j=new WebSocket(`${$}//${V}/ws/game/${s.value}/${o.value}`);j.onopen=()=>{console.log("WebSocket opened.")},j.onmessage=E=>{const N=JSON.parse(E.data);if(N.type==="init"){console.log("Received 'init' message:",N),r.value=N.targetCurve,d.value=N.duration,N.toleranceCurve&&N.toleranceCurve.length>0&&(l.value=N.toleranceCurve[0],console.log(`[FRONTEND] Updated dynamicTolerance to: ${l.value}`)),a.value=0,c.value=0,_.value=0,v.value=!1,L.value=D(r.value,d.value,kv),u.value="countdown";const ct=setInterval(()=>{h.value--,console.log("Countdown:",h.value),h.value<=0&&(clearInterval(ct),u.value="playing",v.value=!0,console.log("Countdown finished, gameState set to playing. Starting runGameLoop."),j.readyState===WebSocket.OPEN&&(j.send(JSON.stringify({type:"start"})),console.log("Sent start signal to backend")),b=performance.now(),_.value=0,f.value=[{x:0,y:parseFloat(a.value.toFixed(2))}],console.log(`Game started at x=0 with initial value: ${a.value}`),ot())},1e3)}else if(N.type==="tick")v.value?(typeof N.actual=="number"&&(a.value=N.actual),typeof N.totalScore=="number"&&(c.value=N.totalScore)):(typeof N.actual=="number"&&(a.value=N.actual),console.log("Ignoring tick during countdown phase"));else if(N.type==="end"){console.log("Received 'end' message from backend:",N),u.value="ended",p&&(cancelAnimationFrame(p),p=null,console.log("[LOOP-STOP] Game ended: animation frame stopped."));const ct=Math.round(N.score||c.value);i.push({path:"/end",query:{score:ct,name:s.value,difficulty:o.value}}),j.readyState===WebSocket.OPEN&&(j.close(),console.log("WebSocket closed by frontend on game end."))}else console.warn("Received unknown WebSocket message type:",N.type,N)},j.onerror=E=>{console.error("WebSocket Error:",E)},j.onclose=E=>{console.warn("WebSocket Closed:",E)}}return qi(()=>{console.log("Component mounted. Connecting WebSocket."),bt()}),($,V)=>(Lt(),Xt("div",_v,[u.value==="loading"?(Lt(),Xt("div",xv,V[0]||(V[0]=[K("h1",null,"Loading PowerMatch…",-1)]))):(Lt(),Xt("div",vv,[u.value==="countdown"?(Lt(),Xt("div",wv,[K("h1",null,"Starting in "+Yt(h.value)+"…",1)])):Ws("",!0),K("div",Sv,[K("div",null,Yt(F.value)+"s",1),V[1]||(V[1]=K("h1",null,"PowerMatch",-1)),K("div",null,Yt(Math.round(c.value)),1)]),K("div",Mv,[te(ge(t),{ref_key:"chartRef",ref:g,data:Z.value,options:G.value},null,8,["data","options"])])]))]))}},Cv=ta(Pv,[["__scopeId","data-v-d5611372"]]),Ov={class:"logo-row"},Tv=["src"],Av={class:"card"},Dv={class:"message"},Ev={class:"score"},Rv={class:"difficulty"},Iv={key:0,class:"highlight"},Lv={key:1,class:"leaderboard"},Fv={class:"rank"},Hv={class:"entry"},zv={class:"score"},Bv={class:"logo-row"},Wv=["src"],jv={__name:"EndScreen",setup(e){const t=bu(),n=Zr(),i=pt(t.query.name||"Player"),s=pt(t.query.score||0),o=pt(t.query.difficulty||"Medium"),r=pt(null),a=pt(!1),l=pt(null),c=()=>{fetch("http://192.168.1.106/api/highscore").catch(h=>console.error("failed t call highscore API",h))},f=async()=>{try{const d=await(await fetch("/api/highscores")).json();r.value=d,a.value=[...d.alltime,...d.recent].some(g=>g.name===i.value&&g.score===+s.value),a.value&&c()}catch(h){console.error("Failed to fetch highscores:",h)}},u=()=>{n.push("/")};return qi(()=>{var h;f(),(h=l.value)==null||h.focus()}),(h,d)=>(Lt(),Xt("div",{class:"wrapper",onKeydown:hi(u,["enter"]),tabindex:"0"},[K("div",Ov,[K("img",{src:ge(yu),alt:"Logo links",class:"logo"},null,8,Tv)]),K("div",Av,[d[5]||(d[5]=K("h1",null,"Game Over",-1)),K("p",Dv,[d[0]||(d[0]=mn("Well done, ")),K("strong",null,Yt(i.value),1),d[1]||(d[1]=mn("!"))]),K("p",null,[d[2]||(d[2]=mn("Your score: ")),K("span",Ev,Yt(s.value),1)]),K("p",null,[d[3]||(d[3]=mn("Difficulty: ")),K("span",Rv,Yt(o.value),1)]),a.value?(Lt(),Xt("div",Iv," New High Score! ")):Ws("",!0),K("button",{ref_key:"playButton",ref:l,onClick:u},"Play Again",512),r.value?(Lt(),Xt("div",Lv,[d[4]||(d[4]=K("h2",null,"All-Time Top 5",-1)),K("ul",null,[(Lt(!0),Xt(ce,null,sr(r.value.alltime,(g,p)=>(Lt(),Xt("li",{key:"a"+p},[K("span",Fv,"#"+Yt(p+1),1),K("span",Hv,Yt(g.name),1),K("span",zv,Yt(g.score),1)]))),128))])])):Ws("",!0)]),K("div",Bv,[K("img",{src:ge(_u),alt:"Logo rechts",class:"logo"},null,8,Wv)])],32))}},Nv=ta(jv,[["__scopeId","data-v-bc65b2a5"]]),Vv=[{path:"/",component:wm},{path:"/game",component:Cv},{path:"/end",component:Nv}],$v=im({history:Rp(),routes:Vv}),Ih=tp(om);Ih.use($v);Ih.mount("#app");
+ */const Ic={modes:{point(e,t){return Es(e,t,{intersect:!0})},nearest(e,t,n){return Kx(e,t,n)},x(e,t,n){return Es(e,t,{intersect:n.intersect,axis:"x"})},y(e,t,n){return Es(e,t,{intersect:n.intersect,axis:"y"})}}};function ba(e,t,n){return(Ic.modes[n.mode]||Ic.modes.nearest)(e,t,n)}function Ux(e,t,n){return n!=="x"&&n!=="y"?e.inRange(t.x,t.y,"x",!0)||e.inRange(t.x,t.y,"y",!0):e.inRange(t.x,t.y,n,!0)}function Xx(e,t,n){return n==="x"?{x:e.x,y:t.y}:n==="y"?{x:t.x,y:e.y}:t}function Es(e,t,n){return e.filter(i=>n.intersect?i.inRange(t.x,t.y):Ux(i,t,n.axis))}function Kx(e,t,n){let i=Number.POSITIVE_INFINITY;return Es(e,t,n).reduce((s,o)=>{const r=o.getCenterPoint(),a=Xx(t,r,n.axis),l=Un(t,a);return l<i?(s=[o],i=l):l===i&&s.push(o),s},[]).sort((s,o)=>s._index-o._index).slice(0,1)}function kn(e,t,n){const i=Math.cos(n),s=Math.sin(n),o=t.x,r=t.y;return{x:o+i*(e.x-o)-s*(e.y-r),y:r+s*(e.x-o)+i*(e.y-r)}}const qx=(e,t)=>t>e||e.length>t.length&&e.slice(0,t.length)===t,yn=.001,vo=(e,t,n)=>Math.min(n,Math.max(t,e)),fh=(e,t)=>e.value>=e.start-t&&e.value<=e.end+t;function Gx(e,t,n){for(const i of Object.keys(e))e[i]=vo(e[i],t,n);return e}function Jx(e,t,n,i){return!e||!t||n<=0?!1:Math.pow(e.x-t.x,2)+Math.pow(e.y-t.y,2)<=Math.pow(n+i,2)}function uh(e,{x:t,y:n,x2:i,y2:s},o,{borderWidth:r,hitTolerance:a}){const l=(r+a)/2,c=e.x>=t-l-yn&&e.x<=i+l+yn,f=e.y>=n-l-yn&&e.y<=s+l+yn;return o==="x"?c:(o==="y"||c)&&f}function hh(e,{rect:t,center:n},i,{rotation:s,borderWidth:o,hitTolerance:r}){const a=kn(e,n,Et(-s));return uh(a,t,i,{borderWidth:o,hitTolerance:r})}function Pn(e,t){const{centerX:n,centerY:i}=e.getProps(["centerX","centerY"],t);return{x:n,y:i}}function Qx(e,t,n,i=!0){const s=n.split(".");let o=0;for(const r of t.split(".")){const a=s[o++];if(parseInt(r,10)<parseInt(a,10))break;if(qx(a,r)){if(i)throw new Error(`${e} v${n} is not supported. v${t} or newer is required.`);return!1}}return!0}const dh=e=>typeof e=="string"&&e.endsWith("%"),gh=e=>parseFloat(e)/100,ph=e=>vo(gh(e),0,1),ci=(e,t)=>({x:e,y:t,x2:e,y2:t,width:0,height:0}),Zx={box:e=>ci(e.centerX,e.centerY),doughnutLabel:e=>ci(e.centerX,e.centerY),ellipse:e=>({centerX:e.centerX,centerY:e.centerX,radius:0,width:0,height:0}),label:e=>ci(e.centerX,e.centerY),line:e=>ci(e.x,e.y),point:e=>({centerX:e.centerX,centerY:e.centerY,radius:0,width:0,height:0}),polygon:e=>ci(e.centerX,e.centerY)};function ya(e,t){return t==="start"?0:t==="end"?e:dh(t)?ph(t)*e:e/2}function rn(e,t,n=!0){return typeof t=="number"?t:dh(t)?(n?ph(t):gh(t))*e:e}function t0(e,t){const{x:n,width:i}=e,s=t.textAlign;return s==="center"?n+i/2:s==="end"||s==="right"?n+i:n}function mh(e,t,{borderWidth:n,position:i,xAdjust:s,yAdjust:o},r){const a=st(r),l=t.width+(a?r.width:0)+n,c=t.height+(a?r.height:0)+n,f=_a(i),u=Lc(e.x,l,s,f.x),h=Lc(e.y,c,o,f.y);return{x:u,y:h,x2:u+l,y2:h+c,width:l,height:c,centerX:u+l/2,centerY:h+c/2}}function _a(e,t="center"){return st(e)?{x:it(e.x,t),y:it(e.y,t)}:(e=it(e,t),{x:e,y:e})}const bh=(e,t)=>e&&e.autoFit&&t<1;function yh(e,t){const n=e.font,i=kt(n)?n:[n];return bh(e,t)?i.map(function(s){const o=At(s);return o.size=Math.floor(s.size*t),o.lineHeight=s.lineHeight,At(o)}):i.map(s=>At(s))}function _h(e){return e&&(re(e.xValue)||re(e.yValue))}function Lc(e,t,n=0,i){return e-ya(t,i)+n}function Jn(e,t,n){const i=n.init;if(i){if(i===!0)return vh(t,n)}else return;return e0(e,t,n)}function xh(e,t,n){let i=!1;return t.forEach(s=>{ee(e[s])?(i=!0,n[s]=e[s]):re(n[s])&&delete n[s]}),i}function vh(e,t){const n=t.type||"line";return Zx[n](e)}function e0(e,t,n){const i=mt(n.init,[{chart:e,properties:t,options:n}]);if(i===!0)return vh(t,n);if(st(i))return i}const Qo=new Map,n0=e=>isNaN(e)||e<=0,i0=e=>e.reduce(function(t,n){return t+=n.string,t},"");function wo(e){if(e&&typeof e=="object"){const t=e.toString();return t==="[object HTMLImageElement]"||t==="[object HTMLCanvasElement]"}}function So(e,{x:t,y:n},i){i&&(e.translate(t,n),e.rotate(Et(i)),e.translate(-t,-n))}function Ve(e,t){if(t&&t.borderWidth)return e.lineCap=t.borderCapStyle||"butt",e.setLineDash(t.borderDash),e.lineDashOffset=t.borderDashOffset,e.lineJoin=t.borderJoinStyle||"miter",e.lineWidth=t.borderWidth,e.strokeStyle=t.borderColor,!0}function Qn(e,t){e.shadowColor=t.backgroundShadowColor,e.shadowBlur=t.shadowBlur,e.shadowOffsetX=t.shadowOffsetX,e.shadowOffsetY=t.shadowOffsetY}function Mo(e,t){const n=t.content;if(wo(n))return{width:rn(n.width,t.width),height:rn(n.height,t.height)};const i=yh(t),s=t.textStrokeWidth,o=kt(n)?n:[n],r=o.join()+i0(i)+s+(e._measureText?"-spriting":"");return Qo.has(r)||Qo.set(r,a0(e,o,i,s)),Qo.get(r)}function wh(e,t,n){const{x:i,y:s,width:o,height:r}=t;e.save(),Qn(e,n);const a=Ve(e,n);e.fillStyle=n.backgroundColor,e.beginPath(),qs(e,{x:i,y:s,w:o,h:r,radius:Gx(Bn(n.borderRadius),0,Math.min(o,r)/2)}),e.closePath(),e.fill(),a&&(e.shadowColor=n.borderShadowColor,e.stroke()),e.restore()}function Sh(e,t,n,i){const s=n.content;if(wo(s)){e.save(),e.globalAlpha=f0(n.opacity,s.style.opacity),e.drawImage(s,t.x,t.y,t.width,t.height),e.restore();return}const o=kt(s)?s:[s],r=yh(n,i),a=n.color,l=kt(a)?a:[a],c=t0(t,n),f=t.y+n.textStrokeWidth/2;e.save(),e.textBaseline="middle",e.textAlign=n.textAlign,s0(e,n)&&l0(e,{x:c,y:f},o,r),c0(e,{x:c,y:f},o,{fonts:r,colors:l}),e.restore()}function s0(e,t){if(t.textStrokeWidth>0)return e.lineJoin="round",e.miterLimit=2,e.lineWidth=t.textStrokeWidth,e.strokeStyle=t.textStrokeColor,!0}function o0(e,t,n,i){const{radius:s,options:o}=t,r=o.pointStyle,a=o.rotation;let l=(a||0)*oa;if(wo(r)){e.save(),e.translate(n,i),e.rotate(l),e.drawImage(r,-r.width/2,-r.height/2,r.width,r.height),e.restore();return}n0(s)||r0(e,{x:n,y:i,radius:s,rotation:a,style:r,rad:l})}function r0(e,{x:t,y:n,radius:i,rotation:s,style:o,rad:r}){let a,l,c,f;switch(e.beginPath(),o){default:e.arc(t,n,i,0,Dt),e.closePath();break;case"triangle":e.moveTo(t+Math.sin(r)*i,n-Math.cos(r)*i),r+=Xs,e.lineTo(t+Math.sin(r)*i,n-Math.cos(r)*i),r+=Xs,e.lineTo(t+Math.sin(r)*i,n-Math.cos(r)*i),e.closePath();break;case"rectRounded":f=i*.516,c=i-f,a=Math.cos(r+le)*c,l=Math.sin(r+le)*c,e.arc(t-a,n-l,f,r-ft,r-Ht),e.arc(t+l,n-a,f,r-Ht,r),e.arc(t+a,n+l,f,r,r+Ht),e.arc(t-l,n+a,f,r+Ht,r+ft),e.closePath();break;case"rect":if(!s){c=Math.SQRT1_2*i,e.rect(t-c,n-c,2*c,2*c);break}r+=le;case"rectRot":a=Math.cos(r)*i,l=Math.sin(r)*i,e.moveTo(t-a,n-l),e.lineTo(t+l,n-a),e.lineTo(t+a,n+l),e.lineTo(t-l,n+a),e.closePath();break;case"crossRot":r+=le;case"cross":a=Math.cos(r)*i,l=Math.sin(r)*i,e.moveTo(t-a,n-l),e.lineTo(t+a,n+l),e.moveTo(t+l,n-a),e.lineTo(t-l,n+a);break;case"star":a=Math.cos(r)*i,l=Math.sin(r)*i,e.moveTo(t-a,n-l),e.lineTo(t+a,n+l),e.moveTo(t+l,n-a),e.lineTo(t-l,n+a),r+=le,a=Math.cos(r)*i,l=Math.sin(r)*i,e.moveTo(t-a,n-l),e.lineTo(t+a,n+l),e.moveTo(t+l,n-a),e.lineTo(t-l,n+a);break;case"line":a=Math.cos(r)*i,l=Math.sin(r)*i,e.moveTo(t-a,n-l),e.lineTo(t+a,n+l);break;case"dash":e.moveTo(t,n),e.lineTo(t+Math.cos(r)*i,n+Math.sin(r)*i);break}e.fill()}function a0(e,t,n,i){e.save();const s=t.length;let o=0,r=i;for(let a=0;a<s;a++){const l=n[Math.min(a,n.length-1)];e.font=l.string;const c=t[a];o=Math.max(o,e.measureText(c).width+i),r+=l.lineHeight}return e.restore(),{width:o,height:r}}function l0(e,{x:t,y:n},i,s){e.beginPath();let o=0;i.forEach(function(r,a){const l=s[Math.min(a,s.length-1)],c=l.lineHeight;e.font=l.string,e.strokeText(r,t,n+c/2+o),o+=c}),e.stroke()}function c0(e,{x:t,y:n},i,{fonts:s,colors:o}){let r=0;i.forEach(function(a,l){const c=o[Math.min(l,o.length-1)],f=s[Math.min(l,s.length-1)],u=f.lineHeight;e.beginPath(),e.font=f.string,e.fillStyle=c,e.fillText(a,t,n+u/2+r),r+=u,e.fill()})}function f0(e,t){const n=vn(e)?e:t;return vn(n)?vo(n,0,1):1}const Mh=["left","bottom","top","right"];function u0(e,t){const{pointX:n,pointY:i,options:s}=t,o=s.callout,r=o&&o.display&&m0(t,o);if(!r||y0(t,o,r))return;if(e.save(),e.beginPath(),!Ve(e,o))return e.restore();const{separatorStart:l,separatorEnd:c}=h0(t,r),{sideStart:f,sideEnd:u}=g0(t,r,l);(o.margin>0||s.borderWidth===0)&&(e.moveTo(l.x,l.y),e.lineTo(c.x,c.y)),e.moveTo(f.x,f.y),e.lineTo(u.x,u.y);const h=kn({x:n,y:i},t.getCenterPoint(),Et(-t.rotation));e.lineTo(h.x,h.y),e.stroke(),e.restore()}function h0(e,t){const{x:n,y:i,x2:s,y2:o}=e,r=d0(e,t);let a,l;return t==="left"||t==="right"?(a={x:n+r,y:i},l={x:a.x,y:o}):(a={x:n,y:i+r},l={x:s,y:a.y}),{separatorStart:a,separatorEnd:l}}function d0(e,t){const{width:n,height:i,options:s}=e,o=s.callout.margin+s.borderWidth/2;return t==="right"?n+o:t==="bottom"?i+o:-o}function g0(e,t,n){const{y:i,width:s,height:o,options:r}=e,a=r.callout.start,l=p0(t,r.callout);let c,f;return t==="left"||t==="right"?(c={x:n.x,y:i+rn(o,a)},f={x:c.x+l,y:c.y}):(c={x:n.x+rn(s,a),y:n.y},f={x:c.x,y:c.y+l}),{sideStart:c,sideEnd:f}}function p0(e,t){const n=t.side;return e==="left"||e==="top"?-n:n}function m0(e,t){const n=t.position;return Mh.includes(n)?n:b0(e,t)}function b0(e,t){const{x:n,y:i,x2:s,y2:o,width:r,height:a,pointX:l,pointY:c,centerX:f,centerY:u,rotation:h}=e,d={x:f,y:u},g=t.start,p=rn(r,g),b=rn(a,g),_=[n,n+p,n+p,s],v=[i+b,o,i,o],w=[];for(let S=0;S<4;S++){const M=kn({x:_[S],y:v[S]},d,Et(h));w.push({position:Mh[S],distance:Un(M,{x:l,y:c})})}return w.sort((S,M)=>S.distance-M.distance)[0].position}function y0(e,t,n){const{pointX:i,pointY:s}=e,o=t.margin;let r=i,a=s;return n==="left"?r+=o:n==="right"?r-=o:n==="top"?a+=o:n==="bottom"&&(a-=o),e.inRange(r,a)}const Fc={xScaleID:{min:"xMin",max:"xMax",start:"left",end:"right",startProp:"x",endProp:"x2"},yScaleID:{min:"yMin",max:"yMax",start:"bottom",end:"top",startProp:"y",endProp:"y2"}};function qn(e,t,n){return t=typeof t=="number"?t:e.parse(t),Rt(t)?e.getPixelForValue(t):n}function Sn(e,t,n){const i=t[n];if(i||n==="scaleID")return i;const s=n.charAt(0),o=Object.values(e).filter(r=>r.axis&&r.axis===s);return o.length?o[0].id:s}function kh(e,t){if(e){const n=e.options.reverse,i=qn(e,t.min,n?t.end:t.start),s=qn(e,t.max,n?t.start:t.end);return{start:i,end:s}}}function Ph(e,t){const{chartArea:n,scales:i}=e,s=i[Sn(i,t,"xScaleID")],o=i[Sn(i,t,"yScaleID")];let r=n.width/2,a=n.height/2;return s&&(r=qn(s,t.xValue,s.left+s.width/2)),o&&(a=qn(o,t.yValue,o.top+o.height/2)),{x:r,y:a}}function xa(e,t){const n=e.scales,i=n[Sn(n,t,"xScaleID")],s=n[Sn(n,t,"yScaleID")];if(!i&&!s)return{};let{left:o,right:r}=i||e.chartArea,{top:a,bottom:l}=s||e.chartArea;const c=Hc(i,{min:t.xMin,max:t.xMax,start:o,end:r});o=c.start,r=c.end;const f=Hc(s,{min:t.yMin,max:t.yMax,start:l,end:a});return a=f.start,l=f.end,{x:o,y:a,x2:r,y2:l,width:r-o,height:l-a,centerX:o+(r-o)/2,centerY:a+(l-a)/2}}function Ch(e,t){if(!_h(t)){const n=xa(e,t);let i=t.radius;(!i||isNaN(i))&&(i=Math.min(n.width,n.height)/2,t.radius=i);const s=i*2,o=n.centerX+t.xAdjust,r=n.centerY+t.yAdjust;return{x:o-i,y:r-i,x2:o+i,y2:r+i,centerX:o,centerY:r,width:s,height:s,radius:i}}return x0(e,t)}function _0(e,t){const{scales:n,chartArea:i}=e,s=n[t.scaleID],o={x:i.left,y:i.top,x2:i.right,y2:i.bottom};return s?v0(s,o,t):w0(n,o,t),o}function Oh(e,t){const n=xa(e,t);return n.initProperties=Jn(e,n,t),n.elements=[{type:"label",optionScope:"label",properties:k0(e,n,t),initProperties:n.initProperties}],n}function x0(e,t){const n=Ph(e,t),i=t.radius*2;return{x:n.x-t.radius+t.xAdjust,y:n.y-t.radius+t.yAdjust,x2:n.x+t.radius+t.xAdjust,y2:n.y+t.radius+t.yAdjust,centerX:n.x+t.xAdjust,centerY:n.y+t.yAdjust,radius:t.radius,width:i,height:i}}function Hc(e,t){const n=kh(e,t)||t;return{start:Math.min(n.start,n.end),end:Math.max(n.start,n.end)}}function v0(e,t,n){const i=qn(e,n.value,NaN),s=qn(e,n.endValue,i);e.isHorizontal()?(t.x=i,t.x2=s):(t.y=i,t.y2=s)}function w0(e,t,n){for(const i of Object.keys(Fc)){const s=e[Sn(e,n,i)];if(s){const{min:o,max:r,start:a,end:l,startProp:c,endProp:f}=Fc[i],u=kh(s,{min:n[o],max:n[r],start:s[a],end:s[l]});t[c]=u.start,t[f]=u.end}}}function S0({properties:e,options:t},n,i,s){const{x:o,x2:r,width:a}=e;return Th({start:o,end:r,borderWidth:t.borderWidth},{position:i.x,padding:{start:s.left,end:s.right},adjust:t.label.xAdjust,size:n.width})}function M0({properties:e,options:t},n,i,s){const{y:o,y2:r,height:a}=e;return Th({start:o,end:r,borderWidth:t.borderWidth},{position:i.y,padding:{start:s.top,end:s.bottom},adjust:t.label.yAdjust,size:n.height})}function Th(e,t){const{start:n,end:i,borderWidth:s}=e,{position:o,padding:{start:r,end:a},adjust:l}=t,c=i-s-n-r-a-t.size;return n+s/2+l+ya(c,o)}function k0(e,t,n){const i=n.label;i.backgroundColor="transparent",i.callout.display=!1;const s=_a(i.position),o=Nt(i.padding),r=Mo(e.ctx,i),a=S0({properties:t,options:n},r,s,o),l=M0({properties:t,options:n},r,s,o),c=r.width+o.width,f=r.height+o.height;return{x:a,y:l,x2:a+c,y2:l+f,width:c,height:f,centerX:a+c/2,centerY:l+f/2,rotation:i.rotation}}const kr=["enter","leave"],va=kr.concat("click");function P0(e,t,n){t.listened=xh(n,va,t.listeners),t.moveListened=!1,kr.forEach(i=>{ee(n[i])&&(t.moveListened=!0)}),(!t.listened||!t.moveListened)&&t.annotations.forEach(i=>{!t.listened&&ee(i.click)&&(t.listened=!0),t.moveListened||kr.forEach(s=>{ee(i[s])&&(t.listened=!0,t.moveListened=!0)})})}function C0(e,t,n){if(e.listened)switch(t.type){case"mousemove":case"mouseout":return O0(e,t,n);case"click":return T0(e,t,n)}}function O0(e,t,n){if(!e.moveListened)return;let i;t.type==="mousemove"?i=ba(e.visibleElements,t,n.interaction):i=[];const s=e.hovered;e.hovered=i;const o={state:e,event:t};let r=zc(o,"leave",s,i);return zc(o,"enter",i,s)||r}function zc({state:e,event:t},n,i,s){let o;for(const r of i)s.indexOf(r)<0&&(o=Ah(r.options[n]||e.listeners[n],r,t)||o);return o}function T0(e,t,n){const i=e.listeners,s=ba(e.visibleElements,t,n.interaction);let o;for(const r of s)o=Ah(r.options.click||i.click,r,t)||o;return o}function Ah(e,t,n){return mt(e,[t.$context,n])===!0}const Zs=["afterDraw","beforeDraw"];function A0(e,t,n){const i=t.visibleElements;t.hooked=xh(n,Zs,t.hooks),t.hooked||i.forEach(s=>{t.hooked||Zs.forEach(o=>{ee(s.options[o])&&(t.hooked=!0)})})}function Bc(e,t,n){if(e.hooked){const i=t.options[n]||e.hooks[n];return mt(i,[t.$context])}}function D0(e,t,n){const i=F0(e.scales,t,n);let s=Wc(t,i,"min","suggestedMin");s=Wc(t,i,"max","suggestedMax")||s,s&&ee(t.handleTickRangeOptions)&&t.handleTickRangeOptions()}function E0(e,t){for(const n of e)I0(n,t)}function Wc(e,t,n,i){if(Rt(t[n])&&!R0(e.options,n,i)){const s=e[n]!==t[n];return e[n]=t[n],s}}function R0(e,t,n){return re(e[t])||re(e[n])}function I0(e,t){for(const n of["scaleID","xScaleID","yScaleID"]){const i=Sn(t,e,n);i&&!t[i]&&L0(e,n)&&console.warn(`No scale found with id '${i}' for annotation '${e.id}'`)}}function L0(e,t){if(t==="scaleID")return!0;const n=t.charAt(0);for(const i of["Min","Max","Value"])if(re(e[n+i]))return!0;return!1}function F0(e,t,n){const i=t.axis,s=t.id,o=i+"ScaleID",r={min:it(t.min,Number.NEGATIVE_INFINITY),max:it(t.max,Number.POSITIVE_INFINITY)};for(const a of n)a.scaleID===s?jc(a,t,["value","endValue"],r):Sn(e,a,o)===s&&jc(a,t,[i+"Min",i+"Max",i+"Value"],r);return r}function jc(e,t,n,i){for(const s of n){const o=e[s];if(re(o)){const r=t.parse(o);i.min=Math.min(i.min,r),i.max=Math.max(i.max,r)}}}class Zn extends ne{inRange(t,n,i,s){const{x:o,y:r}=kn({x:t,y:n},this.getCenterPoint(s),Et(-this.options.rotation));return uh({x:o,y:r},this.getProps(["x","y","x2","y2"],s),i,this.options)}getCenterPoint(t){return Pn(this,t)}draw(t){t.save(),So(t,this.getCenterPoint(),this.options.rotation),wh(t,this,this.options),t.restore()}get label(){return this.elements&&this.elements[0]}resolveElementProperties(t,n){return Oh(t,n)}}Zn.id="boxAnnotation";Zn.defaults={adjustScaleRange:!0,backgroundShadowColor:"transparent",borderCapStyle:"butt",borderDash:[],borderDashOffset:0,borderJoinStyle:"miter",borderRadius:0,borderShadowColor:"transparent",borderWidth:1,display:!0,init:void 0,hitTolerance:0,label:{backgroundColor:"transparent",borderWidth:0,callout:{display:!1},color:"black",content:null,display:!1,drawTime:void 0,font:{family:void 0,lineHeight:void 0,size:void 0,style:void 0,weight:"bold"},height:void 0,hitTolerance:void 0,opacity:void 0,padding:6,position:"center",rotation:void 0,textAlign:"start",textStrokeColor:void 0,textStrokeWidth:0,width:void 0,xAdjust:0,yAdjust:0,z:void 0},rotation:0,shadowBlur:0,shadowOffsetX:0,shadowOffsetY:0,xMax:void 0,xMin:void 0,xScaleID:void 0,yMax:void 0,yMin:void 0,yScaleID:void 0,z:0};Zn.defaultRoutes={borderColor:"color",backgroundColor:"color"};Zn.descriptors={label:{_fallback:!0}};class ko extends ne{inRange(t,n,i,s){return hh({x:t,y:n},{rect:this.getProps(["x","y","x2","y2"],s),center:this.getCenterPoint(s)},i,{rotation:this.rotation,borderWidth:0,hitTolerance:this.options.hitTolerance})}getCenterPoint(t){return Pn(this,t)}draw(t){const n=this.options;!n.display||!n.content||(N0(t,this),t.save(),So(t,this.getCenterPoint(),this.rotation),Sh(t,this,n,this._fitRatio),t.restore())}resolveElementProperties(t,n){const i=H0(t,n);if(!i)return{};const{controllerMeta:s,point:o,radius:r}=B0(t,n,i);let a=Mo(t.ctx,n);const l=W0(a,r);bh(n,l)&&(a={width:a.width*l,height:a.height*l});const{position:c,xAdjust:f,yAdjust:u}=n,h=mh(o,a,{borderWidth:0,position:c,xAdjust:f,yAdjust:u});return{initProperties:Jn(t,h,n),...h,...s,rotation:n.rotation,_fitRatio:l}}}ko.id="doughnutLabelAnnotation";ko.defaults={autoFit:!0,autoHide:!0,backgroundColor:"transparent",backgroundShadowColor:"transparent",borderColor:"transparent",borderDash:[],borderDashOffset:0,borderJoinStyle:"miter",borderShadowColor:"transparent",borderWidth:0,color:"black",content:null,display:!0,font:{family:void 0,lineHeight:void 0,size:void 0,style:void 0,weight:void 0},height:void 0,hitTolerance:0,init:void 0,opacity:void 0,position:"center",rotation:0,shadowBlur:0,shadowOffsetX:0,shadowOffsetY:0,spacing:1,textAlign:"center",textStrokeColor:void 0,textStrokeWidth:0,width:void 0,xAdjust:0,yAdjust:0};ko.defaultRoutes={};function H0(e,t){return e.getSortedVisibleDatasetMetas().reduce(function(n,i){const s=i.controller;return s instanceof gi&&z0(e,t,i.data)&&(!n||s.innerRadius<n.controller.innerRadius)&&s.options.circumference>=90?i:n},void 0)}function z0(e,t,n){if(!t.autoHide)return!0;for(let i=0;i<n.length;i++)if(!n[i].hidden&&e.getDataVisibility(i))return!0}function B0({chartArea:e},t,n){const{left:i,top:s,right:o,bottom:r}=e,{innerRadius:a,offsetX:l,offsetY:c}=n.controller,f=(i+o)/2+l,u=(s+r)/2+c,h={left:Math.max(f-a,i),right:Math.min(f+a,o),top:Math.max(u-a,s),bottom:Math.min(u+a,r)},d={x:(h.left+h.right)/2,y:(h.top+h.bottom)/2},g=t.spacing+t.borderWidth/2,p=a-g,b=d.y>u,_=b?s+g:r-g,v=j0(_,f,u,p);return{controllerMeta:{_centerX:f,_centerY:u,_radius:p,_counterclockwise:b,...v},point:d,radius:Math.min(a,Math.min(h.right-h.left,h.bottom-h.top)/2)}}function W0({width:e,height:t},n){const i=Math.sqrt(Math.pow(e,2)+Math.pow(t,2));return n*2/i}function j0(e,t,n,i){const s=Math.pow(n-e,2),o=Math.pow(i,2),r=t*-2,a=Math.pow(t,2)+s-o,l=Math.pow(r,2)-4*a;if(l<=0)return{_startAngle:0,_endAngle:Dt};const c=(-r-Math.sqrt(l))/2,f=(-r+Math.sqrt(l))/2;return{_startAngle:pr({x:t,y:n},{x:c,y:e}).angle,_endAngle:pr({x:t,y:n},{x:f,y:e}).angle}}function N0(e,t){const{_centerX:n,_centerY:i,_radius:s,_startAngle:o,_endAngle:r,_counterclockwise:a,options:l}=t;e.save();const c=Ve(e,l);e.fillStyle=l.backgroundColor,e.beginPath(),e.arc(n,i,s,o,r,a),e.closePath(),e.fill(),c&&e.stroke(),e.restore()}class ts extends ne{inRange(t,n,i,s){return hh({x:t,y:n},{rect:this.getProps(["x","y","x2","y2"],s),center:this.getCenterPoint(s)},i,{rotation:this.rotation,borderWidth:this.options.borderWidth,hitTolerance:this.options.hitTolerance})}getCenterPoint(t){return Pn(this,t)}draw(t){const n=this.options,i=!re(this._visible)||this._visible;!n.display||!n.content||!i||(t.save(),So(t,this.getCenterPoint(),this.rotation),u0(t,this),wh(t,this,n),Sh(t,V0(this),n),t.restore())}resolveElementProperties(t,n){let i;if(_h(n))i=Ph(t,n);else{const{centerX:a,centerY:l}=xa(t,n);i={x:a,y:l}}const s=Nt(n.padding),o=Mo(t.ctx,n),r=mh(i,o,n,s);return{initProperties:Jn(t,r,n),pointX:i.x,pointY:i.y,...r,rotation:n.rotation}}}ts.id="labelAnnotation";ts.defaults={adjustScaleRange:!0,backgroundColor:"transparent",backgroundShadowColor:"transparent",borderCapStyle:"butt",borderDash:[],borderDashOffset:0,borderJoinStyle:"miter",borderRadius:0,borderShadowColor:"transparent",borderWidth:0,callout:{borderCapStyle:"butt",borderColor:void 0,borderDash:[],borderDashOffset:0,borderJoinStyle:"miter",borderWidth:1,display:!1,margin:5,position:"auto",side:5,start:"50%"},color:"black",content:null,display:!0,font:{family:void 0,lineHeight:void 0,size:void 0,style:void 0,weight:void 0},height:void 0,hitTolerance:0,init:void 0,opacity:void 0,padding:6,position:"center",rotation:0,shadowBlur:0,shadowOffsetX:0,shadowOffsetY:0,textAlign:"center",textStrokeColor:void 0,textStrokeWidth:0,width:void 0,xAdjust:0,xMax:void 0,xMin:void 0,xScaleID:void 0,xValue:void 0,yAdjust:0,yMax:void 0,yMin:void 0,yScaleID:void 0,yValue:void 0,z:0};ts.defaultRoutes={borderColor:"color"};function V0({x:e,y:t,width:n,height:i,options:s}){const o=s.borderWidth/2,r=Nt(s.padding);return{x:e+r.left+o,y:t+r.top+o,width:n-r.left-r.right-s.borderWidth,height:i-r.top-r.bottom-s.borderWidth}}const wa=(e,t,n)=>({x:e.x+n*(t.x-e.x),y:e.y+n*(t.y-e.y)}),Pr=(e,t,n)=>wa(t,n,Math.abs((e-t.y)/(n.y-t.y))).x,Nc=(e,t,n)=>wa(t,n,Math.abs((e-t.x)/(n.x-t.x))).y,bi=e=>e*e,$0=(e,t,{x:n,y:i,x2:s,y2:o},r)=>r==="y"?{start:Math.min(i,o),end:Math.max(i,o),value:t}:{start:Math.min(n,s),end:Math.max(n,s),value:e},Vc=(e,t,n,i)=>(1-i)*(1-i)*e+2*(1-i)*i*t+i*i*n,Cr=(e,t,n,i)=>({x:Vc(e.x,t.x,n.x,i),y:Vc(e.y,t.y,n.y,i)}),$c=(e,t,n,i)=>2*(1-i)*(t-e)+2*i*(n-t),Yc=(e,t,n,i)=>-Math.atan2($c(e.x,t.x,n.x,i),$c(e.y,t.y,n.y,i))+.5*ft;class es extends ne{inRange(t,n,i,s){const o=(this.options.borderWidth+this.options.hitTolerance)/2;if(i!=="x"&&i!=="y"){const r={mouseX:t,mouseY:n},{path:a,ctx:l}=this;if(a){Ve(l,this.options),l.lineWidth+=this.options.hitTolerance;const{chart:f}=this.$context,u=t*f.currentDevicePixelRatio,h=n*f.currentDevicePixelRatio,d=l.isPointInStroke(a,u,h)||Or(this,r,s);return l.restore(),d}const c=bi(o);return K0(this,r,c,s)||Or(this,r,s)}return Y0(this,{mouseX:t,mouseY:n},i,{hitSize:o,useFinalPosition:s})}getCenterPoint(t){return Pn(this,t)}draw(t){const{x:n,y:i,x2:s,y2:o,cp:r,options:a}=this;if(t.save(),!Ve(t,a))return t.restore();Qn(t,a);const l=Math.sqrt(Math.pow(s-n,2)+Math.pow(o-i,2));if(a.curve&&r)return nv(t,this,r,l),t.restore();const{startOpts:c,endOpts:f,startAdjust:u,endAdjust:h}=Dh(this),d=Math.atan2(o-i,s-n);t.translate(n,i),t.rotate(d),t.beginPath(),t.moveTo(0+u,0),t.lineTo(l-h,0),t.shadowColor=a.borderShadowColor,t.stroke(),Tr(t,0,u,c),Tr(t,l,-h,f),t.restore()}get label(){return this.elements&&this.elements[0]}resolveElementProperties(t,n){const i=_0(t,n),{x:s,y:o,x2:r,y2:a}=i,l=U0(i,t.chartArea),c=l?X0({x:s,y:o},{x:r,y:a},t.chartArea):{x:s,y:o,x2:r,y2:a,width:Math.abs(r-s),height:Math.abs(a-o)};if(c.centerX=(r+s)/2,c.centerY=(a+o)/2,c.initProperties=Jn(t,c,n),n.curve){const u={x:c.x,y:c.y},h={x:c.x2,y:c.y2};c.cp=ev(c,n,Un(u,h))}const f=q0(t,c,n.label);return f._visible=l,c.elements=[{type:"label",optionScope:"label",properties:f,initProperties:c.initProperties}],c}}es.id="lineAnnotation";const Uc={backgroundColor:void 0,backgroundShadowColor:void 0,borderColor:void 0,borderDash:void 0,borderDashOffset:void 0,borderShadowColor:void 0,borderWidth:void 0,display:void 0,fill:void 0,length:void 0,shadowBlur:void 0,shadowOffsetX:void 0,shadowOffsetY:void 0,width:void 0};es.defaults={adjustScaleRange:!0,arrowHeads:{display:!1,end:Object.assign({},Uc),fill:!1,length:12,start:Object.assign({},Uc),width:6},borderDash:[],borderDashOffset:0,borderShadowColor:"transparent",borderWidth:2,curve:!1,controlPoint:{y:"-50%"},display:!0,endValue:void 0,init:void 0,hitTolerance:0,label:{backgroundColor:"rgba(0,0,0,0.8)",backgroundShadowColor:"transparent",borderCapStyle:"butt",borderColor:"black",borderDash:[],borderDashOffset:0,borderJoinStyle:"miter",borderRadius:6,borderShadowColor:"transparent",borderWidth:0,callout:Object.assign({},ts.defaults.callout),color:"#fff",content:null,display:!1,drawTime:void 0,font:{family:void 0,lineHeight:void 0,size:void 0,style:void 0,weight:"bold"},height:void 0,hitTolerance:void 0,opacity:void 0,padding:6,position:"center",rotation:0,shadowBlur:0,shadowOffsetX:0,shadowOffsetY:0,textAlign:"center",textStrokeColor:void 0,textStrokeWidth:0,width:void 0,xAdjust:0,yAdjust:0,z:void 0},scaleID:void 0,shadowBlur:0,shadowOffsetX:0,shadowOffsetY:0,value:void 0,xMax:void 0,xMin:void 0,xScaleID:void 0,yMax:void 0,yMin:void 0,yScaleID:void 0,z:0};es.descriptors={arrowHeads:{start:{_fallback:!0},end:{_fallback:!0},_fallback:!0}};es.defaultRoutes={borderColor:"color"};function Y0(e,{mouseX:t,mouseY:n},i,{hitSize:s,useFinalPosition:o}){const r=$0(t,n,e.getProps(["x","y","x2","y2"],o),i);return fh(r,s)||Or(e,{mouseX:t,mouseY:n},o,i)}function U0({x:e,y:t,x2:n,y2:i},{top:s,right:o,bottom:r,left:a}){return!(e<a&&n<a||e>o&&n>o||t<s&&i<s||t>r&&i>r)}function Xc({x:e,y:t},n,{top:i,right:s,bottom:o,left:r}){return e<r&&(t=Nc(r,{x:e,y:t},n),e=r),e>s&&(t=Nc(s,{x:e,y:t},n),e=s),t<i&&(e=Pr(i,{x:e,y:t},n),t=i),t>o&&(e=Pr(o,{x:e,y:t},n),t=o),{x:e,y:t}}function X0(e,t,n){const{x:i,y:s}=Xc(e,t,n),{x:o,y:r}=Xc(t,e,n);return{x:i,y:s,x2:o,y2:r,width:Math.abs(o-i),height:Math.abs(r-s)}}function K0(e,{mouseX:t,mouseY:n},i=yn,s){const{x:o,y:r,x2:a,y2:l}=e.getProps(["x","y","x2","y2"],s),c=a-o,f=l-r,u=bi(c)+bi(f),h=u===0?-1:((t-o)*c+(n-r)*f)/u;let d,g;return h<0?(d=o,g=r):h>1?(d=a,g=l):(d=o+h*c,g=r+h*f),bi(t-d)+bi(n-g)<=i}function Or(e,{mouseX:t,mouseY:n},i,s){const o=e.label;return o.options.display&&o.inRange(t,n,s,i)}function q0(e,t,n){const i=n.borderWidth,s=Nt(n.padding),o=Mo(e.ctx,n),r=o.width+s.width+i,a=o.height+s.height+i;return J0(t,n,{width:r,height:a,padding:s},e.chartArea)}function G0(e){const{x:t,y:n,x2:i,y2:s}=e,o=Math.atan2(s-n,i-t);return o>ft/2?o-ft:o<ft/-2?o+ft:o}function J0(e,t,n,i){const{width:s,height:o,padding:r}=n,{xAdjust:a,yAdjust:l}=t,c={x:e.x,y:e.y},f={x:e.x2,y:e.y2},u=t.rotation==="auto"?G0(e):Et(t.rotation),h=Q0(s,o,u),d=Z0(e,t,{labelSize:h,padding:r},i),g=e.cp?Cr(c,e.cp,f,d):wa(c,f,d),p={size:h.w,min:i.left,max:i.right,padding:r.left},b={size:h.h,min:i.top,max:i.bottom,padding:r.top},_=qc(g.x,p)+a,v=qc(g.y,b)+l;return{x:_-s/2,y:v-o/2,x2:_+s/2,y2:v+o/2,centerX:_,centerY:v,pointX:g.x,pointY:g.y,width:s,height:o,rotation:Pu(u)}}function Q0(e,t,n){const i=Math.cos(n),s=Math.sin(n);return{w:Math.abs(e*i)+Math.abs(t*s),h:Math.abs(e*s)+Math.abs(t*i)}}function Z0(e,t,n,i){let s;const o=tv(e,i);return t.position==="start"?s=Kc({w:e.x2-e.x,h:e.y2-e.y},n,t,o):t.position==="end"?s=1-Kc({w:e.x-e.x2,h:e.y-e.y2},n,t,o):s=ya(1,t.position),s}function Kc(e,t,n,i){const{labelSize:s,padding:o}=t,r=e.w*i.dx,a=e.h*i.dy,l=r>0&&(s.w/2+o.left-i.x)/r,c=a>0&&(s.h/2+o.top-i.y)/a;return vo(Math.max(l,c),0,.25)}function tv(e,t){const{x:n,x2:i,y:s,y2:o}=e,r=Math.min(s,o)-t.top,a=Math.min(n,i)-t.left,l=t.bottom-Math.max(s,o),c=t.right-Math.max(n,i);return{x:Math.min(a,c),y:Math.min(r,l),dx:a<=c?1:-1,dy:r<=l?1:-1}}function qc(e,t){const{size:n,min:i,max:s,padding:o}=t,r=n/2;return n>s-i?(s+i)/2:(i>=e-o-r&&(e=i+o+r),s<=e+o+r&&(e=s-o-r),e)}function Dh(e){const t=e.options,n=t.arrowHeads&&t.arrowHeads.start,i=t.arrowHeads&&t.arrowHeads.end;return{startOpts:n,endOpts:i,startAdjust:Gc(e,n),endAdjust:Gc(e,i)}}function Gc(e,t){if(!t||!t.display)return 0;const{length:n,width:i}=t,s=e.options.borderWidth/2,o={x:n,y:i+s};return Math.abs(Pr(0,o,{x:0,y:s}))}function Tr(e,t,n,i){if(!i||!i.display)return;const{length:s,width:o,fill:r,backgroundColor:a,borderColor:l}=i,c=Math.abs(t-s)+n;e.beginPath(),Qn(e,i),Ve(e,i),e.moveTo(c,-o),e.lineTo(t+n,0),e.lineTo(c,o),r===!0?(e.fillStyle=a||l,e.closePath(),e.fill(),e.shadowColor="transparent"):e.shadowColor=i.borderShadowColor,e.stroke()}function ev(e,t,n){const{x:i,y:s,x2:o,y2:r,centerX:a,centerY:l}=e,c=Math.atan2(r-s,o-i),f=_a(t.controlPoint,0),u={x:a+rn(n,f.x,!1),y:l+rn(n,f.y,!1)};return kn(u,{x:a,y:l},c)}function Jc(e,{x:t,y:n},{angle:i,adjust:s},o){!o||!o.display||(e.save(),e.translate(t,n),e.rotate(i),Tr(e,0,-s,o),e.restore())}function nv(e,t,n,i){const{x:s,y:o,x2:r,y2:a,options:l}=t,{startOpts:c,endOpts:f,startAdjust:u,endAdjust:h}=Dh(t),d={x:s,y:o},g={x:r,y:a},p=Yc(d,n,g,0),b=Yc(d,n,g,1)-ft,_=Cr(d,n,g,u/i),v=Cr(d,n,g,1-h/i),w=new Path2D;e.beginPath(),w.moveTo(_.x,_.y),w.quadraticCurveTo(n.x,n.y,v.x,v.y),e.shadowColor=l.borderShadowColor,e.stroke(w),t.path=w,t.ctx=e,Jc(e,_,{angle:p,adjust:u},c),Jc(e,v,{angle:b,adjust:h},f)}class ns extends ne{inRange(t,n,i,s){const o=this.options.rotation,r=(this.options.borderWidth+this.options.hitTolerance)/2;if(i!=="x"&&i!=="y")return iv({x:t,y:n},this.getProps(["width","height","centerX","centerY"],s),o,r);const{x:a,y:l,x2:c,y2:f}=this.getProps(["x","y","x2","y2"],s),u=i==="y"?{start:l,end:f}:{start:a,end:c},h=kn({x:t,y:n},this.getCenterPoint(s),Et(-o));return h[i]>=u.start-r-yn&&h[i]<=u.end+r+yn}getCenterPoint(t){return Pn(this,t)}draw(t){const{width:n,height:i,centerX:s,centerY:o,options:r}=this;t.save(),So(t,this.getCenterPoint(),r.rotation),Qn(t,this.options),t.beginPath(),t.fillStyle=r.backgroundColor;const a=Ve(t,r);t.ellipse(s,o,i/2,n/2,ft/2,0,2*ft),t.fill(),a&&(t.shadowColor=r.borderShadowColor,t.stroke()),t.restore()}get label(){return this.elements&&this.elements[0]}resolveElementProperties(t,n){return Oh(t,n)}}ns.id="ellipseAnnotation";ns.defaults={adjustScaleRange:!0,backgroundShadowColor:"transparent",borderDash:[],borderDashOffset:0,borderShadowColor:"transparent",borderWidth:1,display:!0,hitTolerance:0,init:void 0,label:Object.assign({},Zn.defaults.label),rotation:0,shadowBlur:0,shadowOffsetX:0,shadowOffsetY:0,xMax:void 0,xMin:void 0,xScaleID:void 0,yMax:void 0,yMin:void 0,yScaleID:void 0,z:0};ns.defaultRoutes={borderColor:"color",backgroundColor:"color"};ns.descriptors={label:{_fallback:!0}};function iv(e,t,n,i){const{width:s,height:o,centerX:r,centerY:a}=t,l=s/2,c=o/2;if(l<=0||c<=0)return!1;const f=Et(n||0),u=Math.cos(f),h=Math.sin(f),d=Math.pow(u*(e.x-r)+h*(e.y-a),2),g=Math.pow(h*(e.x-r)-u*(e.y-a),2);return d/Math.pow(l+i,2)+g/Math.pow(c+i,2)<=1.0001}class Po extends ne{inRange(t,n,i,s){const{x:o,y:r,x2:a,y2:l,width:c}=this.getProps(["x","y","x2","y2","width"],s),f=(this.options.borderWidth+this.options.hitTolerance)/2;return i!=="x"&&i!=="y"?Jx({x:t,y:n},this.getCenterPoint(s),c/2,f):fh(i==="y"?{start:r,end:l,value:n}:{start:o,end:a,value:t},f)}getCenterPoint(t){return Pn(this,t)}draw(t){const n=this.options,i=n.borderWidth;if(n.radius<.1)return;t.save(),t.fillStyle=n.backgroundColor,Qn(t,n);const s=Ve(t,n);o0(t,this,this.centerX,this.centerY),s&&!wo(n.pointStyle)&&(t.shadowColor=n.borderShadowColor,t.stroke()),t.restore(),n.borderWidth=i}resolveElementProperties(t,n){const i=Ch(t,n);return i.initProperties=Jn(t,i,n),i}}Po.id="pointAnnotation";Po.defaults={adjustScaleRange:!0,backgroundShadowColor:"transparent",borderDash:[],borderDashOffset:0,borderShadowColor:"transparent",borderWidth:1,display:!0,hitTolerance:0,init:void 0,pointStyle:"circle",radius:10,rotation:0,shadowBlur:0,shadowOffsetX:0,shadowOffsetY:0,xAdjust:0,xMax:void 0,xMin:void 0,xScaleID:void 0,xValue:void 0,yAdjust:0,yMax:void 0,yMin:void 0,yScaleID:void 0,yValue:void 0,z:0};Po.defaultRoutes={borderColor:"color",backgroundColor:"color"};class Co extends ne{inRange(t,n,i,s){if(i!=="x"&&i!=="y")return this.options.radius>=.1&&this.elements.length>1&&ov(this.elements,t,n,s);const o=kn({x:t,y:n},this.getCenterPoint(s),Et(-this.options.rotation)),r=this.elements.map(c=>i==="y"?c.bY:c.bX),a=Math.min(...r),l=Math.max(...r);return o[i]>=a&&o[i]<=l}getCenterPoint(t){return Pn(this,t)}draw(t){const{elements:n,options:i}=this;t.save(),t.beginPath(),t.fillStyle=i.backgroundColor,Qn(t,i);const s=Ve(t,i);let o=!0;for(const r of n)o?(t.moveTo(r.x,r.y),o=!1):t.lineTo(r.x,r.y);t.closePath(),t.fill(),s&&(t.shadowColor=i.borderShadowColor,t.stroke()),t.restore()}resolveElementProperties(t,n){const i=Ch(t,n),{sides:s,rotation:o}=n,r=[],a=2*ft/s;let l=o*oa;for(let c=0;c<s;c++,l+=a){const f=sv(i,n,l);f.initProperties=Jn(t,i,n),r.push(f)}return i.elements=r,i}}Co.id="polygonAnnotation";Co.defaults={adjustScaleRange:!0,backgroundShadowColor:"transparent",borderCapStyle:"butt",borderDash:[],borderDashOffset:0,borderJoinStyle:"miter",borderShadowColor:"transparent",borderWidth:1,display:!0,hitTolerance:0,init:void 0,point:{radius:0},radius:10,rotation:0,shadowBlur:0,shadowOffsetX:0,shadowOffsetY:0,sides:3,xAdjust:0,xMax:void 0,xMin:void 0,xScaleID:void 0,xValue:void 0,yAdjust:0,yMax:void 0,yMin:void 0,yScaleID:void 0,yValue:void 0,z:0};Co.defaultRoutes={borderColor:"color",backgroundColor:"color"};function sv({centerX:e,centerY:t},{radius:n,borderWidth:i,hitTolerance:s},o){const r=(i+s)/2,a=Math.sin(o),l=Math.cos(o),c={x:e+a*n,y:t-l*n};return{type:"point",optionScope:"point",properties:{x:c.x,y:c.y,centerX:c.x,centerY:c.y,bX:e+a*(n+r),bY:t-l*(n+r)}}}function ov(e,t,n,i){let s=!1,o=e[e.length-1].getProps(["bX","bY"],i);for(const r of e){const a=r.getProps(["bX","bY"],i);a.bY>n!=o.bY>n&&t<(o.bX-a.bX)*(n-a.bY)/(o.bY-a.bY)+a.bX&&(s=!s),o=a}return s}const en={box:Zn,doughnutLabel:ko,ellipse:ns,label:ts,line:es,point:Po,polygon:Co};Object.keys(en).forEach(e=>{Ct.describe(`elements.${en[e].id}`,{_fallback:"plugins.annotation.common"})});const rv={update:Object.assign},av=va.concat(Zs),Qc=(e,t)=>st(t)?Dr(e,t):e,Ar=e=>e==="color"||e==="font";function Sa(e="line"){return en[e]?e:(console.warn(`Unknown annotation type: '${e}', defaulting to 'line'`),"line")}function lv(e,t,n,i){const s=fv(e,n.animations,i),o=t.annotations,r=dv(t.elements,o);for(let a=0;a<o.length;a++){const l=o[a],c=Eh(r,a,l.type),f=l.setContext(hv(e,c,r,l)),u=c.resolveElementProperties(e,f);u.skip=cv(u),"elements"in u&&(uv(c,u.elements,f,s),delete u.elements),re(c.x)||Object.assign(c,u),Object.assign(c,u.initProperties),u.options=Rh(f),s.update(c,u)}}function cv(e){return isNaN(e.x)||isNaN(e.y)}function fv(e,t,n){return n==="reset"||n==="none"||n==="resize"?rv:new pa(e,t)}function uv(e,t,n,i){const s=e.elements||(e.elements=[]);s.length=t.length;for(let o=0;o<t.length;o++){const r=t[o],a=r.properties,l=Eh(s,o,r.type,r.initProperties),c=n[r.optionScope].override(r);a.options=Rh(c),i.update(l,a)}}function Eh(e,t,n,i){const s=en[Sa(n)];let o=e[t];return(!o||!(o instanceof s))&&(o=e[t]=new s,Object.assign(o,i)),o}function Rh(e){const t=en[Sa(e.type)],n={};n.id=e.id,n.type=e.type,n.drawTime=e.drawTime,Object.assign(n,Dr(e,t.defaults),Dr(e,t.defaultRoutes));for(const i of av)n[i]=e[i];return n}function Dr(e,t){const n={};for(const i of Object.keys(t)){const s=t[i],o=e[i];Ar(i)&&kt(o)?n[i]=o.map(r=>Qc(r,s)):n[i]=Qc(o,s)}return n}function hv(e,t,n,i){return t.$context||(t.$context=Object.assign(Object.create(e.getContext()),{element:t,get elements(){return n.filter(s=>s&&s.options)},id:i.id,type:"annotation"}))}function dv(e,t){const n=t.length,i=e.length;if(i<n){const s=n-i;e.splice(i,0,...new Array(s))}else i>n&&e.splice(n,i-n);return e}var gv="3.1.0";const Xe=new Map,Zc=e=>e.type!=="doughnutLabel",pv=va.concat(Zs);var mv={id:"annotation",version:gv,beforeRegister(){Qx("chart.js","4.0",We.version)},afterRegister(){We.register(en)},afterUnregister(){We.unregister(en)},beforeInit(e){Xe.set(e,{annotations:[],elements:[],visibleElements:[],listeners:{},listened:!1,moveListened:!1,hooks:{},hooked:!1,hovered:[]})},beforeUpdate(e,t,n){const i=Xe.get(e),s=i.annotations=[];let o=n.annotations;st(o)?Object.keys(o).forEach(r=>{const a=o[r];st(a)&&(a.id=r,s.push(a))}):kt(o)&&s.push(...o),E0(s.filter(Zc),e.scales)},afterDataLimits(e,t){const n=Xe.get(e);D0(e,t.scale,n.annotations.filter(Zc).filter(i=>i.display&&i.adjustScaleRange))},afterUpdate(e,t,n){const i=Xe.get(e);P0(e,i,n),lv(e,i,n,t.mode),i.visibleElements=i.elements.filter(s=>!s.skip&&s.options.display),A0(e,i,n)},beforeDatasetsDraw(e,t,n){fi(e,"beforeDatasetsDraw",n.clip)},afterDatasetsDraw(e,t,n){fi(e,"afterDatasetsDraw",n.clip)},beforeDatasetDraw(e,t,n){fi(e,t.index,n.clip)},beforeDraw(e,t,n){fi(e,"beforeDraw",n.clip)},afterDraw(e,t,n){fi(e,"afterDraw",n.clip)},beforeEvent(e,t,n){const i=Xe.get(e);C0(i,t.event,n)&&(t.changed=!0)},afterDestroy(e){Xe.delete(e)},getAnnotations(e){const t=Xe.get(e);return t?t.elements:[]},_getAnnotationElementsAtEventForMode(e,t,n){return ba(e,t,n)},defaults:{animations:{numbers:{properties:["x","y","x2","y2","width","height","centerX","centerY","pointX","pointY","radius"],type:"number"},colors:{properties:["backgroundColor","borderColor"],type:"color"}},clip:!0,interaction:{mode:void 0,axis:void 0,intersect:void 0},common:{drawTime:"afterDatasetsDraw",init:!1,label:{}}},descriptors:{_indexable:!1,_scriptable:e=>!pv.includes(e)&&e!=="init",annotations:{_allKeys:!1,_fallback:(e,t)=>`elements.${en[Sa(t.type)].id}`},interaction:{_fallback:!0},common:{label:{_indexable:Ar,_fallback:!0},_indexable:Ar}},additionalOptionScopes:[""]};function fi(e,t,n){const{ctx:i,chartArea:s}=e,o=Xe.get(e);n&&Qi(i,s);const r=bv(o.visibleElements,t).sort((a,l)=>a.element.options.z-l.element.options.z);for(const a of r)yv(i,s,o,a);n&&Zi(i)}function bv(e,t){const n=[];for(const i of e)if(i.options.drawTime===t&&n.push({element:i,main:!0}),i.elements&&i.elements.length)for(const s of i.elements)s.options.display&&s.options.drawTime===t&&n.push({element:s});return n}function yv(e,t,n,i){const s=i.element;i.main?(Bc(n,s,"beforeDraw"),s.draw(e,t),Bc(n,s,"afterDraw")):s.draw(e,t)}const _v={class:"game-wrapper"},xv={key:0,class:"loading-overlay"},vv={key:1},wv={key:0,class:"countdown-overlay"},Sv={class:"info-bar"},Mv={class:"chart-container"},kv=60,vs=10,ws=3,Pv={__name:"GameView",setup(e){We.register(Qe,Ds,Mr,xx,Sr,hx,Ox,yx,mv);const t=Yx,n=bu(),i=Zr(),s=pt(n.query.name||"Player"),o=pt(n.query.difficulty||"Medium"),r=pt([]),a=pt(0),l=pt(10),c=pt(0),f=pt([]),u=pt("loading"),h=pt(3),d=pt(30),g=pt(null);let p=null,b=null;const _=pt(0),v=pt(!1),w=Ft(()=>{const $=d.value,V=Math.max(0,$-vs),j=_.value-ws;return Math.max(0,Math.min(j,V))}),S=Ft(()=>{const $=w.value+vs,V=d.value;return Math.min($,V)}),M=Ft(()=>{const V=d.value-vs+ws;let j;return _.value<ws?j=_.value:_.value<V?j=w.value+ws:j=_.value,j}),F=Ft(()=>{const $=d.value,V=_.value;if(console.log(`[TIMER_DEBUG] Calculating remaining time: total=${$}, current=${V}`),typeof $!="number"||isNaN($))return console.error("[TIMER_DEBUG] gameTotalTicks.value is invalid:",$),NaN;if(typeof V!="number"||isNaN(V))return console.error("[TIMER_DEBUG] visualCurrentTick.value is invalid:",V),NaN;const j=$-V;return Math.max(0,Math.ceil(j))});function D($,V,j){const E=[],N=V*j;for(let tt=0;tt<N;tt++){const nt=Math.min(Math.floor(tt/j),$.length-1),Pt=$[nt],Ot=tt/j;typeof Pt=="number"&&!isNaN(Pt)&&E.push({x:parseFloat(Ot.toFixed(2)),y:parseFloat(Pt.toFixed(2))})}const ct=parseFloat(V.toFixed(2)),_t=$[$.length-1];return typeof _t=="number"&&!isNaN(_t)&&(E.length===0||E[E.length-1].x!==ct?E.push({x:ct,y:parseFloat(_t.toFixed(2))}):E[E.length-1].y=parseFloat(_t.toFixed(2))),E}const L=pt([]),X={id:"toleranceFill",beforeDatasetsDraw($,V,j){const{ctx:E,chartArea:{left:N,right:ct,top:_t,bottom:tt},scales:{x:nt,y:Pt}}=$,Ot=$.data.datasets.find(T=>T.id==="targetLineId");if(!Ot||!Ot.data||Ot.data.length<1)return;E.save(),E.fillStyle=j.backgroundColor||"rgba(255, 200, 0, 0.2)";const Vt=j.toleranceValue,xt=Ot.data,k=[];xt.forEach((T,H)=>{const at=H>0?xt[H-1].y:T.y;k.push({x:T.x,y:Math.min(at+Vt,Pt.max)}),at!==T.y&&k.push({x:T.x,y:Math.min(T.y+Vt,Pt.max)})}),k.sort((T,H)=>T.x-H.x);const B=[];for(let T=xt.length-1;T>=0;T--){const H=xt[T],at=T>0?xt[T-1].y:H.y;at!==H.y&&B.push({x:H.x,y:Math.max(H.y-Vt,Pt.min)}),B.push({x:H.x,y:Math.max(at-Vt,Pt.min)})}B.sort((T,H)=>T.x-H.x),E.beginPath(),k.length>0&&E.moveTo(nt.getPixelForValue(k[0].x),Pt.getPixelForValue(k[0].y)),k.forEach(T=>{E.lineTo(nt.getPixelForValue(T.x),Pt.getPixelForValue(T.y))});for(let T=B.length-1;T>=0;T--){const H=B[T];E.lineTo(nt.getPixelForValue(H.x),Pt.getPixelForValue(H.y))}E.closePath(),E.fill(),E.restore()}};We.register(X);const Z=Ft(()=>{let $=[];const V=w.value,j=S.value,E=L.value.filter(tt=>tt.x>=V&&tt.x<=j);if(E.length>0&&E[0].x>V){const tt=L.value.slice().reverse().find(nt=>nt.x<V);tt?$.push({x:V,y:tt.y}):$.push({x:V,y:E[0].y})}if($.push(...E),$.length>0&&$[$.length-1].x<j){const tt=L.value.find(nt=>nt.x>j);tt?$.push({x:j,y:tt.y}):$.push({x:j,y:$[$.length-1].y})}const N=new Set;$=$.filter(tt=>{const nt=tt.x.toFixed(5);return N.has(nt)?!1:(N.add(nt),!0)}).sort((tt,nt)=>tt.x-nt.x);let ct=f.value.filter(tt=>tt.x>=w.value&&tt.x<=_.value);if(_.value>=0&&(ct.length===0||ct[ct.length-1].x<_.value)){const tt=d.value;_.value<=tt+.1&&ct.push({x:parseFloat(_.value.toFixed(2)),y:parseFloat(a.value.toFixed(2))})}const _t=new Set;return ct=ct.filter(tt=>{const nt=tt.x.toFixed(5);return _t.has(nt)?!1:(_t.add(nt),!0)}).sort((tt,nt)=>tt.x-nt.x),{labels:[],datasets:[{id:"targetLineId",label:"Target",data:$,borderColor:"orange",borderDash:[4,4],borderWidth:4,pointRadius:0,fill:!1,stepped:"before",tension:0,order:1},{label:"Input",data:ct,borderColor:"limegreen",borderWidth:4,pointRadius:0,fill:!1,tension:.2,stepped:!1,order:0}]}}),G=Ft(()=>({responsive:!0,maintainAspectRatio:!1,animation:{duration:0},parsing:!1,scales:{y:{min:0,max:60,ticks:{color:"black"},grid:{color:"rgba(0,0,0,0.1)"}},x:{min:w.value,max:S.value,type:"linear",ticks:{color:"black",callback:function($){return $%1===0?`${Math.floor($)}s`:null},maxTicksLimit:vs+1},grid:{color:"rgba(0,0,0,0.05)"}}},plugins:{legend:{labels:{color:"black",filter:$=>["Input","Target"].includes($.text),generateLabels:function($){const V=We.defaults.plugins.legend.labels.generateLabels($);return V.push({text:"Tolerance",fillStyle:"rgba(255, 200, 0, 0.2)",strokeStyle:"transparent",lineWidth:0,hidden:!1,datasetIndex:-1}),V}}},annotation:{annotations:{inputMarker:{type:"line",xMin:M.value,xMax:M.value+.001,borderColor:"rgb(0, 54, 69)",borderDash:[4,4],borderWidth:2,label:{display:!0,content:"You are here",color:"white",backgroundColor:"rgb(0, 54, 69)",font:{weight:"bold"},position:"start"}}}},toleranceFill:{backgroundColor:"rgba(255, 200, 0, 0.2)",toleranceValue:l.value}}}));function ot(){function $(V){var j;if(u.value!=="playing"){p&&(cancelAnimationFrame(p),p=null,console.log("[LOOP-STOP] runGameLoop: stopping animation frame."));return}if(b!==null){const E=(V-b)/1e3;_.value=Math.min(E,d.value)}if(u.value==="playing"&&typeof a.value=="number"&&_.value>=0){const E={x:_.value,y:a.value},N=f.value[f.value.length-1];if(!N||E.x>N.x){f.value.push({x:parseFloat(E.x.toFixed(3)),y:parseFloat(E.y.toFixed(2))});const ct=w.value-5;f.value=f.value.filter(_t=>_t.x>=ct)}else N&&E.x===N.x&&(N.y=parseFloat(E.y.toFixed(2)))}(j=g.value)!=null&&j.chart&&g.value.chart.update("none"),p=requestAnimationFrame($)}console.log("[LOOP-START] runGameLoop: Starting animation frame loop."),p=requestAnimationFrame($)}function decodeFrame($){const V=new DataView($);return V.byteLength<11||V.getUint8(0)!==1?(console.warn("Received unknown binary frame",$),null):{type:"tick",tickNumber:V.getUint16(1,!0),actual:V.getFloat32(3,!0),totalScore:V.getFloat32(7,!0)}}function bt(){const $=location.protocol==="https:"?"wss:":"ws:",V=location.host,j=new WebSocket(`${$}//${V}/ws/game/${s.value}/${o.value}?format=binary`);j.binaryType="arraybuffer",j.onopen=()=>{console.log("WebSocket opened.")},j.onmessage=E=>{const N=E.data instanceof ArrayBuffer?decodeFrame(E.data):JSON.parse(E.data);if(!N)return;if(N.type==="init"){console.log("Received 'init' message:",N),r.value=N.targetCurve,d.value=N.duration,N.toleranceCurve&&N.toleranceCurve.length>0&&(l.value=N.toleranceCurve[0],console.log(`[FRONTEND] Updated dynamicTolerance to: ${l.value}`)),a.value=0,c.value=0,_.value=0,v.value=!1,L.value=D(r.value,d.value,kv),u.value="countdown";const ct=setInterval(()=>{h.value--,console.log("Countdown:",h.value),h.value<=0&&(clearInterval(ct),u.value="playing",v.value=!0,console.log("Countdown finished, gameState set to playing. Starting runGameLoop."),j.readyState===WebSocket.OPEN&&(j.send(JSON.stringify({type:"start"})),console.log("Sent start signal to backend")),b=performance.now(),_.value=0,f.value=[{x:0,y:parseFloat(a.value.toFixed(2))}],console.log(`Game started at x=0 with initial value: ${a.value}`),ot())},1e3)}else if(N.type==="tick")v.value?(typeof N.actual=="number"&&(a.value=N.actual),typeof N.totalScore=="number"&&(c.value=N.totalScore)):(typeof N.actual=="number"&&(a.value=N.actual),console.log("Ignoring tick during countdown phase"));else if(N.type==="end"){console.log("Received 'end' message from backend:",N),u.value="ended",p&&(cancelAnimationFrame(p),p=null,console.log("[LOOP-STOP] Game ended: animation frame stopped."));const ct=Math.round(N.score||c.value);i.push({path:"/end",query:{score:ct,name:s.value,difficulty:o.value}}),j.readyState===WebSocket.OPEN&&(j.close(),console.log("WebSocket closed by frontend on game end."))}else console.warn("Received unknown WebSocket message type:",N.type,N)},j.onerror=E=>{console.error("WebSocket Error:",E)},j.onclose=E=>{console.warn("WebSocket Closed:",E)}}return qi(()=>{console.log("Component mounted. Connecting WebSocket."),bt()}),($,V)=>(Lt(),Xt("div",_v,[u.value==="loading"?(Lt(),Xt("div",xv,V[0]||(V[0]=[K("h1",null,"Loading PowerMatch…",-1)]))):(Lt(),Xt("div",vv,[u.value==="countdown"?(Lt(),Xt("div",wv,[K("h1",null,"Starting in "+Yt(h.value)+"…",1)])):Ws("",!0),K("div",Sv,[K("div",null,Yt(F.value)+"s",1),V[1]||(V[1]=K("h1",null,"PowerMatch",-1)),K("div",null,Yt(Math.round(c.value)),1)]),K("div",Mv,[te(ge(t),{ref_key:"chartRef",ref:g,data:Z.value,options:G.value},null,8,["data","options"])])]))]))}},Cv=ta(Pv,[["__scopeId","data-v-d5611372"]]),Ov={class:"logo-row"},Tv=["src"],Av={class:"card"},Dv={class:"message"},Ev={class:"score"},Rv={class:"difficulty"},Iv={key:0,class:"highlight"},Lv={key:1,class:"leaderboard"},Fv={class:"rank"},Hv={class:"entry"},zv={class:"score"},Bv={class:"logo-row"},Wv=["src"],jv={__name:"EndScreen",setup(e){const t=bu(),n=Zr(),i=pt(t.query.name||"Player"),s=pt(t.query.score||0),o=pt(t.query.difficulty||"Medium"),r=pt(null),a=pt(!1),l=pt(null),c=()=>{fetch("http://192.168.1.106/api/highscore").catch(h=>console.error("failed t call highscore API",h))},f=async()=>{try{const d=await(await fetch("/api/highscores")).json();r.value=d,a.value=[...d.alltime,...d.recent].some(g=>g.name===i.value&&g.score===+s.value),a.value&&c()}catch(h){console.error("Failed to fetch highscores:",h)}},u=()=>{n.push("/")};return qi(()=>{var h;f(),(h=l.value)==null||h.focus()}),(h,d)=>(Lt(),Xt("div",{class:"wrapper",onKeydown:hi(u,["enter"]),tabindex:"0"},[K("div",Ov,[K("img",{src:ge(yu),alt:"Logo links",class:"logo"},null,8,Tv)]),K("div",Av,[d[5]||(d[5]=K("h1",null,"Game Over",-1)),K("p",Dv,[d[0]||(d[0]=mn("Well done, ")),K("strong",null,Yt(i.value),1),d[1]||(d[1]=mn("!"))]),K("p",null,[d[2]||(d[2]=mn("Your score: ")),K("span",Ev,Yt(s.value),1)]),K("p",null,[d[3]||(d[3]=mn("Difficulty: ")),K("span",Rv,Yt(o.value),1)]),a.value?(Lt(),Xt("div",Iv," New High Score! ")):Ws("",!0),K("button",{ref_key:"playButton",ref:l,onClick:u},"Play Again",512),r.value?(Lt(),Xt("div",Lv,[d[4]||(d[4]=K("h2",null,"All-Time Top 5",-1)),K("ul",null,[(Lt(!0),Xt(ce,null,sr(r.value.alltime,(g,p)=>(Lt(),Xt("li",{key:"a"+p},[K("span",Fv,"#"+Yt(p+1),1),K("span",Hv,Yt(g.name),1),K("span",zv,Yt(g.score),1)]))),128))])])):Ws("",!0)]),K("div",Bv,[K("img",{src:ge(_u),alt:"Logo rechts",class:"logo"},null,8,Wv)])],32))}},Nv=ta(jv,[["__scopeId","data-v-bc65b2a5"]]),Vv=[{path:"/",component:wm},{path:"/game",component:Cv},{path:"/end",component:Nv}],$v=im({history:Rp(),routes:Vv}),Ih=tp(om);Ih.use($v);Ih.mount("#app");
@@ -2,108 +2,145 @@
 import asyncio
 from fastapi import WebSocket, WebSocketDisconnect
 from . engine import GameEngine
-from . db import SessionLocal
-from . score import Score
+from . score_writer import score_writer
 from datetime import datetime, timezone
-import traceback
-from . mqtt_input import input_queue, clear_input_queue # Import the shared queue
+import logging
+import os
+import time
+import uuid
+from . input_router import input_router
+from . import config
+from . import metrics
+from . import protocol
+from . replay import Recorder
+
+logger = logging.getLogger(__name__)
+
+SEND_LATENCY = metrics.histogram("powermatch_ws_send_seconds", "Time to send one tick message to the player's WebSocket")
+ACTIVE_SESSIONS = metrics.gauge("powermatch_sessions_active", "Game sessions currently running")
+SESSIONS = metrics.counter("powermatch_sessions_total", "Finished game sessions by outcome", ("outcome",))
 
 class GameRunner:
-    def __init__(self, name, difficulty, websocket, ws_manager):
+    def __init__(self, name, difficulty, websocket, ws_manager, station=None, watch_hub=None, wire_format=protocol.JSON):
         self.name = name
         self.difficulty = difficulty
         self.websocket = websocket
         self.ws_manager = ws_manager
-        print(f"[GAME_RUNNER_INIT] GameRunner initialized for {name} ({difficulty})") # Added debug
+        self.watch_hub = watch_hub  # BroadcastHub for spectators, optional
+        self.station = station  # MQTT topic or device ID to read from (None = any)
+        self.session_id = uuid.uuid4().hex[:12]
+        self.binary = wire_format == protocol.BINARY  # ticks as compact frames instead of JSON
+        logger.debug("GameRunner initialized for %s (%s)", name, difficulty)
 
     async def run_game_session(self):
-        print(f"[GAME_SESSION_START] Starting game session for {self.name}") # Added debug
-        engine = GameEngine(name=self.name, difficulty=self.difficulty, input_source=input_queue)
-
-        print(f"[DEBUG] Queue size before clear: {input_queue.qsize()}")
-        await clear_input_queue()
-        print(f"[DEBUG] Queue cleared. Size after clear: {input_queue.qsize()}")
+        logger.info("Starting game session %s for %s (%s)", self.session_id, self.name, self.difficulty)
+        engine = GameEngine(name=self.name, difficulty=self.difficulty)
 
         target, tolerance = engine.get_curve_preview()
         start_time = datetime.now(timezone.utc).timestamp()
-        print("[WS] Sending INIT to frontend")
+        logger.debug("Sending INIT to frontend")
 
-        await self.websocket.send_json({
+        init_message = {
             "type": "init",
+            "session": self.session_id,
             "targetCurve": target,
             "toleranceCurve": tolerance,
             "difficulty": self.difficulty,
             "seed": engine.seed,
-            "duration": len(target),
+            "duration": engine.duration,
+            "tickRate": engine.tick_rate,
+            "format": protocol.BINARY if self.binary else protocol.JSON,
             #"start_time": start_time frontend sets this
-        })
+        }
+        await self.websocket.send_json(init_message)
 
-        print("[WS] Waiting for 'start' signal from frontend...")
+        logger.debug("Waiting for 'start' signal from frontend...")
         start_received = False
         while not start_received:
             try:
                 message = await self.websocket.receive_json()
                 if message.get("type") == "start":
-                    print("[WS] Received 'start' signal. Commencing game ticks.")
+                    logger.debug("Received 'start' signal. Commencing game ticks.")
                     start_received = True
                 else:
-                    print(f"[WS] Received unexpected message type during wait for start: {message.get('type')}. Ignoring.")
+                    logger.warning("Unexpected message type %r while waiting for start, ignoring.", message.get("type"))
             except WebSocketDisconnect:
-                print(f"[WS_DISCONNECT] WebSocket disconnected while waiting for 'start' for {self.name}.")
+                logger.info("WebSocket disconnected while waiting for 'start' for %s.", self.name)
                 return # Exit the session if disconnected
             except Exception as e:
-                print(f"[WS_ERROR] Error receiving message while waiting for 'start': {e}")
-                traceback.print_exc()
+                logger.exception("Error receiving message while waiting for 'start': %s", e)
                 return # Exit the session on error
 
-        print("[WS] Started game loop (expecting ticks...)") # Added debug
+        # Fresh per-session queue: only samples from this session's station, nothing stale
+        engine.input_queue = input_router.open_session(self.session_id, source=self.station)
+        if config.RECORD_SESSIONS:
+            engine.recorder = Recorder.open(self.session_id, {
+                "name": self.name,
+                "difficulty": self.difficulty,
+                "seed": engine.seed,
+                "tick_rate": engine.tick_rate,
+                "duration": engine.duration,
+                "aggregate": engine.aggregate_name,
+                "filter": engine.filter_spec,
+                "curve_source": engine.curve_source,
+                "station": self.station,
+                "started_at": datetime.now(timezone.utc).isoformat(),
+            })
+        logger.debug("Started game loop for session %s (station: %s)", self.session_id, self.station or "any")
+        if self.watch_hub is not None:
+            self.watch_hub.open_session(
+                self.session_id,
+                {"name": self.name, "difficulty": self.difficulty, "station": self.station, "worker": os.getpid()},
+                {**init_message, "name": self.name},
+            )
 
+        ACTIVE_SESSIONS.inc()
+        outcome = "completed"
         try: # Wrap the game loop in a try-except to catch errors within it
             async for tick in engine.run():
-                print(f"[GAME_RUNNER_RECEIVED] Received tick from engine: {tick}") # DEBUG
+                logger.debug("Received tick from engine: %s", tick)
 
-                await self.websocket.send_json({
+                tick_message = {
                     "type": "tick",
                     "tickNumber": tick["tickNumber"],
                     "actual": tick["actual"],
                     "totalScore": tick["totalScore"]
-                })
+                }
+                if self.watch_hub is not None:
+                    self.watch_hub.publish(self.session_id, tick_message)  # non-blocking fan-out
+                sent = time.perf_counter()
+                if self.binary:
+                    await self.websocket.send_bytes(protocol.encode_tick(tick["tickNumber"], tick["actual"], tick["totalScore"]))
+                else:
+                    await self.websocket.send_json(tick_message)
+                SEND_LATENCY.observe(time.perf_counter() - sent)
         except Exception as e:
-            print(f"[GAME_LOOP_ERROR] An error occurred during the game loop: {e}")
-            traceback.print_exc()
+            outcome = "error"
+            logger.exception("An error occurred during the game loop: %s", e)
             # Decide how to handle this - perhaps send an error message to frontend
-        
-        print("[GAME_SESSION_END] Game loop finished or interrupted. Attempting to send END message.") # Added debug
-        await self.websocket.send_json({"type": "end", "score": engine.total_score})
-        print(f"[GAME_SESSION_END] END message sent. Final score: {engine.total_score}") # Added debug
+        finally:
+            ACTIVE_SESSIONS.dec()
+            SESSIONS.labels(outcome).inc()
+            input_router.close_session(self.session_id)
+            if engine.recorder is not None:
+                engine.recorder.close(total_score=engine.total_score)
+            if self.watch_hub is not None:
+                self.watch_hub.close_session(self.session_id, {"type": "end", "score": engine.total_score})
+            if engine.scheduler is not None:
+                logger.info("Session %s tick timing: %s", self.session_id, engine.scheduler.stats())
 
+        logger.debug("Game loop finished or interrupted. Sending END message.")
+        await self.websocket.send_json({"type": "end", "score": engine.total_score})
+        logger.debug("END message sent. Final score: %s", engine.total_score)
 
-        # Debugging output for DB save flow
-        print(f"[DB_FLOW] Game session for {self.name} ended. Proceeding to save score.")
-        print(f"[DB_FLOW] Final calculated score: {engine.total_score}") # Ensure score is not zero
 
-        # Save result to DB
-        db = SessionLocal()
-        try:
-            print("[DB_FLOW] Database session created.")
-            score_entry = Score(
-                name=self.name,
-                score=engine.total_score,
-                difficulty=self.difficulty,
-                seed=engine.seed,
-                # timestamp will be set automatically by SQLAlchemy if not provided,
-                # or ensure your model handles it
-            )
-            db.add(score_entry)
-            print("[DB_FLOW] Score entry added to session.")
-            db.commit()
-            print("[DB_SAVE_STATUS] Successfully saved score to database!") # Clear success message
-        except Exception as e:
-            db.rollback() # Important: rollback the session on error
-            print(f"[DB_SAVE_STATUS] DB SAVE FAILED for {self.name}: {e}") # Clear failure message
-            print(f"[DB_SAVE_STATUS] Full traceback for the DB error:")
-            traceback.print_exc() # Print full traceback for precise error
-        finally:
-            db.close()
-            print("[DB_FLOW] Database session closed.")
-            print("[GAME_RUNNER_EXIT] GameRunner run_game_session completed.") # Added debug
+        # Hand the result to the write-behind queue; the commit happens off the event loop
+        logger.info("Game session %s for %s ended. Queueing score %s for save.", self.session_id, self.name, engine.total_score)
+        score_writer.submit(
+            name=self.name,
+            score=engine.total_score,
+            difficulty=self.difficulty,
+            seed=engine.seed,
+            timestamp=datetime.now(timezone.utc),
+        )
+        logger.debug("GameRunner run_game_session completed.")
@@ -1,24 +1,56 @@
 # backend/routes/game_ws.py
-from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+import logging
+from typing import Optional
+from fastapi import APIRouter, Query, WebSocket, WebSocketDisconnect
 from . game_runner import GameRunner
-from . ws import WebSocketManager
+from . ws import WebSocketManager, BroadcastHub
+from . import metrics
+from . import protocol
 
+logger = logging.getLogger(__name__)
 router = APIRouter()
 ws_manager = WebSocketManager()
+watch_hub = BroadcastHub()
+
+metrics.callback("powermatch_player_connections", "Open player game WebSockets", lambda: len(ws_manager.active_connections))
+metrics.callback("powermatch_spectators", "Open spectator WebSockets", watch_hub.subscriber_count)
 
 # Define the WebSocket path to include name and difficulty as path parameters
+# Optional ?station=<topic or device ID> binds the session to one meter
+# Optional ?format=binary sends ticks as compact binary frames (see protocol.py)
 @router.websocket("/ws/game/{name}/{difficulty}")
-async def game_websocket(websocket: WebSocket, name: str, difficulty: str): # <--- name and difficulty are parameters
+async def game_websocket(websocket: WebSocket, name: str, difficulty: str, station: Optional[str] = None, format_: str = Query(protocol.JSON, alias="format")): # <--- name and difficulty are parameters
+    if format_ not in protocol.FORMATS:
+        await websocket.close(code=1008, reason=f"Unknown format {format_!r}")
+        return
     await ws_manager.connect(websocket)
     try:
 
-        runner = GameRunner(name=name, difficulty=difficulty, websocket=websocket, ws_manager=ws_manager)
+        runner = GameRunner(name=name, difficulty=difficulty, websocket=websocket, ws_manager=ws_manager, station=station, watch_hub=watch_hub, wire_format=format_)
         await runner.run_game_session()
 
     except WebSocketDisconnect:
-        print(f"WebSocket disconnected for {name} ({difficulty}).") # Added debug print
-        ws_manager.disconnect(websocket)
+        logger.info("WebSocket disconnected for %s (%s).", name, difficulty)
     except Exception as e:
-        print(f"WebSocket error for {name} ({difficulty}): {e}") # Added debug print
+        logger.exception("WebSocket error for %s (%s): %s", name, difficulty, e)
+    finally:
         ws_manager.disconnect(websocket)
 
+# Spectators: /ws/watch/<session id> follows one game, /ws/watch/all follows every game
+@router.websocket("/ws/watch/{session}")
+async def watch_websocket(websocket: WebSocket, session: str, format_: str = Query(protocol.JSON, alias="format")):
+    if format_ not in protocol.FORMATS:
+        await websocket.close(code=1008, reason=f"Unknown format {format_!r}")
+        return
+    subscriber = await watch_hub.subscribe(websocket, session, binary=format_ == protocol.BINARY)
+    try:
+        while True:
+            await websocket.receive_text()  # only used to notice the client going away
+    except (WebSocketDisconnect, RuntimeError):
+        pass
+    finally:
+        watch_hub.unsubscribe(subscriber)
+
+@router.get("/api/sessions")
+async def list_sessions():
+    return watch_hub.sessions()
\ No newline at end of file
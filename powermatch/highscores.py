@@ -1,30 +1,28 @@
-from fastapi import APIRouter
-from sqlalchemy.orm import Session
-from datetime import datetime, timedelta
-from . db import SessionLocal
-from . score import Score
+from typing import Optional
+from fastapi import APIRouter, Request, Response
+from fastapi.responses import JSONResponse
+import time
+from . leaderboard import leaderboard
+from . import metrics
 
 router = APIRouter()
 
-@router.get("/api/highscores")
-def get_highscores():
-    db: Session = SessionLocal()
-
-    now = datetime.utcnow()
-    day_ago = now - timedelta(hours=24)
+REQUESTS = metrics.counter("powermatch_highscores_requests_total", "Highscore requests by response status", ("status",))
+_OK = REQUESTS.labels(200)
+_NOT_MODIFIED = REQUESTS.labels(304)
+SNAPSHOT_SECONDS = metrics.histogram("powermatch_highscores_snapshot_seconds", "Time to produce a leaderboard snapshot")
 
-    alltime = db.query(Score).order_by(Score.score.desc()).limit(5).all()
-    recent = db.query(Score).filter(Score.timestamp >= day_ago).order_by(Score.score.desc()).limit(5).all()
+@router.get("/api/highscores")
+async def get_highscores(request: Request, difficulty: Optional[str] = None):
+    # Served from the in-memory leaderboard; kiosk polls revalidate with If-None-Match
+    started = time.perf_counter()
+    etag, payload = leaderboard.snapshot(difficulty)
+    SNAPSHOT_SECONDS.observe(time.perf_counter() - started)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
 
-    def to_dict(score):
-        return {
-            "name": score.name,
-            "score": round(score.score, 2),
-            "difficulty": score.difficulty,
-            "timestamp": score.timestamp.isoformat()
-        }
+    if request.headers.get("if-none-match") == etag:
+        _NOT_MODIFIED.inc()
+        return Response(status_code=304, headers=headers)
 
-    return {
-        "alltime": [to_dict(s) for s in alltime],
-        "recent": [to_dict(s) for s in recent]
-    }
+    _OK.inc()
+    return JSONResponse(payload, headers=headers)
@@ -0,0 +1,287 @@
+# powermatch/history.py
+# Score history for event organizers: keyset-paginated browsing, streaming NDJSON/CSV
+# export, and per-difficulty statistics kept up to date as the score writer commits.
+import base64
+import csv
+import io
+import json
+import math
+import threading
+from datetime import datetime
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Integer, and_, cast, func, or_
+from . db import SessionLocal
+from . leaderboard import _utc_naive
+from . score import Score
+
+router = APIRouter()
+
+PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+EXPORT_CHUNK = 500        # rows fetched from SQLite and written to the client per chunk
+PERCENTILES = (50, 75, 90, 99)
+STATS_BUCKET = 1.0        # histogram bucket width in points; /api/stats percentiles are within half of this
+EXPORT_FIELDS = ("id", "name", "score", "difficulty", "seed", "timestamp")
+
+
+def _row_dict(row):
+    return {
+        "id": row.id,
+        "name": row.name,
+        "score": round(row.score, 2),
+        "difficulty": row.difficulty,
+        "seed": row.seed,
+        "timestamp": row.timestamp.isoformat() if row.timestamp else None,
+    }
+
+
+class _Summary:
+    # count/sum/min/max and a histogram with STATS_BUCKET-wide buckets for one difficulty
+    __slots__ = ("count", "sum", "min", "max", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.buckets = {}  # int(score / STATS_BUCKET) -> count; same truncation as the startup query
+
+    def add(self, score):
+        self.count += 1
+        self.sum += score
+        self.min = min(self.min, score)
+        self.max = max(self.max, score)
+        index = int(score / STATS_BUCKET)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+
+    def percentile(self, pct):
+        # Nearest rank, reported as the middle of its bucket and kept within [min, max]
+        rank = max(1, math.ceil(pct / 100 * self.count))
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= rank:
+                return round(min(self.max, max(self.min, (bucket + 0.5) * STATS_BUCKET)), 2)
+        return self.max
+
+
+class ScoreStats:
+    """
+    Aggregate statistics over every stored score. Loaded at startup with a few GROUP BY
+    queries that SQLite answers from the difficulty indexes, then updated per committed
+    batch, so /api/stats never scans the database. Memory depends on the score range and
+    the number of days, not on the number of scores.
+    """
+
+    def __init__(self, session_factory=SessionLocal):
+        self.session_factory = session_factory
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._summaries = {}  # difficulty key -> _Summary
+        self._spellings = {}  # difficulty key -> difficulty values as stored ("Medium", ...)
+        self._daily = {}      # ISO date -> {difficulty key: count}
+
+    def rebuild(self):
+        summaries, spellings, daily = {}, {}, {}
+        bucket = cast(Score.score / STATS_BUCKET, Integer)
+        day = func.coalesce(func.date(Score.timestamp), func.date("now"))
+        db = self.session_factory()
+        try:
+            totals = db.query(Score.difficulty, func.count(), func.sum(Score.score), func.min(Score.score),
+                              func.max(Score.score)).group_by(Score.difficulty).all()
+            histogram = db.query(Score.difficulty, bucket, func.count()).group_by(Score.difficulty, bucket).all()
+            days = db.query(day, Score.difficulty, func.count()).group_by(day, Score.difficulty).all()
+        finally:
+            db.close()
+        for difficulty, count, total, low, high in totals:
+            key = difficulty.lower()
+            summary = summaries.setdefault(key, _Summary())  # spellings of one difficulty share a summary
+            summary.count += count
+            summary.sum += total
+            summary.min = min(summary.min, low)
+            summary.max = max(summary.max, high)
+            spellings.setdefault(key, set()).add(difficulty)
+        for difficulty, index, count in histogram:
+            buckets = summaries[difficulty.lower()].buckets
+            buckets[index] = buckets.get(index, 0) + count
+        for date, difficulty, count in days:
+            counts = daily.setdefault(date, {})
+            counts[difficulty.lower()] = counts.get(difficulty.lower(), 0) + count
+        with self._lock:
+            self._summaries, self._spellings, self._daily = summaries, spellings, daily
+            self._loaded = True
+
+    def add_rows(self, rows):
+        """on_commit hook for the score writer: rows are the committed field dicts."""
+        with self._lock:
+            for row in rows:
+                score, difficulty = row["score"], row["difficulty"]
+                key = difficulty.lower()
+                summary = self._summaries.get(key)
+                if summary is None:
+                    summary = self._summaries[key] = _Summary()
+                summary.add(score)
+                self._spellings.setdefault(key, set()).add(difficulty)
+                day = self._daily.setdefault(_utc_naive(row.get("timestamp")).date().isoformat(), {})
+                day[key] = day.get(key, 0) + 1
+
+    def spellings(self, difficulty):
+        """Stored spellings of a difficulty, so filters can match case-insensitively and still use the index."""
+        if not self._loaded:
+            self.rebuild()
+        with self._lock:
+            return sorted(self._spellings.get(difficulty.lower(), {difficulty}))
+
+    def snapshot(self, difficulty=None, days=None):
+        if not self._loaded:
+            self.rebuild()
+        key = difficulty.lower() if difficulty else None
+        with self._lock:
+            keys = [key] if key is not None else sorted(self._summaries)
+            per_difficulty = {}
+            for k in keys:
+                summary = self._summaries.get(k)
+                if summary is None or not summary.count:
+                    continue
+                per_difficulty[k] = {
+                    "count": summary.count,
+                    "mean": round(summary.sum / summary.count, 2),
+                    "min": summary.min,
+                    "max": summary.max,
+                    **{f"p{p}": summary.percentile(p) for p in PERCENTILES},
+                }
+
+            dates = sorted(self._daily)
+            if days is not None:
+                dates = dates[-days:]
+            daily = []
+            for day in dates:
+                counts = self._daily[day]
+                if key is not None:
+                    if key in counts:
+                        daily.append({"date": day, "count": counts[key]})
+                else:
+                    daily.append({"date": day, "count": sum(counts.values()), **counts})
+
+        return {
+            "total": sum(s["count"] for s in per_difficulty.values()),
+            "difficulties": per_difficulty,
+            "daily": daily,
+        }
+
+
+score_stats = ScoreStats()
+
+
+def _encode_cursor(row):
+    raw = json.dumps([row.timestamp.isoformat(), row.id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_cursor(cursor):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        timestamp, row_id = json.loads(raw)
+        return datetime.fromisoformat(timestamp), int(row_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _filtered(query, difficulty, name, since, until):
+    if difficulty:
+        query = query.filter(Score.difficulty.in_(score_stats.spellings(difficulty)))
+    if name:
+        query = query.filter(Score.name == name)
+    if since is not None:
+        query = query.filter(Score.timestamp >= _utc_naive(since))
+    if until is not None:
+        query = query.filter(Score.timestamp < _utc_naive(until))
+    return query
+
+
+@router.get("/api/scores")
+def list_scores(
+    difficulty: Optional[str] = None,
+    name: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    limit: int = Query(PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+):
+    # Newest first. Keyset pagination on (timestamp, id): every page costs the same however deep it is.
+    db = SessionLocal()
+    try:
+        query = _filtered(db.query(Score), difficulty, name, since, until).filter(Score.timestamp.isnot(None))
+        if cursor:
+            timestamp, row_id = _decode_cursor(cursor)
+            query = query.filter(or_(
+                Score.timestamp < timestamp,
+                and_(Score.timestamp == timestamp, Score.id < row_id),
+            ))
+        rows = query.order_by(Score.timestamp.desc(), Score.id.desc()).limit(limit + 1).all()
+    finally:
+        db.close()
+
+    more = len(rows) > limit
+    rows = rows[:limit]
+    return {
+        "items": [_row_dict(row) for row in rows],
+        "next": _encode_cursor(rows[-1]) if more else None,
+    }
+
+
+def _export_chunks(fmt, difficulty, name, since, until):
+    # Sync generator: Starlette pulls it from a worker thread, so the event loop never waits on SQLite
+    db = SessionLocal()
+    try:
+        query = _filtered(
+            db.query(Score.id, Score.name, Score.score, Score.difficulty, Score.seed, Score.timestamp),
+            difficulty, name, since, until,
+        ).order_by(Score.timestamp, Score.id).yield_per(EXPORT_CHUNK)
+
+        buffer = io.StringIO()
+        writer = csv.writer(buffer) if fmt == "csv" else None
+        if writer is not None:
+            writer.writerow(EXPORT_FIELDS)
+
+        pending = 0
+        for row in query:
+            if writer is not None:
+                writer.writerow((row.id, row.name, row.score, row.difficulty, row.seed,
+                                 row.timestamp.isoformat() if row.timestamp else ""))
+            else:
+                buffer.write(json.dumps(_row_dict(row)))
+                buffer.write("\n")
+            pending += 1
+            if pending >= EXPORT_CHUNK:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+                pending = 0
+        if buffer.tell():
+            yield buffer.getvalue()
+    finally:
+        db.close()
+
+
+@router.get("/api/scores/export")
+def export_scores(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    difficulty: Optional[str] = None,
+    name: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+):
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        _export_chunks(format, difficulty, name, since, until),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="powermatch-scores.{format}"'},
+    )
+
+
+@router.get("/api/stats")
+def get_stats(difficulty: Optional[str] = None, days: Optional[int] = Query(None, ge=1)):
+    return score_stats.snapshot(difficulty, days)
@@ -0,0 +1,103 @@
+# powermatch/input_router.py
+import asyncio
+from . import config
+from . import metrics
+
+DROP_OLDEST = "drop_oldest"
+DROP_NEWEST = "drop_newest"
+
+
+class SessionInputQueue(asyncio.Queue):
+    """Bounded input queue owned by a single game session."""
+
+    def __init__(self, session_id, source=None, maxsize=0, policy=DROP_OLDEST):
+        if policy not in (DROP_OLDEST, DROP_NEWEST):
+            raise ValueError(f"Unknown drop policy: {policy}")
+        super().__init__(maxsize=maxsize)
+        self.session_id = session_id
+        self.source = source
+        self.policy = policy
+        self.dropped = 0
+
+    def offer(self, value):
+        # Never blocks: a full queue sheds a sample according to the policy
+        if self.full():
+            self.dropped += 1
+            if self.policy == DROP_NEWEST:
+                return
+            self.get_nowait()
+        self.put_nowait(value)
+
+
+class InputRouter:
+    """
+    Routes power samples from MQTT topics / device IDs to per-session queues.
+
+    A session bound to a source (topic or device ID) only sees samples from that
+    source; a session opened without a source receives samples from every source.
+    Must only be used from the event loop thread.
+    """
+
+    def __init__(self, maxsize=None, policy=None):
+        self.maxsize = config.INPUT_QUEUE_SIZE if maxsize is None else maxsize
+        self.policy = policy or config.INPUT_DROP_POLICY
+        self._sessions = {}  # session_id -> SessionInputQueue
+        self._routes = {}    # source (None = any) -> set of SessionInputQueue
+        self.published = 0
+        self.dropped = 0     # samples shed by closed sessions' full queues
+
+    def open_session(self, session_id, source=None, maxsize=None, policy=None):
+        if session_id in self._sessions:
+            raise ValueError(f"Session {session_id} already has an input queue")
+        queue = SessionInputQueue(
+            session_id,
+            source=source,
+            maxsize=self.maxsize if maxsize is None else maxsize,
+            policy=policy or self.policy,
+        )
+        self._sessions[session_id] = queue
+        self._routes.setdefault(source, set()).add(queue)
+        return queue
+
+    def close_session(self, session_id):
+        queue = self._sessions.pop(session_id, None)
+        if queue is None:
+            return
+        self.dropped += queue.dropped
+        subscribers = self._routes.get(queue.source)
+        if subscribers is not None:
+            subscribers.discard(queue)
+            if not subscribers:
+                del self._routes[queue.source]
+
+    def publish(self, value, topic=None, device_id=None):
+        self.published += 1
+        delivered = 0
+        keys = {topic, device_id, None}  # each queue is registered under exactly one key
+        for key in keys:
+            subscribers = self._routes.get(key)
+            if not subscribers:
+                continue
+            for queue in subscribers:
+                queue.offer(value)
+                delivered += 1
+        return delivered
+
+    def session_count(self):
+        return len(self._sessions)
+
+    def dropped_total(self):
+        # Closed sessions plus whatever open queues have shed so far
+        return self.dropped + sum(q.dropped for q in self._sessions.values())
+
+    def queue_depth(self):
+        return sum(q.qsize() for q in self._sessions.values())
+
+
+# Shared router for the MQTT handler and all game sessions
+input_router = InputRouter()
+
+metrics.callback("powermatch_input_samples_total", "Samples published to the input router", lambda: input_router.published, kind="counter")
+metrics.callback("powermatch_input_dropped_total", "Samples shed by full session input queues", input_router.dropped_total, kind="counter")
+metrics.callback("powermatch_input_queue_depth", "Samples waiting in all session input queues", input_router.queue_depth)
+metrics.callback("powermatch_input_sessions", "Sessions with an open input queue", input_router.session_count)
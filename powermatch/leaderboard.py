@@ -0,0 +1,142 @@
+# powermatch/leaderboard.py
+# In-memory top-N index behind /api/highscores, rebuilt from the DB at startup
+# and updated incrementally whenever the score writer commits.
+import heapq
+import threading
+import uuid
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from . db import SessionLocal
+from . score import Score
+
+
+def _utc_naive(ts):
+    # SQLite hands back naive UTC datetimes; keep everything in that form
+    if ts is None:
+        return datetime.utcnow()
+    if ts.tzinfo is not None:
+        ts = ts.astimezone(timezone.utc).replace(tzinfo=None)
+    return ts
+
+
+class _Entry:
+    __slots__ = ("name", "score", "difficulty", "timestamp", "sort_key")
+
+    def __init__(self, name, score, difficulty, timestamp):
+        self.name = name
+        self.score = score
+        self.difficulty = difficulty
+        self.timestamp = _utc_naive(timestamp)
+        self.sort_key = (-score, self.timestamp)  # best first, earlier wins ties
+
+    def to_dict(self):
+        return {
+            "name": self.name,
+            "score": round(self.score, 2),
+            "difficulty": self.difficulty,
+            "timestamp": self.timestamp.isoformat()
+        }
+
+
+class Leaderboard:
+    def __init__(self, size=5, window=timedelta(hours=24), session_factory=SessionLocal):
+        self.size = size
+        self.window = window
+        self.session_factory = session_factory
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._epoch = uuid.uuid4().hex[:8]  # keeps ETags unique across restarts
+        self._version = 0
+        self._alltime = {}       # difficulty key (None = overall) -> best entries, sorted
+        self._recent = deque()   # every entry inside the window, oldest first
+        self._cache = {}         # difficulty key -> (version, etag, payload)
+
+    def rebuild(self):
+        db = self.session_factory()
+        try:
+            day_ago = datetime.utcnow() - self.window
+            alltime = {None: db.query(Score).order_by(Score.score.desc()).limit(self.size).all()}
+            for (difficulty,) in db.query(Score.difficulty).distinct():
+                # "Medium" and "medium" share a board: merge each spelling's top N, trimmed below
+                alltime.setdefault(difficulty.lower(), []).extend(
+                    db.query(Score)
+                    .filter(Score.difficulty == difficulty)
+                    .order_by(Score.score.desc())
+                    .limit(self.size)
+                    .all()
+                )
+            recent = db.query(Score).filter(Score.timestamp >= day_ago).order_by(Score.timestamp).all()
+
+            with self._lock:
+                self._alltime = {
+                    key: sorted((_Entry(s.name, s.score, s.difficulty, s.timestamp) for s in rows), key=lambda e: e.sort_key)[:self.size]
+                    for key, rows in alltime.items()
+                }
+                self._recent = deque(_Entry(s.name, s.score, s.difficulty, s.timestamp) for s in recent)
+                self._loaded = True
+                self._bump()
+        finally:
+            db.close()
+
+    def add_rows(self, rows):
+        """on_commit hook for the score writer: rows are the committed field dicts."""
+        with self._lock:
+            for row in rows:
+                self._add(_Entry(row["name"], row["score"], row["difficulty"], row.get("timestamp")))
+            self._bump()
+
+    def add(self, name, score, difficulty, timestamp=None):
+        with self._lock:
+            self._add(_Entry(name, score, difficulty, timestamp))
+            self._bump()
+
+    def snapshot(self, difficulty=None):
+        """Return (etag, payload) for the overall or per-difficulty board."""
+        if not self._loaded:
+            self.rebuild()
+        key = difficulty.lower() if difficulty else None
+        with self._lock:
+            self._expire()
+            cached = self._cache.get(key)
+            if cached is not None and cached[0] == self._version:
+                return cached[1], cached[2]
+
+            recent = self._recent if key is None else [e for e in self._recent if e.difficulty.lower() == key]
+            payload = {
+                "alltime": [e.to_dict() for e in self._alltime.get(key, [])],
+                "recent": [e.to_dict() for e in heapq.nsmallest(self.size, recent, key=lambda e: e.sort_key)]
+            }
+            etag = f'"{self._epoch}-{self._version}"'
+            self._cache[key] = (self._version, etag, payload)
+            return etag, payload
+
+    def _add(self, entry):
+        for key in (None, entry.difficulty.lower()):
+            best = self._alltime.setdefault(key, [])
+            if len(best) < self.size or entry.sort_key < best[-1].sort_key:
+                best.append(entry)
+                best.sort(key=lambda e: e.sort_key)
+                del best[self.size:]
+        # Writer batches arrive in submission order, so this is almost always an append
+        if not self._recent or self._recent[-1].timestamp <= entry.timestamp:
+            self._recent.append(entry)
+        else:
+            items = sorted([*self._recent, entry], key=lambda e: e.timestamp)
+            self._recent = deque(items)
+
+    def _expire(self):
+        cutoff = datetime.utcnow() - self.window
+        expired = False
+        while self._recent and self._recent[0].timestamp < cutoff:
+            self._recent.popleft()
+            expired = True
+        if expired:
+            self._bump()
+
+    def _bump(self):
+        self._version += 1
+        self._cache.clear()
+
+
+# Shared index used by the highscores route
+leaderboard = Leaderboard()
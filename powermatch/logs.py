@@ -0,0 +1,107 @@
+# powermatch/logs.py
+# Leveled logging for the "powermatch.*" loggers. Records are handed to a queue and
+# written by a background thread, so a slow console never blocks the event loop.
+import atexit
+import hmac
+import logging
+import logging.handlers
+import queue
+from typing import Optional
+from fastapi import APIRouter, Header, HTTPException
+from . import config
+
+ROOT_LOGGER = "powermatch"
+LOG_FORMAT = "%(asctime)s %(levelname)-7s %(name)s: %(message)s"
+
+router = APIRouter()
+_listener = None
+
+
+def _logger_name(module):
+    # Accept "engine", "powermatch.engine" or "" (the package root)
+    if not module or module == ROOT_LOGGER:
+        return ROOT_LOGGER
+    if module.startswith(ROOT_LOGGER + "."):
+        return module
+    return f"{ROOT_LOGGER}.{module}"
+
+
+def _parse_level(level):
+    value = logging.getLevelName(str(level).upper())
+    if not isinstance(value, int):
+        raise ValueError(f"Unknown log level: {level}")
+    return value
+
+
+def parse_module_levels(spec):
+    """Parse "engine=DEBUG,mqtt_input=WARNING" into {"engine": "DEBUG", ...}."""
+    levels = {}
+    for part in (spec or "").split(","):
+        if "=" in part:
+            module, level = part.split("=", 1)
+            levels[module.strip()] = level.strip()
+    return levels
+
+
+def configure_logging(level=None, module_levels=None):
+    """Install the queue-backed handler on the package logger (idempotent)."""
+    global _listener
+    root = logging.getLogger(ROOT_LOGGER)
+    root.setLevel(_parse_level(level or config.LOG_LEVEL))
+    for module, module_level in (module_levels or parse_module_levels(config.LOG_LEVELS)).items():
+        set_level(module, module_level)
+
+    if _listener is not None:
+        return root
+
+    records = queue.SimpleQueue()
+    console = logging.StreamHandler()
+    console.setFormatter(logging.Formatter(LOG_FORMAT))
+    _listener = logging.handlers.QueueListener(records, console, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+
+    root.addHandler(logging.handlers.QueueHandler(records))
+    root.propagate = False  # uvicorn configures the root logger separately
+    return root
+
+
+def shutdown_logging():
+    global _listener
+    if _listener is not None:
+        _listener.stop()  # drains whatever is still queued
+        _listener = None
+
+
+def set_level(module, level):
+    logging.getLogger(_logger_name(module)).setLevel(_parse_level(level))
+
+
+def get_levels():
+    levels = {}
+    for name, logger in logging.Logger.manager.loggerDict.items():
+        if name == ROOT_LOGGER or name.startswith(ROOT_LOGGER + "."):
+            if isinstance(logger, logging.Logger):
+                levels[name] = logging.getLevelName(logger.getEffectiveLevel())
+    return dict(sorted(levels.items()))
+
+
+@router.get("/api/logging")
+async def read_log_levels():
+    return get_levels()
+
+
+@router.put("/api/logging")
+async def update_log_level(level: str, module: Optional[str] = None,
+                           x_powermatch_token: Optional[str] = Header(None)):
+    # e.g. PUT /api/logging?module=engine&level=DEBUG with header X-PowerMatch-Token.
+    # CORS allows every origin, so without a token any web page could flip the server to DEBUG.
+    if not config.LOG_ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Runtime log level changes are disabled (set POWERMATCH_LOG_ADMIN_TOKEN)")
+    if not x_powermatch_token or not hmac.compare_digest(x_powermatch_token, config.LOG_ADMIN_TOKEN):
+        raise HTTPException(status_code=403, detail="Invalid or missing X-PowerMatch-Token")
+    try:
+        set_level(module, level)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return get_levels()
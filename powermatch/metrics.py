@@ -0,0 +1,253 @@
+# powermatch/metrics.py
+# Minimal Prometheus-style metrics, rendered in the text exposition format on /metrics.
+# Updates are plain attribute arithmetic so they are cheap enough for per-tick and
+# per-sample paths; values other modules already track are read at scrape time instead.
+# Each metric should be updated from one thread only (the event loop, unless noted).
+import math
+from bisect import bisect_left
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds; tuned for tick lag and send latency on a Pi (sub-millisecond to a full tick)
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+
+def _format_value(value):
+    if value == math.inf:
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names, values, extra=None):
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra is not None:
+        pairs.append(f'{extra[0]}="{extra[1]}"')
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name, help, labelnames=()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._children = {}
+
+    def labels(self, *values):
+        # Look a child up once and keep a reference to it on hot paths
+        values = tuple(str(v) for v in values)
+        child = self._children.get(values)
+        if child is None:
+            child = self._children[values] = self._new_child()
+        return child
+
+    def _samples(self):
+        if not self.labelnames:
+            yield from self._child_samples((), self._self_child())
+            return
+        for values, child in list(self._children.items()):
+            yield from self._child_samples(values, child)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        lines += [f"{name}{labels} {_format_value(value)}" for name, labels, value in self._samples()]
+        return "\n".join(lines)
+
+
+class _Value:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0.0
+
+
+class _Unlabeled:
+    # Stands in for the unlabeled value of a labeled metric, so updates without labels() fail loudly
+    __slots__ = ("name",)
+
+    def __init__(self, name):
+        self.name = name
+
+    def _fail(self, *args):
+        raise ValueError(f"{self.name} has labels; update it through labels(...)")
+
+    value = property(_fail, _fail)
+    observe = _fail
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name, help, labelnames=()):
+        super().__init__(name, help, labelnames)
+        self._value = _Unlabeled(name) if self.labelnames else _Value()
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def _self_child(self):
+        return self._value
+
+    def inc(self, amount=1):
+        self._value.value += amount
+
+    def _child_samples(self, values, child):
+        yield self.name, _format_labels(self.labelnames, values), child.value
+
+
+class _CounterChild(_Value):
+    __slots__ = ()
+
+    def inc(self, amount=1):
+        self.value += amount
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def _new_child(self):
+        return _GaugeChild()
+
+    def set(self, value):
+        self._value.value = value
+
+    def dec(self, amount=1):
+        self._value.value -= amount
+
+
+class _GaugeChild(_CounterChild):
+    __slots__ = ()
+
+    def set(self, value):
+        self.value = value
+
+    def dec(self, amount=1):
+        self.value -= amount
+
+
+class _HistogramChild:
+    __slots__ = ("upper_bounds", "counts", "sum")
+
+    def __init__(self, upper_bounds):
+        self.upper_bounds = upper_bounds
+        self.counts = [0] * (len(upper_bounds) + 1)  # last slot is +Inf
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.upper_bounds, value)] += 1
+        self.sum += value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, help, labelnames=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.upper_bounds = tuple(sorted(buckets))
+        self._value = _Unlabeled(name) if self.labelnames else _HistogramChild(self.upper_bounds)
+
+    def _new_child(self):
+        return _HistogramChild(self.upper_bounds)
+
+    def _self_child(self):
+        return self._value
+
+    def observe(self, value):
+        self._value.observe(value)
+
+    def _child_samples(self, values, child):
+        cumulative = 0
+        for bound, count in zip((*self.upper_bounds, math.inf), child.counts):
+            cumulative += count
+            yield f"{self.name}_bucket", _format_labels(self.labelnames, values, ("le", _format_value(float(bound)))), cumulative
+        labels = _format_labels(self.labelnames, values)
+        yield f"{self.name}_sum", labels, child.sum
+        yield f"{self.name}_count", labels, cumulative
+
+
+class CallbackMetric(_Metric):
+    """Reads its value(s) at scrape time: fn() returns a number, or {label values tuple: number}."""
+
+    def __init__(self, name, help, fn, kind="gauge", labelnames=()):
+        super().__init__(name, help, labelnames)
+        self.kind = kind
+        self.fn = fn
+
+    def _samples(self):
+        result = self.fn()
+        if not isinstance(result, dict):
+            yield self.name, "", result
+            return
+        for values, value in result.items():
+            yield self.name, _format_labels(self.labelnames, values), value
+
+
+class RelayedMetric(_Metric):
+    """A metric rendered by another process (see Registry.export), shown here as-is."""
+
+    def __init__(self, name, text):
+        super().__init__(name, "")
+        self.text = text
+
+    def render(self):
+        return self.text
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = {}
+
+    def register(self, metric):
+        # Re-registering a name replaces it (e.g. a new MQTT handler after a restart in tests)
+        self._metrics[metric.name] = metric
+        return metric
+
+    def get(self, name):
+        return self._metrics.get(name)
+
+    def export(self, prefix):
+        # Rendered text of every metric whose name starts with prefix, for relay()
+        return {name: metric.render() for name, metric in list(self._metrics.items()) if name.startswith(prefix)}
+
+    def relay(self, rendered):
+        for name, text in rendered.items():
+            metric = self._metrics.get(name)
+            if isinstance(metric, RelayedMetric):
+                metric.text = text
+            else:
+                self.register(RelayedMetric(name, text))
+
+    def render(self):
+        parts = []
+        for metric in list(self._metrics.values()):
+            try:
+                parts.append(metric.render())
+            except Exception as e:  # a broken callback must not take the whole endpoint down
+                parts.append(f"# {metric.name} unavailable: {_escape(e)}")
+        return "\n".join(parts) + "\n"
+
+
+registry = Registry()
+
+
+def counter(name, help, labelnames=()):
+    return registry.register(Counter(name, help, labelnames))
+
+
+def gauge(name, help, labelnames=()):
+    return registry.register(Gauge(name, help, labelnames))
+
+
+def histogram(name, help, labelnames=(), buckets=LATENCY_BUCKETS):
+    return registry.register(Histogram(name, help, labelnames, buckets))
+
+
+def callback(name, help, fn, kind="gauge", labelnames=()):
+    return registry.register(CallbackMetric(name, help, fn, kind, labelnames))
@@ -1,57 +1,270 @@
 import paho.mqtt.client as mqtt
 import asyncio
 import json
+import logging
+import re
+import threading
+import time
+from collections import deque
+from . import config
+from . input_router import input_router
+from . startup import readiness
+from . import metrics
 
-# Shared queue for real-time power input
-input_queue = asyncio.Queue()
+logger = logging.getLogger(__name__)
+
+# Updated from paho's network thread only
+MESSAGES = metrics.counter("powermatch_mqtt_messages_total", "MQTT messages received, by parse result", ("result",))
+_PARSED = MESSAGES.labels("parsed")
+_IGNORED = MESSAGES.labels("ignored")
+_ERRORS = MESSAGES.labels("error")
+HANDOFF_DROPPED = metrics.counter("powermatch_mqtt_handoff_dropped_total", "Samples discarded because the MQTT-to-loop handoff buffer was full")
+CONNECTED = metrics.gauge("powermatch_mqtt_connected", "1 while the MQTT client is connected to the broker")
+
+RECONNECTS = metrics.counter("powermatch_mqtt_connects_total", "Successful MQTT connections, including reconnects")
+CONNECT_FAILURES = metrics.counter("powermatch_mqtt_connect_failures_total", "MQTT connection attempts that failed or were refused")
+
+# Connection states reported by MQTTInputHandler.health()
+STOPPED = "stopped"
+CONNECTING = "connecting"
+CONNECTED_STATE = "connected"
+DISCONNECTED = "disconnected"
 
 class MQTTInputHandler:
-    def __init__(self, loop: asyncio.AbstractEventLoop):
-        self.broker = "raspberrypi.local"  # Change to correct MQTT broker address
-        self.topic = "Strommessung_PowerMatch/events/rpc" # Change to correct MQTT topic
+    """
+    Subscribes to the meter topics and hands parsed samples to the router. Connecting never
+    blocks the caller: paho's network thread connects in the background, retries with
+    exponential backoff and moves on to the next configured broker when an attempt fails.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, router=None, broker=None, port=None, topic=None,
+                 brokers=None, topics=None):
+        # Explicit arguments win over POWERMATCH_MQTT_BROKERS / POWERMATCH_MQTT_TOPICS
+        if broker is not None:
+            brokers = [(broker, port or config.MQTT_PORT)]
+        self.brokers = list(brokers or config.mqtt_brokers())
+        self.topics = [topic] if topic is not None else list(topics or config.mqtt_topics())
         self.client = mqtt.Client()
+        self.client.reconnect_delay_set(config.MQTT_RECONNECT_MIN, config.MQTT_RECONNECT_MAX)
         self.loop = loop  # store loop explicitly
+        self.router = router or input_router
+        self.on_status = None  # called on the loop with health() after every connection event
+
+        # Samples parsed on the paho thread wait here until the loop drains them in one batch
+        self._pending = deque(maxlen=config.MQTT_HANDOFF_SIZE)
+        self._lock = threading.Lock()
+        self._drain_scheduled = False
+
+        # Connection health; written on paho's thread
+        self._broker_index = 0
+        self._stopping = False
+        self.state = STOPPED
+        self.connected_since = None
+        self.connects = 0
+        self.failures = 0
+        self.last_error = None
+
+        # Ingestion counters
+        self.received = 0
+        self.parsed = 0
+        self.ignored = 0
+        self.errors = 0
+        self.dropped = 0
+        self.batches = 0
+
+    @property
+    def broker(self):
+        host, port = self.brokers[self._broker_index]
+        return f"{host}:{port}"
 
     def start(self):
         self.client.on_connect = self._on_connect
+        self.client.on_connect_fail = self._on_connect_fail
         self.client.on_message = self._on_message
-        self.client.connect(self.broker, 1883, 60)
+        self.client.on_disconnect = self._on_disconnect
+        self._stopping = False
+        self._set_state(CONNECTING, f"connecting to {self.broker}")
+        host, port = self.brokers[self._broker_index]
+        self.client.connect_async(host, port, config.MQTT_KEEPALIVE)  # no DNS lookup or socket here
         self.client.loop_start()
-        print(f"MQTT connecting to {self.broker} and subscribing to {self.topic}")
+        logger.info("MQTT connecting to %s and subscribing to %s", ", ".join(f"{h}:{p}" for h, p in self.brokers),
+                    ", ".join(self.topics))
+
+    def stop(self):
+        self._stopping = True
+        self.client.disconnect()
+        self.client.loop_stop()
+        self._set_state(STOPPED, "stopped")
+
+    def _next_broker(self):
+        # Event loop, scheduled by _failed so that paho's callbacks never re-enter connect_async.
+        # The next reconnect attempt (after the backoff delay) goes to the next broker.
+        if self._stopping or self.state == CONNECTED_STATE:
+            return
+        self._broker_index = (self._broker_index + 1) % len(self.brokers)
+        host, port = self.brokers[self._broker_index]
+        self.client.connect_async(host, port, config.MQTT_KEEPALIVE)
 
     def _on_connect(self, client, userdata, flags, rc):
-        client.subscribe(self.topic)
-        print("MQTT connected")
+        if rc != 0:
+            self._failed(f"{self.broker} refused connection ({mqtt.connack_string(rc)})")
+            return
+        client.subscribe([(topic, 0) for topic in self.topics])  # again after every reconnect: clean session
+        self.connects += 1
+        RECONNECTS.inc()
+        CONNECTED.set(1)
+        self.connected_since = time.time()
+        self._set_state(CONNECTED_STATE, f"{self.broker}, topics {', '.join(self.topics)}")
+        logger.info("MQTT connected to %s", self.broker)
+
+    def _on_connect_fail(self, client, userdata):
+        self._failed(f"{self.broker} not reachable")
+
+    def _failed(self, reason):
+        self.failures += 1
+        CONNECT_FAILURES.inc()
+        self.last_error = reason
+        self._set_state(CONNECTING, f"{reason}; retrying")
+        if self.failures == 1 or self.failures % 10 == 0:
+            logger.warning("MQTT connection failed: %s (attempt %d); retrying", reason, self.failures)
+        if len(self.brokers) > 1:
+            try:
+                self.loop.call_soon_threadsafe(self._next_broker)
+            except RuntimeError:
+                pass  # loop already closed during shutdown
+
+    def _on_disconnect(self, client, userdata, rc):
+        CONNECTED.set(0)
+        self.connected_since = None
+        if self._stopping or self.state != CONNECTED_STATE:
+            return  # shutdown, or a refused attempt being closed: already handled
+        self.last_error = f"disconnected from {self.broker} (rc={rc})"
+        self._set_state(DISCONNECTED, f"{self.last_error}; reconnecting")
+        logger.warning("MQTT disconnected from %s (rc=%s); reconnecting", self.broker, rc)
+
+    def _set_state(self, state, detail):
+        self.state = state
+        readiness.set("mqtt", state == CONNECTED_STATE, detail)
+        if self.on_status is not None:
+            try:
+                self.loop.call_soon_threadsafe(self.on_status, self.health())
+            except RuntimeError:
+                pass  # loop already closed during shutdown
+
+    def health(self):
+        return {
+            "state": self.state,
+            "broker": self.broker,
+            "brokers": [f"{h}:{p}" for h, p in self.brokers],
+            "topics": self.topics,
+            "connected_since": self.connected_since,
+            "connects": self.connects,
+            "failures": self.failures,
+            "last_error": self.last_error,
+            **self.stats(),
+        }
 
     def _on_message(self, client, userdata, msg):
-        print(f"[MQTT] Received message on topic {msg.topic}: {msg.payload.decode()}")
+        # Runs on paho's network thread: parse, then coalesce into the pending batch
+        self.received += 1
+        payload = msg.payload
+        logger.debug("Received message on topic %s: %s", msg.topic, payload)
 
         try:
-            decoded = msg.payload.decode()
-            payload = json.loads(decoded)
-            params = payload.get("params", {})
-            em_data = params.get("em:0", {})
-            watt_value = em_data.get("c_act_power")
-
-            if watt_value is not None:
-                self.loop.call_soon_threadsafe(
-                    asyncio.create_task, input_queue.put(watt_value)
-                )
-                print(f"[MQTT] Queued power: {watt_value}W")
-            else:
-                print("[MQTT] Wattage key not found in reader_data.")
-
+            watt_value, device_id = parse_power(payload)
         except Exception as e:
-            print(f"[MQTT] Failed to parse message: {e}")
+            self.errors += 1
+            _ERRORS.inc()
+            logger.warning("Failed to parse message: %s", e)
+            return
 
+        if watt_value is None:
+            self.ignored += 1
+            _IGNORED.inc()
+            logger.debug("Wattage key not found in payload.")
+            return
 
+        self.parsed += 1
+        _PARSED.inc()
+        with self._lock:
+            if len(self._pending) == self._pending.maxlen:
+                self.dropped += 1  # the deque discards the oldest sample
+                HANDOFF_DROPPED.inc()
+            self._pending.append((watt_value, msg.topic, device_id))
+            schedule = not self._drain_scheduled
+            self._drain_scheduled = True
 
-async def clear_input_queue():
-    cleared = 0
-    while not input_queue.empty():
-        try:
-            input_queue.get_nowait()
-            cleared += 1
-        except asyncio.QueueEmpty:
-            break
-    print(f"[MQTT] Cleared {cleared} old input(s) from queue.")
+        if schedule:
+            # One loop wakeup per batch instead of one task per message
+            try:
+                self.loop.call_soon_threadsafe(self._drain)
+            except RuntimeError:
+                pass  # loop already closed during shutdown
+
+    def _drain(self):
+        # Runs on the event loop thread
+        with self._lock:
+            batch = list(self._pending)
+            self._pending.clear()
+            self._drain_scheduled = False
+        self.batches += 1
+        publish = self.router.publish
+        for watt_value, topic, device_id in batch:
+            publish(watt_value, topic, device_id)
+
+    def stats(self):
+        return {
+            "received": self.received,
+            "parsed": self.parsed,
+            "ignored": self.ignored,
+            "errors": self.errors,
+            "dropped": self.dropped,
+            "batches": self.batches,
+            "pending": len(self._pending),
+        }
+
+
+# Shelly RPC events look like {"src": "<device>", "params": {"em:0": {"c_act_power": 12.3, ...}}}.
+# The fast path pulls both values straight out of the bytes, but only for exactly that layout:
+#   - "params" is a top-level key with nothing but scalar members before it,
+#   - "em:0" is a direct member of params and "c_act_power" a direct member of em:0
+#     (no object opens or closes in between),
+#   - "src", if present, is the first top-level key, holds a plain string and occurs once.
+# Anything else (nested "src", em:1 only, escapes, unusual nesting) goes through json.
+_POWER_KEY = b'"c_act_power"'
+_SRC_KEY = b'"src"'
+_PARAMS_KEY = b'"params"'
+_LAYOUT_RE = re.compile(
+    rb'"params"\s*:\s*\{[^{}]*"em:0"\s*:\s*\{[^{}]*"c_act_power"\s*:\s*(-?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?)\s*[,}]'
+)
+_SRC_RE = re.compile(rb'\s*\{\s*"src"\s*:\s*"([^"\\]*)"')
+
+
+def parse_power(payload):
+    """Return (c_act_power of em:0, device id) from a raw MQTT payload; power is None if absent."""
+    if _POWER_KEY not in payload:
+        return None, None
+    result = _parse_power_fast(payload)
+    return result if result is not None else _parse_power_json(payload)
+
+
+def _parse_power_fast(payload):
+    params = payload.find(_PARAMS_KEY)
+    if params == -1 or payload.count(b"{", 0, params) != 1 or payload.find(b"}", 0, params) != -1:
+        return None
+    match = _LAYOUT_RE.match(payload, params)
+    if match is None:
+        return None
+    device_id = None
+    if _SRC_KEY in payload:
+        src = _SRC_RE.match(payload)
+        if src is None or payload.count(_SRC_KEY) != 1:
+            return None
+        device_id = src.group(1).decode()
+    return float(match.group(1)), device_id
+
+
+def _parse_power_json(payload):
+    data = json.loads(payload)
+    watt_value = data.get("params", {}).get("em:0", {}).get("c_act_power")
+    return watt_value, data.get("src")  # Shelly RPC events carry the device ID in "src"
@@ -0,0 +1,30 @@
+# powermatch/protocol.py
+# Opt-in compact wire format for game and spectator WebSockets (?format=binary).
+# init and end stay JSON text (once per game); every tick becomes one little-endian frame:
+#
+#   u8 kind (1 = tick) | u16 tick number | f32 actual watts | f32 total score     (11 bytes)
+#
+# against ~70 bytes of JSON per tick, and a single struct.pack instead of json.dumps.
+import struct
+
+JSON = "json"
+BINARY = "binary"
+FORMATS = (JSON, BINARY)
+
+KIND_TICK = 1
+TICK_FRAME = struct.Struct("<BHff")
+
+
+def encode_tick(tick_number, actual, total_score):
+    return TICK_FRAME.pack(KIND_TICK, tick_number, actual, total_score)
+
+
+def encode_tick_message(message):
+    return TICK_FRAME.pack(KIND_TICK, message["tickNumber"], message["actual"], message["totalScore"])
+
+
+def decode_tick(frame):
+    kind, tick_number, actual, total_score = TICK_FRAME.unpack(frame)
+    if kind != KIND_TICK:
+        raise ValueError(f"Unknown frame kind {kind}")
+    return {"type": "tick", "tickNumber": tick_number, "actual": actual, "totalScore": total_score}
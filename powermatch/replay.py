@@ -0,0 +1,282 @@
+# powermatch/replay.py
+# Compact per-session recordings of raw input and tick output, and clock-free re-simulation.
+#
+# File layout (little-endian), one append-only file per session:
+#   b"PMR1" | u32 header length | JSON header (name, difficulty, seed, timing, ...)
+#   then records, each starting with a one-byte tag:
+#     b"S" u16 tick, f64 value               raw sample consumed by that tick
+#     b"T" u16 tick, f64 actual, f64 score   tick output as scored live
+#     b"E" f64 total                         session finished
+import argparse
+import json
+import logging
+import os
+import queue
+import struct
+import threading
+from . import config
+from . engine import GameEngine
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"PMR1"
+SUFFIX = ".pmr"
+_HEADER_LEN = struct.Struct("<I")
+_SAMPLE = struct.Struct("<cHd")
+_TICK = struct.Struct("<cHdd")
+_END = struct.Struct("<cd")
+_FLUSH_BYTES = 4096
+
+_STOP = object()
+
+
+class RecordingWriter:
+    """
+    Appends recorder buffers to disk on its own thread, so sessions never do file I/O on the
+    event loop, and deletes the oldest recordings once the directory exceeds its retention.
+    """
+
+    def __init__(self, max_files=None, max_bytes=None):
+        self.max_files = config.RECORDINGS_MAX_FILES if max_files is None else max_files
+        self.max_bytes = config.RECORDINGS_MAX_MB * 1024 * 1024 if max_bytes is None else max_bytes
+        self._queue = queue.Queue()
+        self._thread = None
+        self._stopped = False
+        self._lock = threading.Lock()
+
+        self.written = 0
+        self.failed = 0
+        self.pruned = 0
+
+    def start(self):
+        with self._lock:
+            self._stopped = False
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name="powermatch-recording-writer", daemon=True)
+            self._thread.start()
+
+    def write(self, path, data, close=False):
+        # Called from the event loop
+        if self._stopped:
+            logger.warning("Recording %s written after the writer stopped; dropped.", path)
+            return
+        self.start()
+        self._queue.put((path, data, close))
+
+    def stop(self, timeout=10.0):
+        """Write out everything queued, close open files and stop the worker."""
+        with self._lock:
+            thread = self._thread
+            self._thread = None
+            self._stopped = True
+        if thread is None:
+            return
+        self._queue.put(_STOP)
+        thread.join(timeout)
+
+    def _run(self):
+        files = {}  # path -> open file of an unfinished session
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+            path, data, close = item
+            try:
+                f = files.get(path)
+                if f is None:
+                    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+                    f = files[path] = open(path, "ab")
+                f.write(data)
+                self.written += len(data)
+                if close:
+                    files.pop(path).close()
+                    self._prune(os.path.dirname(path) or ".", exclude=files)
+            except OSError as e:
+                self.failed += 1
+                logger.error("Could not write recording %s: %s", path, e)
+                f = files.pop(path, None)
+                if f is not None:
+                    f.close()
+        for f in files.values():
+            f.close()
+
+    def _prune(self, directory, exclude=()):
+        if not self.max_files and not self.max_bytes:
+            return
+        entries = []
+        for entry in os.scandir(directory):
+            if entry.name.endswith(SUFFIX) and entry.path not in exclude:
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        entries.sort()
+        count, total = len(entries), sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if (not self.max_files or count <= self.max_files) and (not self.max_bytes or total <= self.max_bytes):
+                break
+            try:
+                os.remove(path)
+            except OSError as e:
+                logger.warning("Could not remove old recording %s: %s", path, e)
+                continue
+            count -= 1
+            total -= size
+            self.pruned += 1
+
+
+# Shared writer started and flushed by the app lifespan
+recording_writer = RecordingWriter()
+
+
+class Recorder:
+    def __init__(self, path, header, writer=None):
+        self.path = path
+        self.header = header
+        self.writer = writer or recording_writer
+        self._buffer = bytearray()
+        self._closed = False
+
+    @classmethod
+    def open(cls, session_id, header, directory=None, writer=None):
+        # No disk access here: the header goes out with the first flush, on the writer thread
+        directory = os.path.abspath(directory or config.RECORDINGS_DIR)
+        recorder = cls(os.path.join(directory, f"{session_id}{SUFFIX}"), {**header, "session": session_id}, writer)
+        encoded = json.dumps(recorder.header).encode("utf-8")
+        recorder._buffer += MAGIC + _HEADER_LEN.pack(len(encoded)) + encoded
+        return recorder
+
+    def tick(self, t, samples, actual, tick_score):
+        pack_sample = _SAMPLE.pack
+        for value in samples:
+            self._buffer += pack_sample(b"S", t, value)
+        self._buffer += _TICK.pack(b"T", t, actual, tick_score)
+        if len(self._buffer) >= _FLUSH_BYTES:
+            self.flush()
+
+    def flush(self):
+        if not self._closed and self._buffer:
+            self.writer.write(self.path, bytes(self._buffer))
+            self._buffer.clear()
+
+    def close(self, total_score=None):
+        if self._closed:
+            return
+        if total_score is not None:
+            self._buffer += _END.pack(b"E", total_score)
+        self.writer.write(self.path, bytes(self._buffer), close=True)
+        self._buffer.clear()
+        self._closed = True
+
+
+class Recording:
+    def __init__(self, header, samples_per_tick, ticks, total_score):
+        self.header = header
+        self.samples_per_tick = samples_per_tick  # list of raw sample lists, one per tick
+        self.ticks = ticks                        # list of (actual, tick_score) as scored live
+        self.total_score = total_score            # None if the session never finished
+
+
+def load_recording(path):
+    with open(path, "rb") as f:
+        data = f.read()
+    if data[:4] != MAGIC:
+        raise ValueError(f"{path} is not a PowerMatch recording")
+    (header_len,) = _HEADER_LEN.unpack_from(data, 4)
+    offset = 4 + _HEADER_LEN.size
+    header = json.loads(data[offset:offset + header_len].decode("utf-8"))
+    offset += header_len
+
+    samples_per_tick, ticks, total_score = [], [], None
+    size = len(data)
+    while offset < size:
+        tag = data[offset:offset + 1]
+        if tag == b"S":
+            _, t, value = _SAMPLE.unpack_from(data, offset)
+            offset += _SAMPLE.size
+            while len(samples_per_tick) <= t:
+                samples_per_tick.append([])
+            samples_per_tick[t].append(value)
+        elif tag == b"T":
+            _, t, actual, tick_score = _TICK.unpack_from(data, offset)
+            offset += _TICK.size
+            while len(samples_per_tick) <= t:
+                samples_per_tick.append([])
+            ticks.append((actual, tick_score))
+        elif tag == b"E":
+            _, total_score = _END.unpack_from(data, offset)
+            offset += _END.size
+        else:
+            raise ValueError(f"{path}: unknown record tag {tag!r} at offset {offset}")
+
+    return Recording(header, samples_per_tick[:len(ticks)], ticks, total_score)
+
+
+def replay(recording):
+    """Re-run a recording through GameEngine scoring; returns (engine, tick results)."""
+    header = recording.header
+    engine = GameEngine(
+        name=header["name"],
+        difficulty=header["difficulty"],
+        tick_rate=header["tick_rate"],
+        duration=header["duration"],
+        aggregate=header["aggregate"],
+        seed=header["seed"],
+        filter_spec=header.get("filter", ""),  # recordings made before filtering existed are unfiltered
+        curve_source=header.get("curve_source", "file"),
+    )
+    results = engine.replay(recording.samples_per_tick[:engine.ticks])
+    return engine, results
+
+
+def verify(path):
+    """Replay a recording and compare with what was scored live."""
+    recording = load_recording(path)
+    engine, _ = replay(recording)
+    recorded = recording.total_score
+    return {
+        "path": path,
+        "session": recording.header.get("session"),
+        "name": recording.header["name"],
+        "difficulty": recording.header["difficulty"],
+        "recorded": recorded,
+        "replayed": engine.total_score,
+        "match": recorded is not None and round(recorded, 1) == round(engine.total_score, 1),
+    }
+
+
+def iter_recordings(directory=None):
+    directory = directory or config.RECORDINGS_DIR
+    if not os.path.isdir(directory):
+        return
+    for entry in sorted(os.listdir(directory)):
+        if entry.endswith(SUFFIX):
+            yield os.path.join(directory, entry)
+
+
+def rescore_all(directory=None):
+    """Bulk re-score every recording, e.g. after curves or tolerances change."""
+    for path in iter_recordings(directory):
+        try:
+            yield verify(path)
+        except Exception as e:
+            logger.error("Could not replay %s: %s", path, e)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay PowerMatch session recordings and compare scores.")
+    parser.add_argument("paths", nargs="*", help="recording files (default: every file in the recordings directory)")
+    args = parser.parse_args(argv)
+
+    results = [verify(p) for p in args.paths] if args.paths else list(rescore_all())
+    mismatches = 0
+    for result in results:
+        mismatches += not result["match"]
+        status = "OK      " if result["match"] else "MISMATCH"
+        print(f"{status} {result['session']} {result['name']} ({result['difficulty']}): "
+              f"recorded={result['recorded']} replayed={round(result['replayed'], 1)}")
+    print(f"{len(results)} recording(s), {mismatches} mismatch(es)")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
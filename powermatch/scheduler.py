@@ -0,0 +1,78 @@
+# powermatch/scheduler.py
+# Wall-clock tick grid for game sessions, independent of when samples arrive.
+import asyncio
+import time
+
+AGGREGATORS = {
+    "last": lambda samples: samples[-1],
+    "mean": lambda samples: sum(samples) / len(samples),
+    "max": max,
+}
+
+
+def get_aggregator(name):
+    try:
+        return AGGREGATORS[name]
+    except KeyError:
+        raise ValueError(f"Unknown tick aggregate '{name}', expected one of {sorted(AGGREGATORS)}")
+
+
+def drain(queue):
+    """Take every sample currently buffered in an asyncio.Queue without waiting."""
+    samples = []
+    while True:
+        try:
+            samples.append(queue.get_nowait())
+        except asyncio.QueueEmpty:
+            return samples
+
+
+class TickScheduler:
+    """
+    Emits ticks on a fixed monotonic grid: tick k is due at start + (k + 1) * interval.
+
+    Deadlines are computed from the start time rather than from the previous tick,
+    so a late tick never pushes the following ones back.
+    """
+
+    def __init__(self, tick_rate=1.0, ticks=30, clock=time.monotonic):
+        if tick_rate <= 0:
+            raise ValueError("tick_rate must be positive")
+        self.interval = 1.0 / tick_rate
+        self.ticks = ticks
+        self.clock = clock
+        self.start_time = None
+
+        # Jitter = how late each tick fired relative to its deadline (seconds)
+        self.last_jitter = 0.0
+        self.max_jitter = 0.0
+        self.total_jitter = 0.0
+        self.emitted = 0
+
+    def deadline(self, tick):
+        return self.start_time + (tick + 1) * self.interval
+
+    async def __aiter__(self):
+        self.start_time = self.clock()
+        for tick in range(self.ticks):
+            delay = self.deadline(tick) - self.clock()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self._record(tick)
+            yield tick
+
+    def _record(self, tick):
+        jitter = max(0.0, self.clock() - self.deadline(tick))
+        self.last_jitter = jitter
+        self.max_jitter = max(self.max_jitter, jitter)
+        self.total_jitter += jitter
+        self.emitted += 1
+
+    def stats(self):
+        return {
+            "ticks": self.emitted,
+            "interval": self.interval,
+            "last_jitter": self.last_jitter,
+            "max_jitter": self.max_jitter,
+            "mean_jitter": self.total_jitter / self.emitted if self.emitted else 0.0,
+        }
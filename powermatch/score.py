@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime
+from sqlalchemy import Column, Integer, String, Float, DateTime, Index
 from sqlalchemy.ext.declarative import declarative_base
 from datetime import datetime
 from datetime import timezone
@@ -13,4 +13,14 @@ class Score(Base):
     score = Column(Float, nullable=False)
     difficulty = Column(String, nullable=False)
     seed = Column(Integer, nullable=False)
-    timestamp = Column(DateTime, default=datetime.now(timezone.utc))
+    timestamp = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+
+    # Leaderboard queries: all-time top, rolling window top, per-difficulty top;
+    # history pages filtered by difficulty or name, newest first
+    __table_args__ = (
+        Index("ix_scores_score", "score"),
+        Index("ix_scores_timestamp_score", "timestamp", "score"),
+        Index("ix_scores_difficulty_score", "difficulty", "score"),
+        Index("ix_scores_difficulty_timestamp", "difficulty", "timestamp"),
+        Index("ix_scores_name_timestamp", "name", "timestamp"),
+    )
@@ -0,0 +1,140 @@
+# powermatch/score_writer.py
+# Write-behind persistence: finished games are queued and committed in batches off the event loop.
+import queue
+import threading
+import time
+import logging
+from . db import SessionLocal
+from . score import Score
+from . import metrics
+
+logger = logging.getLogger(__name__)
+
+COMMIT_SECONDS = metrics.histogram("powermatch_db_commit_seconds", "Duration of one score batch commit (writer thread)")
+
+_STOP = object()
+
+
+class ScoreWriter:
+    def __init__(self, session_factory=SessionLocal, batch_size=32, flush_interval=0.25):
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval  # max time to wait for more rows before committing
+        self._queue = queue.Queue()
+        self._thread = None
+        self._stopped = False  # set by stop(); only an explicit start() reopens the writer
+        self._lock = threading.Lock()
+        self.on_commit = []  # callbacks receiving the list of committed row dicts (worker thread)
+
+        # Persistence metrics
+        self.submitted = 0
+        self.committed = 0
+        self.failed = 0
+        self.batches = 0
+        self.last_commit_seconds = 0.0
+        self.max_commit_seconds = 0.0
+        self.total_commit_seconds = 0.0
+
+    def start(self):
+        with self._lock:
+            self._stopped = False
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name="powermatch-score-writer", daemon=True)
+            self._thread.start()
+
+    def submit(self, **fields):
+        # Called from the event loop: never touches the database
+        if self._stopped:
+            # The app is shutting down; restarting the thread here would outlive the lifespan
+            self.failed += 1
+            logger.error("Score for %s submitted after the writer stopped; not saved.", fields.get("name"))
+            return False
+        self.start()
+        self.submitted += 1
+        self._queue.put(fields)
+        return True
+
+    def stop(self, timeout=10.0):
+        """Flush everything still queued and stop the worker."""
+        with self._lock:
+            thread = self._thread
+            self._thread = None
+            self._stopped = True
+        if thread is None:
+            return
+        self._queue.put(_STOP)
+        thread.join(timeout)
+        if thread.is_alive():
+            logger.error("Shutdown timed out with %d score(s) unsaved.", self.queue_depth())
+
+    def queue_depth(self):
+        return self._queue.qsize()
+
+    def stats(self):
+        return {
+            "queue_depth": self.queue_depth(),
+            "submitted": self.submitted,
+            "committed": self.committed,
+            "failed": self.failed,
+            "batches": self.batches,
+            "last_commit_seconds": self.last_commit_seconds,
+            "max_commit_seconds": self.max_commit_seconds,
+            "avg_commit_seconds": self.total_commit_seconds / self.batches if self.batches else 0.0,
+        }
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+            batch = [item]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            self._commit(batch)
+
+    def _commit(self, batch):
+        db = self.session_factory()
+        started = time.perf_counter()
+        try:
+            db.add_all([Score(**fields) for fields in batch])
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            self.failed += len(batch)
+            logger.exception("Failed to save %d score(s): %s", len(batch), e)
+            return
+        finally:
+            db.close()
+
+        elapsed = time.perf_counter() - started
+        COMMIT_SECONDS.observe(elapsed)
+        self.batches += 1
+        self.committed += len(batch)
+        self.last_commit_seconds = elapsed
+        self.total_commit_seconds += elapsed
+        self.max_commit_seconds = max(self.max_commit_seconds, elapsed)
+
+        for callback in self.on_commit:
+            try:
+                callback(batch)
+            except Exception as e:
+                logger.exception("on_commit callback failed: %s", e)
+
+
+# Shared writer started and flushed by the app lifespan
+score_writer = ScoreWriter()
+
+metrics.callback("powermatch_db_queue_depth", "Scores waiting in the write-behind queue", score_writer.queue_depth)
+metrics.callback("powermatch_db_scores_committed_total", "Scores saved to the database", lambda: score_writer.committed, kind="counter")
+metrics.callback("powermatch_db_scores_failed_total", "Scores that failed to save", lambda: score_writer.failed, kind="counter")
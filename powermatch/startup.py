@@ -0,0 +1,51 @@
+# powermatch/startup.py
+# Startup timing and readiness checks, filled in by the CLI and the app lifespan.
+# Deliberately dependency-free so the CLI can import it before FastAPI and SQLAlchemy.
+import importlib
+import time
+from contextlib import contextmanager
+
+
+class StartupProfile:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.steps = []  # (name, seconds) in the order they ran
+
+    @contextmanager
+    def step(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.steps.append((name, time.perf_counter() - started))
+
+    def timed_import(self, module):
+        with self.step(f"import {module}"):
+            return importlib.import_module(module)
+
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+
+class Readiness:
+    """Named checks (database, curves, static assets, mqtt) reported once the server is up."""
+
+    def __init__(self):
+        self.checks = {}  # name -> (ok, detail)
+
+    def set(self, name, ok, detail=""):
+        self.checks[name] = (bool(ok), detail)
+
+    def get(self, name):
+        return self.checks.get(name)
+
+    def ok(self):
+        return all(ok for ok, _ in self.checks.values())
+
+    def as_dict(self):
+        return {name: {"ok": ok, "detail": detail} for name, (ok, detail) in self.checks.items()}
+
+
+# Process-wide instances: the CLI reads what the lifespan records
+profile = StartupProfile()
+readiness = Readiness()
@@ -0,0 +1,151 @@
+# powermatch/static.py
+# Static frontend serving tuned for kiosks on slow Wi-Fi: precompressed asset variants,
+# immutable caching for Vite's hashed files, and an in-memory, revalidatable index.html.
+import argparse
+import gzip
+import hashlib
+import mimetypes
+import os
+import stat
+from email.utils import formatdate
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import StaticFiles
+
+try:
+    import brotli  # optional: only needed to *create* .br files
+except ImportError:
+    brotli = None
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+COMPRESSIBLE = (".js", ".css", ".html", ".svg", ".json", ".txt", ".map")
+
+# Preferred first; suffix of the precompressed file next to the original
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+
+def _accepted_encodings(headers):
+    accepted = set()
+    for part in headers.get("accept-encoding", "").split(","):
+        token, _, params = part.strip().partition(";")
+        if token and params.replace(" ", "") not in ("q=0", "q=0.0"):
+            accepted.add(token.lower())
+    return accepted
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """
+    StaticFiles that serves `<file>.br` / `<file>.gz` when the client accepts them, and
+    marks every response immutable (Vite puts a content hash in every asset file name).
+    """
+
+    async def get_response(self, path, scope):
+        if scope["method"] in ("GET", "HEAD") and path.endswith(COMPRESSIBLE):
+            request_headers = Headers(scope=scope)
+            accepted = _accepted_encodings(request_headers)
+            for encoding, suffix in ENCODINGS:
+                if encoding not in accepted:
+                    continue
+                full_path, stat_result = self.lookup_path(path + suffix)
+                if stat_result is None or not stat.S_ISREG(stat_result.st_mode):
+                    continue
+                response = FileResponse(
+                    full_path,
+                    stat_result=stat_result,
+                    media_type=mimetypes.guess_type(path)[0],
+                    headers={"Content-Encoding": encoding, "Vary": "Accept-Encoding", "Cache-Control": IMMUTABLE},
+                )
+                if self.is_not_modified(response.headers, request_headers):
+                    return Response(status_code=304, headers={"ETag": response.headers["etag"], "Cache-Control": IMMUTABLE})
+                return response
+
+        response = await super().get_response(path, scope)
+        if response.status_code in (200, 304):
+            response.headers["Cache-Control"] = IMMUTABLE
+            if path.endswith(COMPRESSIBLE):
+                response.headers["Vary"] = "Accept-Encoding"
+        return response
+
+
+class IndexPage:
+    """index.html held in memory (plain and gzipped) with ETag/Last-Modified revalidation."""
+
+    def __init__(self, path):
+        self.path = path
+        self.body = b""
+        self.gzipped = b""
+        self.etag = None
+        self.last_modified = None
+        self.load()
+
+    def load(self):
+        if not os.path.isfile(self.path):
+            return
+        with open(self.path, "rb") as f:
+            self.body = f.read()
+        self.gzipped = gzip.compress(self.body, compresslevel=9, mtime=0)
+        self.etag = '"' + hashlib.md5(self.body).hexdigest() + '"'
+        self.last_modified = formatdate(os.stat(self.path).st_mtime, usegmt=True)
+
+    def response(self, request_headers):
+        if self.etag is None:
+            return Response("Frontend not built", status_code=404, media_type="text/plain")
+
+        headers = {
+            "ETag": self.etag,
+            "Last-Modified": self.last_modified,
+            "Cache-Control": REVALIDATE,
+            "Vary": "Accept-Encoding",
+        }
+        if_none_match = request_headers.get("if-none-match")
+        if if_none_match is not None:
+            if self.etag in [tag.strip() for tag in if_none_match.split(",")]:
+                return Response(status_code=304, headers=headers)
+        elif request_headers.get("if-modified-since") == self.last_modified:
+            return Response(status_code=304, headers=headers)
+
+        if "gzip" in _accepted_encodings(request_headers):
+            return Response(self.gzipped, media_type="text/html", headers={**headers, "Content-Encoding": "gzip"})
+        return Response(self.body, media_type="text/html", headers=headers)
+
+
+def precompress(directory, min_size=256):
+    """Write .gz (and .br when the brotli package is installed) next to every compressible file."""
+    written = []
+    for root, _, files in os.walk(directory):
+        for name in files:
+            if not name.endswith(COMPRESSIBLE):
+                continue
+            path = os.path.join(root, name)
+            with open(path, "rb") as f:
+                data = f.read()
+            if len(data) < min_size:
+                continue
+            variants = [(".gz", gzip.compress(data, compresslevel=9, mtime=0))]
+            if brotli is not None:
+                variants.append((".br", brotli.compress(data, quality=11)))
+            for suffix, compressed in variants:
+                if len(compressed) >= len(data):
+                    continue
+                with open(path + suffix, "wb") as f:
+                    f.write(compressed)
+                written.append((path + suffix, len(data), len(compressed)))
+    return written
+
+
+def main(argv=None):
+    # index.html is compressed in memory at startup; only the hashed assets need files on disk
+    default_assets = os.path.join(os.path.dirname(os.path.abspath(__file__)), "frontend", "dist", "assets")
+    parser = argparse.ArgumentParser(description="Precompress built frontend assets for PowerMatch static serving.")
+    parser.add_argument("directory", nargs="?", default=default_assets)
+    args = parser.parse_args(argv)
+
+    for path, original, compressed in precompress(args.directory):
+        print(f"{path}: {original} -> {compressed} bytes")
+    if brotli is None:
+        print("brotli not installed: wrote .gz files only (pip install brotli for .br)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,20 @@
+import asyncio
+import json
+import logging
+from . import config
+from . import metrics
+from . import protocol
+
+logger = logging.getLogger(__name__)
+
+ALL_SESSIONS = "all"  # watch channel that receives every session's messages
+
+BROADCAST_FAILURES = metrics.counter("powermatch_ws_broadcast_failures_total", "Player connections dropped after a failed broadcast send")
+SPECTATOR_MESSAGES = metrics.counter("powermatch_spectator_messages_total", "Messages queued for spectator sockets")
+SPECTATOR_DROPPED = metrics.counter("powermatch_spectator_dropped_total", "Spectator messages discarded because a buffer was full")
+SPECTATOR_DISCONNECTS = metrics.counter("powermatch_spectator_lag_disconnects_total", "Spectators disconnected for falling behind")
+
+
 class WebSocketManager:
     def __init__(self):
         self.active_connections = []
@@ -11,5 +28,186 @@ class WebSocketManager:
             self.active_connections.remove(websocket)
 
     async def broadcast(self, message: dict):
-        for connection in self.active_connections:
-            await connection.send_json(message)
+        # Serialize once, send concurrently; a failed client is dropped instead of aborting the loop
+        text = json.dumps(message)
+        connections = list(self.active_connections)
+        results = await asyncio.gather(*(c.send_text(text) for c in connections), return_exceptions=True)
+        for connection, result in zip(connections, results):
+            if isinstance(result, Exception):
+                BROADCAST_FAILURES.inc()
+                self.disconnect(connection)
+
+
+class Subscriber:
+    """One spectator socket with its own bounded send buffer and sender task."""
+
+    def __init__(self, websocket, channel, buffer_size, binary=False):
+        self.websocket = websocket
+        self.channel = channel
+        self.binary = binary  # ticks as protocol frames (single-session channels only)
+        self.buffer = asyncio.Queue(maxsize=buffer_size)
+        self.dropped = 0
+        self.closed = False
+        self.task = None
+
+
+class BroadcastHub:
+    """
+    Fans game messages out to spectator WebSockets.
+
+    publish() never awaits: each message is serialized once and pushed into every
+    subscriber's bounded buffer, and per-subscriber tasks do the actual sends. A slow
+    client overflows only its own buffer, losing its oldest messages or, with the
+    "disconnect" policy, its connection.
+    """
+
+    def __init__(self, buffer_size=None, overflow=None):
+        self.buffer_size = buffer_size or config.WATCH_BUFFER_SIZE
+        self.overflow = overflow or config.WATCH_OVERFLOW
+        self._subscribers = {}  # channel -> set of Subscriber
+        self._sessions = {}     # session id -> session info for /api/sessions
+        self._last_init = {}    # session id -> serialized init message for late joiners
+        self.relay = None       # multi-process mode: callable(op, session id, info, text) forwarding to other workers
+
+    # --- Publisher side (game runners) ---
+
+    def open_session(self, session_id, info, init_message):
+        text = self._serialize(session_id, init_message)
+        self._open(session_id, info, text)
+        if self.relay is not None:
+            self.relay("open", session_id, info, text)
+
+    def close_session(self, session_id, end_message=None):
+        text = self._serialize(session_id, end_message) if end_message is not None else None
+        self._close(session_id, text)
+        if self.relay is not None:
+            self.relay("close", session_id, None, text)
+
+    def publish(self, session_id, message):
+        text = self._serialize(session_id, message)
+        self._deliver(session_id, text, message)
+        if self.relay is not None:
+            self.relay("publish", session_id, None, text)
+        return text
+
+    def apply_remote(self, op, session_id, info, text):
+        # Messages of a game running in another worker process; never relayed again
+        if op == "open":
+            self._open(session_id, info, text)
+        elif op == "close":
+            self._close(session_id, text)
+        elif op == "publish":
+            self._deliver(session_id, text)
+
+    def _serialize(self, session_id, message):
+        return json.dumps({**message, "session": session_id})
+
+    def _open(self, session_id, info, text):
+        self._sessions[session_id] = info
+        self._last_init[session_id] = text
+        self._deliver(session_id, text)
+
+    def _close(self, session_id, text):
+        if text is not None:
+            self._deliver(session_id, text)
+        self._sessions.pop(session_id, None)
+        self._last_init.pop(session_id, None)
+        for subscriber in list(self._subscribers.get(session_id, ())):
+            self._finish(subscriber)
+
+    def _deliver(self, session_id, text, message=None):
+        frame = None
+        for subscriber in list(self._subscribers.get(session_id, ())):
+            if subscriber.binary:
+                if frame is None:
+                    frame = self._tick_frame(text, message)  # encoded once, only if someone wants it
+                self._offer(subscriber, frame or text)
+            else:
+                self._offer(subscriber, text)
+        # The "all" channel needs the session id in every message, so it stays JSON
+        for subscriber in list(self._subscribers.get(ALL_SESSIONS, ())):
+            self._offer(subscriber, text)
+
+    def _tick_frame(self, text, message):
+        # b"" for non-tick messages, which go out as JSON text
+        if message is None:
+            message = json.loads(text)  # relayed from another worker
+        if message.get("type") != "tick":
+            return b""
+        return protocol.encode_tick_message(message)
+
+    def sessions(self):
+        return [{"session": session_id, **info} for session_id, info in self._sessions.items()]
+
+    # --- Subscriber side (spectator sockets) ---
+
+    async def subscribe(self, websocket, channel, binary=False):
+        await websocket.accept()
+        subscriber = Subscriber(websocket, channel, self.buffer_size, binary=binary and channel != ALL_SESSIONS)
+        self._subscribers.setdefault(channel, set()).add(subscriber)
+        subscriber.task = asyncio.create_task(self._send_loop(subscriber))
+
+        # Late joiners get the curve(s) of whatever is already running
+        if channel == ALL_SESSIONS:
+            for text in self._last_init.values():
+                self._offer(subscriber, text)
+        elif channel in self._last_init:
+            self._offer(subscriber, self._last_init[channel])
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        subscriber.closed = True
+        subscribers = self._subscribers.get(subscriber.channel)
+        if subscribers is not None:
+            subscribers.discard(subscriber)
+            if not subscribers:
+                del self._subscribers[subscriber.channel]
+        if subscriber.task is not None and subscriber.task is not asyncio.current_task():
+            subscriber.task.cancel()
+
+    def subscriber_count(self):
+        return sum(len(s) for s in self._subscribers.values())
+
+    def _offer(self, subscriber, text):
+        if subscriber.closed:
+            return
+        if subscriber.buffer.full():
+            subscriber.dropped += 1
+            SPECTATOR_DROPPED.inc()
+            if self.overflow == "disconnect":
+                SPECTATOR_DISCONNECTS.inc()
+                logger.info("Disconnecting lagging spectator on %s", subscriber.channel)
+                self._finish(subscriber)
+                return
+            subscriber.buffer.get_nowait()
+        subscriber.buffer.put_nowait(text)
+        SPECTATOR_MESSAGES.inc()
+
+    def _finish(self, subscriber):
+        # Stop accepting messages, let the sender flush what is buffered, then close
+        if subscriber.closed:
+            return
+        subscriber.closed = True
+        if subscriber.buffer.full():
+            subscriber.buffer.get_nowait()
+        subscriber.buffer.put_nowait(None)  # close marker for the sender task
+
+    async def _send_loop(self, subscriber):
+        websocket = subscriber.websocket
+        try:
+            while True:
+                text = await subscriber.buffer.get()
+                if text is None:
+                    break
+                if isinstance(text, bytes):
+                    await websocket.send_bytes(text)
+                else:
+                    await websocket.send_text(text)
+            await websocket.close()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.debug("Spectator send failed on %s: %s", subscriber.channel, e)
+        finally:
+            self.unsubscribe(subscriber)
+
@@ -37,5 +37,5 @@ setup(
         "Environment :: Console",
         "Topic :: Games/Entertainment :: Simulation",
     ],
-    python_requires=">=3.7",
+    python_requires=">=3.9",
 )
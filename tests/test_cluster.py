@@ -0,0 +1,92 @@
+import asyncio
+import json
+
+from powermatch import config
+from powermatch.cluster import IngestHub, WorkerLink
+
+
+class _Router:
+    def __init__(self):
+        self.samples = []
+
+    def publish(self, value, topic=None, device_id=None):
+        self.samples.append((value, topic, device_id))
+
+
+async def _wait_for(predicate, timeout=2.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not predicate():
+        assert asyncio.get_running_loop().time() < deadline
+        await asyncio.sleep(0.01)
+
+
+def test_worker_link_skips_bad_lines(tmp_path):
+    async def scenario():
+        hub = IngestHub(str(tmp_path / "hub.sock"))
+        await hub.start()
+        router = _Router()
+        link = WorkerLink(hub.path, router)
+        await link.start()
+        try:
+            await _wait_for(lambda: hub.worker_count() == 1)
+            for line in (b"not json\n", b'{"t": "s"}\n', b'{"t": "e"}\n', b"[1, 2]\n",
+                         b'{"t": "s", "b": [1.0]}\n', b'{"t": "s", "b": ["x' + b"a" * (1 << 21) + b'"]}\n'):
+                hub._send(line)
+            hub.publish(5.0, "meters/x", "dev-1")
+            await _wait_for(lambda: router.samples)
+            assert router.samples == [(5.0, "meters/x", "dev-1")]
+            assert link.connected
+            assert link.skipped >= 6
+        finally:
+            await link.stop()
+            await hub.stop()
+
+    asyncio.run(scenario())
+
+
+def test_hub_drops_worker_that_stops_reading(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "IPC_WRITE_LIMIT", 64 * 1024)
+
+    async def scenario():
+        hub = IngestHub(str(tmp_path / "hub.sock"))
+        await hub.start()
+        reader, writer = await asyncio.open_unix_connection(hub.path)  # never reads
+        try:
+            await _wait_for(lambda: hub.worker_count() == 1)
+            line = (json.dumps({"t": "e", "k": "x", "d": "a" * 4096}) + "\n").encode()
+            for _ in range(2000):
+                hub._send(line)
+                if not hub.worker_count():
+                    break
+                await asyncio.sleep(0)
+            assert hub.worker_count() == 0
+            assert hub.dropped_workers == 1
+        finally:
+            writer.close()
+            await hub.stop()
+
+    asyncio.run(scenario())
+
+
+def test_mqtt_metrics_reach_the_worker_registry(tmp_path):
+    from powermatch import metrics
+    from powermatch.cluster import METRICS_EVENT
+
+    async def scenario():
+        hub = IngestHub(str(tmp_path / "hub.sock"))
+        await hub.start()
+        registry = metrics.Registry()
+        link = WorkerLink(hub.path, _Router(), handlers={METRICS_EVENT: registry.relay})
+        await link.start()
+        try:
+            source = metrics.Registry()
+            counter = source.register(metrics.Counter("powermatch_mqtt_test_total", "Test", ("result",)))
+            counter.labels("parsed").inc(3)
+            hub.send_event(METRICS_EVENT, source.export("powermatch_mqtt_"))
+            await _wait_for(lambda: registry.get("powermatch_mqtt_test_total") is not None)
+            assert 'powermatch_mqtt_test_total{result="parsed"} 3' in registry.render()
+        finally:
+            await link.stop()
+            await hub.stop()
+
+    asyncio.run(scenario())
@@ -0,0 +1,85 @@
+import json
+import os
+
+import pytest
+from powermatch.curves import CurveLibrary, compile_curve, generate_curve, validate_entry
+
+
+def test_score_tick_inside_and_outside_tolerance():
+    curve = compile_curve("easy", [20.0, 20.0], tolerance=10.0, multiplier=1.0)
+    assert curve.score_tick(0, 20.0) == 100.0
+    assert curve.score_tick(0, 25.0) == 50.0
+    assert curve.score_tick(1, 31.0) == 0.0
+    assert curve.score_tick(1, None) == 0.0
+
+
+def test_multiplier_and_per_point_tolerance():
+    curve = compile_curve("medium", [10.0, 10.0], tolerance=[5.0, 20.0], multiplier=2.0)
+    assert curve.score_tick(0, 12.5) == 100.0
+    assert curve.score_tick(1, 20.0) == 100.0
+
+
+def test_score_series_matches_score_tick():
+    curve = compile_curve("hard", [10.0, 20.0, 30.0, 40.0])
+    samples = [10.0, 23.0, None, 100.0]
+    scores, total = curve.score_series(samples)
+    assert scores == [curve.score_tick(t, v) for t, v in enumerate(samples)]
+    assert total == sum(scores)
+
+
+def test_resample_step_holds():
+    curve = compile_curve("easy", [1.0, 2.0, 3.0])
+    resampled = curve.resample(6)
+    assert resampled.target_list == [1.0, 1.0, 2.0, 2.0, 3.0, 3.0]
+    assert len(resampled) == 6
+    assert resampled.multiplier == curve.multiplier
+
+
+def test_generated_curves_are_deterministic():
+    assert generate_curve("hard", 99).target_list == generate_curve("hard", 99).target_list
+    assert generate_curve("hard", 99).target_list != generate_curve("hard", 100).target_list
+
+
+def test_validate_entry_accepts_any_length():
+    curve = validate_entry("party", {"curve": [10, 20, 30, 40, 50], "tolerance": [5, 5, 5, 5, 5], "multiplier": 2})
+    assert len(curve) == 5
+    assert curve.multiplier == 2.0
+
+
+@pytest.mark.parametrize("entry", [{"curve": [1, -5]}, {"curve": []}, {"curve": [1, 2], "tolerance": [1]}, {}])
+def test_validate_entry_rejects_bad_entries(entry):
+    with pytest.raises(ValueError):
+        validate_entry("easy", entry)
+
+
+def test_reload_counts_only_successful_reloads(tmp_path):
+    path = tmp_path / "curves.json"
+    path.write_text(json.dumps({"easy": {"curve": [10, 20]}}))
+    library = CurveLibrary(str(path))
+    library.load()
+
+    path.write_text("{ not json")
+    os.utime(path, (1, 1))
+    assert library.reload_if_changed()
+    assert (library.reloads, library.reload_failures) == (0, 1)
+    assert library.names() == ["easy"]  # the previous set is kept
+    assert not library.reload_if_changed()  # a broken file is not retried until it changes
+
+    path.write_text(json.dumps({"easy": {"curve": [10, 20]}, "hard": {"curve": [30, 40]}}))
+    os.utime(path, (2, 2))
+    assert library.reload_if_changed()
+    assert (library.reloads, library.reload_failures) == (1, 1)
+    assert library.names() == ["easy", "hard"]
+
+
+def test_resample_cache_belongs_to_its_curve_set(tmp_path):
+    path = tmp_path / "curves.json"
+    path.write_text(json.dumps({"easy": {"curve": [10, 20]}}))
+    library = CurveLibrary(str(path))
+    library.load()
+    assert library.get("easy", points=4, source="file").target_list == [10.0, 10.0, 20.0, 20.0]
+
+    path.write_text(json.dumps({"easy": {"curve": [30, 40]}}))
+    os.utime(path, (3, 3))
+    assert library.reload_if_changed()
+    assert library.get("easy", points=4, source="file").target_list == [30.0, 30.0, 40.0, 40.0]
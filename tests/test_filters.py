@@ -0,0 +1,78 @@
+import pytest
+from powermatch.filters import (
+    ExponentialAverage, FilterChain, MedianFilter, MovingAverage, OutlierFilter, parse_spec,
+)
+
+
+def test_empty_spec_passes_samples_through():
+    chain = parse_spec("")
+    samples = [1.0, 2.0, 3.0]
+    assert chain.run(samples) == samples
+
+
+def test_median_of_three_rejects_single_spike():
+    median = MedianFilter(3)
+    out = [median.process(v) for v in (10.0, 10.0, 500.0, 10.0, 11.0)]
+    assert out[2] == 10.0
+    assert max(out) < 500.0
+
+
+@pytest.mark.parametrize("size", [3, 5, 7])
+def test_median_matches_sorted_window(size):
+    median = MedianFilter(size)
+    values = [5.0, 1.0, 9.0, 3.0, 7.0, 2.0, 8.0, 4.0, 6.0]
+    for i, value in enumerate(values):
+        window = sorted(values[max(0, i - size + 1):i + 1])
+        n = len(window)
+        expected = window[n // 2] if n % 2 else (window[n // 2 - 1] + window[n // 2]) / 2
+        assert median.process(value) == expected
+
+
+def test_moving_average_over_window():
+    mean = MovingAverage(3)
+    assert [mean.process(v) for v in (3.0, 6.0, 9.0, 12.0)] == [3.0, 4.5, 6.0, 9.0]
+
+
+def test_ema_starts_at_first_sample():
+    ema = ExponentialAverage(0.5)
+    assert ema.process(10.0) == 10.0
+    assert ema.process(20.0) == 15.0
+
+
+def test_outlier_filter_drops_spike_then_follows_level_change():
+    outlier = OutlierFilter(k=4.0, warmup=5, max_streak=3)
+    for value in (10.0, 10.5, 9.5, 10.0, 10.2, 9.8):
+        assert outlier.process(value) == value
+    assert outlier.process(100.0) is None
+    # A sustained jump is accepted after max_streak rejections
+    results = [outlier.process(100.0) for _ in range(3)]
+    assert results[-1] == 100.0
+
+
+def test_parse_spec_builds_stages_in_order():
+    chain = parse_spec("outlier:4, median:3, ema:0.5, gap:linear:2")
+    assert [type(s) for s in chain.stages] == [OutlierFilter, MedianFilter, ExponentialAverage]
+    assert chain.gap == "linear"
+    assert chain.max_gap == 2
+
+
+@pytest.mark.parametrize("spec", ["bogus:1", "median:0", "ema:1.5", "gap:wobble", "median:5:9", "ema:0.5:1", "gap:hold:2", "gap:linear:3:1"])
+def test_parse_spec_rejects_bad_specs(spec):
+    with pytest.raises(ValueError):
+        parse_spec(spec)
+
+
+def test_linear_gap_extrapolates_then_holds():
+    chain = FilterChain(gap="linear", max_gap=2)
+    chain.observe(10.0)
+    chain.observe(12.0)
+    assert chain.fill_gap(12.0) == 14.0
+    assert chain.fill_gap(12.0) == 16.0
+    assert chain.fill_gap(12.0) == 12.0
+
+
+def test_reset_clears_state():
+    chain = parse_spec("mean:3")
+    chain.run([30.0, 30.0])
+    chain.reset()
+    assert chain.run([3.0]) == [3.0]
@@ -0,0 +1,25 @@
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+from powermatch.history import _decode_cursor, _encode_cursor
+
+
+def test_cursor_round_trip():
+    row = SimpleNamespace(timestamp=datetime(2024, 5, 1, 12, 30, 15, 250000), id=1234)
+    assert _decode_cursor(_encode_cursor(row)) == (row.timestamp, 1234)
+
+
+def test_cursor_is_url_safe():
+    row = SimpleNamespace(timestamp=datetime(2024, 5, 1, 12, 30), id=2 ** 40)
+    cursor = _encode_cursor(row)
+    assert "=" not in cursor and "+" not in cursor and "/" not in cursor
+
+
+@pytest.mark.parametrize("cursor", ["", "not-base64!", "aGVsbG8", "WzEsMiwzXQ"])
+def test_bad_cursor_is_a_400(cursor):
+    with pytest.raises(HTTPException) as excinfo:
+        _decode_cursor(cursor)
+    assert excinfo.value.status_code == 400
@@ -0,0 +1,39 @@
+from datetime import datetime
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from powermatch.history import ScoreStats
+from powermatch.score import Base, Score
+
+
+def _stats(scores):
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    factory = sessionmaker(bind=engine)
+    db = factory()
+    for i, (score, difficulty) in enumerate(scores):
+        db.add(Score(name="p", score=score, difficulty=difficulty, seed=i, timestamp=datetime(2025, 6, 1 + i % 2, 12)))
+    db.commit()
+    db.close()
+    return ScoreStats(factory)
+
+
+def test_startup_aggregates_merge_spellings():
+    stats = _stats([(float(v), "Easy" if v % 2 else "easy") for v in range(1, 101)] + [(500.0, "hard")])
+    easy = stats.snapshot("EASY")["difficulties"]["easy"]
+    assert (easy["count"], easy["min"], easy["max"], easy["mean"]) == (100, 1.0, 100.0, 50.5)
+    for p in (50, 75, 90, 99):
+        assert abs(easy[f"p{p}"] - p) <= 0.5
+    assert stats.spellings("easy") == ["Easy", "easy"]
+    assert [d["count"] for d in stats.snapshot()["daily"]] == [51, 50]
+
+
+def test_add_rows_matches_a_rebuild():
+    stats = _stats([(10.5, "hard"), (20.25, "hard")])
+    stats.snapshot()
+    stats.add_rows([{"score": 30.75, "difficulty": "Hard", "timestamp": datetime(2025, 6, 2, 8)}])
+    live = stats.snapshot()
+    assert live["difficulties"]["hard"]["count"] == 3
+    assert live["difficulties"]["hard"]["max"] == 30.75
+    assert live["daily"] == [{"date": "2025-06-01", "count": 1, "hard": 1}, {"date": "2025-06-02", "count": 2, "hard": 2}]
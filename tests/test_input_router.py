@@ -0,0 +1,63 @@
+from powermatch.input_router import DROP_NEWEST, DROP_OLDEST, InputRouter
+
+
+def _drain(queue):
+    items = []
+    while not queue.empty():
+        items.append(queue.get_nowait())
+    return items
+
+
+def test_station_session_only_sees_its_source():
+    router = InputRouter(maxsize=8)
+    bound = router.open_session("a", source="dev-1")
+    anything = router.open_session("b")
+    router.publish(1.0, topic="meters/x", device_id="dev-1")
+    router.publish(2.0, topic="meters/y", device_id="dev-2")
+    assert _drain(bound) == [1.0]
+    assert _drain(anything) == [1.0, 2.0]
+
+
+def test_topic_also_routes():
+    router = InputRouter(maxsize=8)
+    queue = router.open_session("a", source="meters/x")
+    assert router.publish(5.0, topic="meters/x", device_id="dev-9") == 1
+    assert _drain(queue) == [5.0]
+
+
+def test_drop_oldest_keeps_latest_samples():
+    router = InputRouter(maxsize=2, policy=DROP_OLDEST)
+    queue = router.open_session("a")
+    for value in (1.0, 2.0, 3.0):
+        router.publish(value)
+    assert _drain(queue) == [2.0, 3.0]
+    assert router.dropped_total() == 1
+
+
+def test_drop_newest_keeps_first_samples():
+    router = InputRouter(maxsize=2, policy=DROP_NEWEST)
+    queue = router.open_session("a")
+    for value in (1.0, 2.0, 3.0):
+        router.publish(value)
+    assert _drain(queue) == [1.0, 2.0]
+
+
+def test_close_session_stops_delivery_and_keeps_drop_count():
+    router = InputRouter(maxsize=1)
+    router.open_session("a")
+    router.publish(1.0)
+    router.publish(2.0)
+    router.close_session("a")
+    assert router.publish(3.0) == 0
+    assert router.session_count() == 0
+    assert router.dropped_total() == 1
+
+
+def test_duplicate_session_id_rejected():
+    router = InputRouter()
+    router.open_session("a")
+    try:
+        router.open_session("a")
+    except ValueError:
+        return
+    raise AssertionError("duplicate session accepted")
@@ -0,0 +1,29 @@
+import pytest
+
+from powermatch import metrics
+
+
+def test_labeled_metrics_need_labels():
+    for metric, update in ((metrics.Counter("c", "h", ("x",)), "inc"), (metrics.Gauge("g", "h", ("x",)), "set"),
+                           (metrics.Histogram("h", "h", ("x",)), "observe")):
+        with pytest.raises(ValueError):
+            getattr(metric, update)(1)
+
+
+def test_render_counter_and_histogram():
+    counter = metrics.Counter("c_total", "Counter", ("result",))
+    counter.labels("ok").inc(2)
+    histogram = metrics.Histogram("lag_seconds", "Lag", buckets=(0.1, 1.0))
+    histogram.observe(0.5)
+    assert 'c_total{result="ok"} 2' in counter.render()
+    text = histogram.render()
+    assert 'lag_seconds_bucket{le="0.1"} 0' in text
+    assert 'lag_seconds_bucket{le="1"} 1' in text
+    assert "lag_seconds_count 1" in text
+
+
+def test_relay_replaces_text():
+    registry = metrics.Registry()
+    registry.relay({"m": "# TYPE m gauge\nm 1"})
+    registry.relay({"m": "# TYPE m gauge\nm 2"})
+    assert registry.render() == "# TYPE m gauge\nm 2\n"
@@ -0,0 +1,13 @@
+import pytest
+
+pytest.importorskip("paho.mqtt.client")
+pytest.importorskip("httpx")  # the stub check reads /api/health through httpx's ASGI transport
+
+from benchmarks import mqtt_stub  # noqa: E402
+
+
+def test_reconnect_failover_and_health():
+    # Broker drop, backoff, failover to the next broker and /api/health 503 -> 200, against the stub broker
+    args = ["--restarts", "1", "--outage", "1.5", "--reconnect-min", "0.25", "--reconnect-max", "1.0",
+            "--max-resume", "1.0", "--timeout", "5"]
+    assert mqtt_stub.main(args) == 0
@@ -0,0 +1,52 @@
+import json
+
+import pytest
+
+pytest.importorskip("paho.mqtt.client")
+from powermatch.mqtt_input import _parse_power_fast, _parse_power_json, parse_power
+
+SHELLY = {
+    "src": "shellypro3em-abc123",
+    "dst": "powermatch/events",
+    "method": "NotifyStatus",
+    "params": {"ts": 1712345678.12, "em:0": {"id": 0, "a_act_power": 1.5, "c_act_power": 12.25, "total_act_power": 30.1}},
+}
+
+PAYLOADS = [
+    json.dumps(SHELLY),
+    json.dumps(SHELLY, separators=(",", ":")),
+    json.dumps(SHELLY, indent=2),
+    json.dumps({"params": {"em:0": {"c_act_power": -3}}, "src": "late-src"}),
+    json.dumps({"params": {"em:0": {"c_act_power": 1e3}}}),
+    json.dumps({"src": "dev", "params": {"em:0": {"c_act_power": 0}}}),
+    # Nested "src": only the top-level one is the device
+    json.dumps({"dst": {"src": "inner"}, "src": "outer", "params": {"em:0": {"c_act_power": 5.0}}}),
+    json.dumps({"params": {"em:0": {"c_act_power": 5.0}}, "meta": {"src": "inner"}}),
+    # Power of another component, or em:0 somewhere other than params
+    json.dumps({"src": "dev", "params": {"em:1": {"c_act_power": 7.0}}}),
+    json.dumps({"src": "dev", "params": {"emdata:0": {"c_act_power": 7.0}, "em:0": {"c_act_power": 8.0}}}),
+    json.dumps({"src": "dev", "params": {"ts": 1}, "other": {"em:0": {"c_act_power": 9.0}}}),
+    json.dumps({"src": "dev", "params": {"em:0": {"sub": {"c_act_power": 9.0}}}}),
+    json.dumps({"src": "dev", "params": {"em:0": {"c_act_power": 9.0}}, "extra": {"em:0": 1}}),
+    # Values the regex must not half-parse
+    json.dumps({"src": "dev", "params": {"em:0": {"c_act_power": None}}}),
+    json.dumps({"src": "dev", "params": {"em:0": {"c_act_power": "12"}}}),
+    json.dumps({"src": 42, "params": {"em:0": {"c_act_power": 4.0}}}),
+    json.dumps({"src": "dev\\u00e9", "params": {"em:0": {"c_act_power": 4.0}}}),
+    json.dumps({"src": "d\"q", "params": {"em:0": {"c_act_power": 4.0}}}),
+]
+
+
+@pytest.mark.parametrize("payload", PAYLOADS)
+def test_fast_path_matches_json(payload):
+    payload = payload.encode()
+    assert parse_power(payload) == _parse_power_json(payload)
+
+
+def test_fast_path_handles_the_shelly_layout():
+    payload = json.dumps(SHELLY).encode()
+    assert _parse_power_fast(payload) == (12.25, "shellypro3em-abc123")
+
+
+def test_payload_without_power():
+    assert parse_power(b'{"src": "dev", "params": {"em:0": {"a_act_power": 1}}}') == (None, None)
@@ -0,0 +1,23 @@
+import pytest
+from powermatch import protocol
+
+
+def test_tick_frame_is_eleven_bytes():
+    assert protocol.TICK_FRAME.size == 11
+    assert len(protocol.encode_tick(1, 2.0, 3.0)) == 11
+
+
+def test_encode_decode_round_trip():
+    frame = protocol.encode_tick(42, 17.5, 1234.25)
+    assert protocol.decode_tick(frame) == {"type": "tick", "tickNumber": 42, "actual": 17.5, "totalScore": 1234.25}
+
+
+def test_encode_tick_message_matches_encode_tick():
+    message = {"type": "tick", "tickNumber": 7, "actual": 3.5, "totalScore": 99.0}
+    assert protocol.encode_tick_message(message) == protocol.encode_tick(7, 3.5, 99.0)
+
+
+def test_decode_rejects_unknown_kind():
+    frame = protocol.TICK_FRAME.pack(9, 1, 0.0, 0.0)
+    with pytest.raises(ValueError):
+        protocol.decode_tick(frame)